@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+Кадры в секунду при наведении на карточку и прокрутке сетки из 500 карточек
+(по умолчанию) с тенью QGraphicsDropShadowEffect на каждой карточке и с общей
+заранее отрисованной тенью, которую рисует GameGrid (game_grid.card_shadow_pixmap).
+
+Наведение: на карточку отправляется событие Enter (запускаются анимации обводки),
+после чего каждый кадр меняется угол градиента и обрабатываются события перерисовки.
+Прокрутка: каждый кадр полоса прокрутки сдвигается на --scroll-step пикселей.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_card_rendering.py [--cards 500] [--frames 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="ppqt-bench-cache-")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import QEvent, QPointF  # noqa: E402
+from PySide6.QtGui import QColor, QEnterEvent, QImage  # noqa: E402
+from PySide6.QtWidgets import QApplication, QGraphicsDropShadowEffect, QScrollArea, QWidget  # noqa: E402
+
+app = QApplication(sys.argv[:1])
+
+from portprotonqt import image_utils  # noqa: E402
+from portprotonqt.game_grid import GameGrid  # noqa: E402
+
+
+class ContextMenuStub:
+    """Заглушка ContextMenuManager: сигналы карточек подключаются, но не используются."""
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+class EffectGameGrid(GameGrid):
+    """Прежний способ: QGraphicsDropShadowEffect на каждой карточке, сетка тени не рисует."""
+
+    def _create_card(self, game):
+        card = super()._create_card(game)
+        shadow = QGraphicsDropShadowEffect(card)
+        shadow.setBlurRadius(20)
+        shadow.setColor(QColor(0, 0, 0, 150))
+        shadow.setOffset(0, 0)
+        card.setGraphicsEffect(shadow)
+        return card
+
+    def paintEvent(self, event):
+        QWidget.paintEvent(self, event)
+
+
+def make_games(count, folder):
+    cover = QImage(600, 900, QImage.Format.Format_RGB32)
+    games = []
+    for i in range(count):
+        cover.fill(QColor.fromHsv(i * 7 % 360, 200, 200))
+        path = os.path.join(folder, f"cover_{i}.jpg")
+        cover.save(path)
+        games.append((f"Game {i}", "", path, str(i), "", "", "", "", "gold", "supported", 0, 0,
+                       "true" if i % 2 else "false"))
+    return games
+
+
+def build_window(grid_class, games):
+    grid = grid_class(select_callback=lambda *args: None, context_menu_manager=ContextMenuStub(),
+                      theme=None, card_width=250)
+    scroll_area = QScrollArea()
+    scroll_area.setWidgetResizable(True)
+    scroll_area.setWidget(grid)
+    scroll_area.resize(1400, 900)
+    scroll_area.show()
+    grid.set_games(games)
+    # Дожидаемся загрузки обложек видимых карточек
+    deadline = time.perf_counter() + 10
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        if all(card.coverLabel.pixmap() is not None and not card.coverLabel.pixmap().isNull()
+               for card in grid._cards.values()):
+            break
+    return scroll_area, grid
+
+
+def fps(frame, frames):
+    """Вызывает frame() frames раз, обрабатывая события перерисовки после каждого кадра."""
+    start = time.perf_counter()
+    for i in range(frames):
+        frame(i)
+        app.processEvents()
+    return frames / (time.perf_counter() - start)
+
+
+def bench(title, grid_class, games, frames, scroll_step):
+    scroll_area, grid = build_window(grid_class, games)
+    card = grid._cards[games[0][0]]
+    app.sendEvent(card, QEnterEvent(QPointF(10, 10), QPointF(10, 10), QPointF(10, 10)))
+    hover_fps = fps(lambda i: card.setGradientAngle(float(i * 5 % 360)), frames)
+    app.sendEvent(card, QEvent(QEvent.Type.Leave))
+
+    scroll_bar = scroll_area.verticalScrollBar()
+    scroll_fps = fps(lambda i: scroll_bar.setValue((i * scroll_step) % max(1, scroll_bar.maximum())), frames)
+    print(f"{title:<32} наведение {hover_fps:7.1f} кадр/с   прокрутка {scroll_fps:7.1f} кадр/с")
+    scroll_area.close()
+    scroll_area.deleteLater()
+    app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=500, help="число карточек")
+    parser.add_argument("--frames", type=int, default=200, help="число кадров в каждом замере")
+    parser.add_argument("--scroll-step", type=int, default=40, help="сдвиг прокрутки за кадр, пикселей")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="ppqt-bench-covers-")
+    games = make_games(args.cards, folder)
+    bench("QGraphicsDropShadowEffect", EffectGameGrid, games, args.frames, args.scroll_step)
+    bench("общая тень (card_shadow_pixmap)", GameGrid, games, args.frames, args.scroll_step)
+    image_utils.image_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
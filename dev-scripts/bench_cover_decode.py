@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Время декодирования одной обложки и пиковая память (RSS) при полном декодировании
+с последующим масштабированием и при масштабировании во время декодирования
+(QImageReader.setScaledSize, image_utils.decode_scaled) для ширин карточек,
+доступных в sizeSlider (200–250).
+
+Обложки — синтетические JPEG 1200x1800 (размер library_600x900_2x.jpg в Steam).
+Каждый замер выполняется в отдельном процессе, чтобы пиковая память не
+накапливалась между режимами.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_cover_decode.py [--covers 50] [--widths 200 210 220 230 240 250]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_CACHE_HOME", tempfile.gettempdir())
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import Qt  # noqa: E402
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+
+def make_covers(count, folder):
+    paths = []
+    for i in range(count):
+        image = QImage(1200, 1800, QImage.Format.Format_RGB32)
+        painter = QPainter(image)
+        gradient = QLinearGradient(0, 0, 1200, 1800)
+        gradient.setColorAt(0, QColor.fromHsv(i * 7 % 360, 200, 220))
+        gradient.setColorAt(1, QColor.fromHsv(i * 13 % 360, 160, 60))
+        painter.fillRect(image.rect(), gradient)
+        painter.drawText(image.rect(), 0, f"Cover {i}")
+        painter.end()
+        path = os.path.join(folder, f"cover_{i}.jpg")
+        image.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def full_decode(path, width, height):
+    """Прежний способ: полное декодирование и масштабирование результата."""
+    return QImage(path).scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                               Qt.TransformationMode.SmoothTransformation)
+
+
+def run_child(mode, width, folder):
+    """Декодирует все обложки из folder и печатает среднее время в мс и пиковый RSS в МиБ."""
+    from portprotonqt.image_utils import decode_scaled
+
+    app = QApplication(sys.argv[:1])  # noqa: F841
+    decode = full_decode if mode == "full" else decode_scaled
+    height = int(width * 1.2)
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder))
+    # Сохраняем результаты, как это делает кэш обложек, чтобы учесть и их память
+    images = []
+    start = time.perf_counter()
+    for path in paths:
+        images.append(decode(path, width, height))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed / len(paths) * 1000:.2f} {peak:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--covers", type=int, default=50, help="число обложек")
+    parser.add_argument("--widths", type=int, nargs="+", default=[200, 210, 220, 230, 240, 250],
+                        help="ширины карточек")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "WIDTH", "FOLDER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, width, folder = args.child
+        run_child(mode, int(width), folder)
+        return
+
+    app = QApplication(sys.argv[:1])  # noqa: F841
+    folder = tempfile.mkdtemp(prefix="ppqt-bench-covers-")
+    print(f"Создание {args.covers} обложек 1200x1800 в {folder}...")
+    make_covers(args.covers, folder)
+
+    print(f"{'ширина':>6}  {'полное, мс':>10} {'RSS, МиБ':>9}  {'при декодировании, мс':>22} {'RSS, МиБ':>9}")
+    for width in args.widths:
+        results = {}
+        for mode in ("full", "scaled"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, str(width), folder],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            results[mode] = (float(output[0]), float(output[1]))
+        full, scaled = results["full"], results["scaled"]
+        print(f"{width:>6}  {full[0]:>10.2f} {full[1]:>9.1f}  {scaled[0]:>22.2f} {scaled[1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Пропускная способность загрузки обложек через image_utils.load_pixmap_async
+на синтетической библиотеке (по умолчанию 500 обложек 1200x1800, как у Steam).
+
+Замеры:
+  - декодирование и масштабирование всех обложек подряд в GUI потоке (для сравнения);
+  - load_pixmap_async без миниатюр на диске (первый запуск);
+  - load_pixmap_async с готовыми миниатюрами на диске (повторный запуск);
+  - load_pixmap_async с обложками в кэше в памяти.
+Для асинхронных замеров время считается до доставки последнего QPixmap в GUI поток,
+также выводится самый долгий интервал между обработкой событий GUI потока.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_cover_loading.py [--covers 500] [--width 250]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Кэш обложек и миниатюр создаётся во временной папке
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="ppqt-bench-cache-")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import QTimer  # noqa: E402
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+app = QApplication(sys.argv[:1])
+
+from portprotonqt import image_utils  # noqa: E402
+
+
+def make_covers(count, folder):
+    paths = []
+    for i in range(count):
+        image = QImage(1200, 1800, QImage.Format.Format_RGB32)
+        painter = QPainter(image)
+        gradient = QLinearGradient(0, 0, 1200, 1800)
+        gradient.setColorAt(0, QColor.fromHsv(i * 7 % 360, 200, 220))
+        gradient.setColorAt(1, QColor.fromHsv(i * 13 % 360, 160, 60))
+        painter.fillRect(image.rect(), gradient)
+        painter.drawText(image.rect(), 0, f"Cover {i}")
+        painter.end()
+        path = os.path.join(folder, f"cover_{i}.jpg")
+        image.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def run_async(paths, width, height, radius):
+    """Запускает загрузку всех обложек и крутит цикл событий до доставки последней."""
+    delivered = 0
+    max_gap = 0.0
+    last_tick = time.perf_counter()
+
+    def on_pixmap(_pixmap):
+        nonlocal delivered
+        delivered += 1
+        if delivered == len(paths):
+            app.quit()
+
+    def tick():
+        nonlocal max_gap, last_tick
+        now = time.perf_counter()
+        max_gap = max(max_gap, now - last_tick)
+        last_tick = now
+
+    timer = QTimer()
+    timer.setInterval(5)
+    timer.timeout.connect(tick)
+    timer.start()
+    start = time.perf_counter()
+    for path in paths:
+        image_utils.load_pixmap_async(path, width, height, on_pixmap, radius=radius)
+    if delivered < len(paths):
+        app.exec()
+    timer.stop()
+    return time.perf_counter() - start, max_gap
+
+
+def report(title, count, elapsed, max_gap=None):
+    line = f"{title:<34} {elapsed:7.2f} с  {count / elapsed:8.0f} обложек/с"
+    if max_gap is not None:
+        line += f"  макс. пауза GUI {max_gap * 1000:.0f} мс"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--covers", type=int, default=500, help="число обложек")
+    parser.add_argument("--width", type=int, default=250, help="ширина карточки")
+    parser.add_argument("--radius", type=int, default=15, help="радиус скругления углов")
+    args = parser.parse_args()
+    width, height = args.width, int(args.width * 1.2)
+
+    folder = tempfile.mkdtemp(prefix="ppqt-bench-covers-")
+    print(f"Создание {args.covers} обложек 1200x1800 в {folder}...")
+    paths = make_covers(args.covers, folder)
+
+    start = time.perf_counter()
+    for path in paths:
+        image_utils.render_cover(path, width, height, args.radius)
+    report("GUI поток, последовательно", len(paths), time.perf_counter() - start)
+
+    report("async, без миниатюр", len(paths), *run_async(paths, width, height, args.radius))
+    image_utils.image_cache.clear()
+    report("async, миниатюры на диске", len(paths), *run_async(paths, width, height, args.radius))
+    report("async, кэш в памяти", len(paths), *run_async(paths, width, height, args.radius))
+    print(f"кэш в памяти: {image_utils.image_cache.size_bytes / 1024 / 1024:.1f} МиБ, потоков CPU: {os.cpu_count()}")
+    image_utils.image_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Микробенчмарк расположения карточек сетки библиотеки (compute_layout и FlowGeometry из custom_widgets).
+
+Замеры на N карточках (по умолчанию 2000):
+  - прежний compute_layout (цикл на Python по каждому элементу) и новый
+    (ряды ищутся через cumsum + searchsorted) с проверкой, что результаты совпадают;
+  - FlowGeometry: повторный расчёт для той же ширины и добавление карточек в конец.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_flow_layout.py [--cards 2000] [--append 50] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+
+from portprotonqt.custom_widgets import FlowGeometry, compute_layout  # noqa: E402
+
+SPACING = 3
+MAX_SCALE = 1.2
+
+
+def legacy_compute_layout(nat_sizes, rect_width, spacing, max_scale):
+    """Прежний compute_layout: цикл на Python по каждому элементу."""
+    N = nat_sizes.shape[0]
+    result = np.zeros((N, 4), dtype=np.int32)
+    y = 0
+    i = 0
+    while i < N:
+        sum_width = 0
+        row_max_height = 0
+        count = 0
+        j = i
+        while j < N:
+            w = nat_sizes[j, 0]
+            if count > 0 and (sum_width + spacing + w) > rect_width:
+                break
+            sum_width += w
+            count += 1
+            h = nat_sizes[j, 1]
+            if h > row_max_height:
+                row_max_height = h
+            j += 1
+        available_width = rect_width - spacing * (count - 1)
+        desired_scale = available_width / sum_width if sum_width > 0 else 1.0
+        scale = desired_scale if desired_scale < max_scale else max_scale
+        x = 0
+        for k in range(i, j):
+            new_w = int(nat_sizes[k, 0] * scale)
+            new_h = int(nat_sizes[k, 1] * scale)
+            result[k, 0] = x
+            result[k, 1] = y
+            result[k, 2] = new_w
+            result[k, 3] = new_h
+            x += new_w + spacing
+        y += int(row_max_height * scale) + spacing
+        i = j
+    return result, y
+
+
+def timed(func, repeat):
+    """Возвращает среднее время вызова func в миллисекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def card_sizes(count, card_width=250):
+    sizes = np.empty((count, 2), dtype=np.int32)
+    sizes[:] = (card_width + 20, int(card_width * 1.6) + 20)
+    return sizes
+
+
+def bench_compute(count, append, repeat, widths):
+    sizes = card_sizes(count)
+    mixed = np.random.default_rng(0).integers(150, 300, (count, 2)).astype(np.int32)
+    for data in (sizes, mixed):
+        for width in widths:
+            expected = legacy_compute_layout(data, width, SPACING, MAX_SCALE)
+            actual = compute_layout(data, width, SPACING, MAX_SCALE)
+            if not (np.array_equal(expected[0], actual[0]) and expected[1] == actual[1]):
+                print(f"расхождение с прежним compute_layout при ширине {width}")
+                sys.exit(1)
+
+    width = widths[0]
+    print(f"compute_layout, {count} карточек, ширина {width}:")
+    print(f"  прежний (цикл Python):          {timed(lambda: legacy_compute_layout(sizes, width, SPACING, MAX_SCALE), 3):8.2f} мс")
+    print(f"  cumsum + searchsorted:          {timed(lambda: compute_layout(sizes, width, SPACING, MAX_SCALE), repeat):8.2f} мс")
+
+    cache = FlowGeometry()
+    cache.compute(sizes, width, SPACING, MAX_SCALE)
+    print(f"  FlowGeometry, та же ширина:     {timed(lambda: cache.compute(sizes, width, SPACING, MAX_SCALE), repeat):8.3f} мс")
+
+    extended = card_sizes(count + append)
+
+    def append_cards():
+        incremental = FlowGeometry()
+        incremental.compute(sizes, width, SPACING, MAX_SCALE)
+        start = time.perf_counter()
+        incremental.compute(extended, width, SPACING, MAX_SCALE)
+        return time.perf_counter() - start
+
+    elapsed = sum(append_cards() for _ in range(repeat)) / repeat * 1000
+    print(f"  FlowGeometry, +{append} в конец:      {elapsed:8.3f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=2000, help="число карточек")
+    parser.add_argument("--append", type=int, default=50, help="сколько карточек добавить в конец")
+    parser.add_argument("--repeat", type=int, default=20, help="число повторов замера")
+    args = parser.parse_args()
+
+    widths = [1180, 1400, 1650, 1920]
+    bench_compute(args.cards, args.append, args.repeat, widths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+Поиск по синтетической библиотеке из 5000 игр (по умолчанию): прежний фильтр
+(подстрока в названии по каждой игре) и LibrarySearchIndex (library_search).
+
+Замеры: построение индекса, обновление после смены рейтинга одной игры
+и среднее время запроса по набору запросов, которые вводятся посимвольно,
+как в поле поиска. Проверяется, что индекс находит всё, что находил прежний фильтр,
+и что запрос, не совпадающий целиком с названием источника, не находит игры по источнику.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_library_search.py [--games 5000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from portprotonqt.library_search import LibrarySearchIndex  # noqa: E402
+
+WORDS = ("dark", "souls", "witcher", "wild", "hunt", "cyberpunk", "half", "life", "portal", "counter",
+         "strike", "elden", "ring", "hollow", "knight", "stardew", "valley", "doom", "eternal", "grand",
+         "theft", "auto", "red", "dead", "redemption", "mass", "effect", "legendary", "edition", "fallout",
+         "skyrim", "special", "battlefield", "forza", "horizon", "apex", "legends", "metro", "exodus")
+TIERS = ("platinum", "gold", "silver", "bronze", "borked", "")
+ANTICHEAT = ("supported", "running", "planned", "broken", "denied", "")
+QUERIES = ("witcher", "dark souls", "elden ring 3", "witchr", "cybrepunk", "gold", "epic", "1234",
+           "legendary edition", "me 42")
+# Слова, похожие на названия источников (steam, epic egs, portproton), но не совпадающие с ними
+SOURCE_LIKE_QUERIES = ("team", "fort", "sport", "port", "stea", "stem", "epi", "eggs", "proton")
+SOURCE_WORDS = {"steam", "epic", "egs", "portproton"}
+
+
+def make_games(count):
+    rng = random.Random(0)
+    games = []
+    for i in range(count):
+        name = " ".join(word.capitalize() for word in rng.sample(WORDS, rng.randint(1, 3))) + f" {i}"
+        description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 30)))
+        source = rng.choice(("true", "false", "epic"))
+        games.append((name, description, "", str(1000 + i), "", "", "", "", rng.choice(TIERS),
+                      rng.choice(ANTICHEAT), 0, 0, source))
+    return games
+
+
+def with_rotated_sources(games):
+    """Те же игры, но у каждой источник заменён на следующий."""
+    rotate = {"true": "false", "false": "epic", "epic": "true"}
+    return [game[:12] + (rotate[game[12]],) for game in games]
+
+
+def legacy_filter(games, text):
+    """Прежний filterGamesDelayed: подстрока в названии по каждой игре."""
+    text = text.strip().lower()
+    return [game for game in games if text in game[0].lower()]
+
+
+def timed(func, repeat):
+    """Возвращает среднее время вызова func в миллисекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def typed_prefixes(query):
+    return [query[:length] for length in range(1, len(query) + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=5000, help="число игр в библиотеке")
+    parser.add_argument("--repeat", type=int, default=20, help="число повторов замера")
+    args = parser.parse_args()
+
+    games = make_games(args.games)
+    index = LibrarySearchIndex()
+    start = time.perf_counter()
+    index.update(games)
+    print(f"построение индекса для {args.games} игр: {(time.perf_counter() - start) * 1000:8.1f} мс")
+
+    changed = list(games)
+    changed[10] = changed[10][:8] + ("platinum",) + changed[10][9:]
+    print(f"обновление после смены рейтинга:      {timed(lambda: index.update_game(changed[10]), 1):8.3f} мс")
+    print(f"update() без изменений:               {timed(lambda: index.update(changed), args.repeat):8.2f} мс")
+
+    prefixes = [prefix for query in QUERIES for prefix in typed_prefixes(query)]
+    for prefix in prefixes:
+        found = {game[0] for game in index.search(prefix)}
+        missing = [game[0] for game in legacy_filter(changed, prefix) if game[0] not in found]
+        if missing:
+            print(f"индекс не нашёл {len(missing)} игр по запросу {prefix!r}")
+            sys.exit(1)
+
+    rotated = LibrarySearchIndex()
+    rotated.update(with_rotated_sources(changed))
+    for query in (*prefixes, *(prefix for word in SOURCE_LIKE_QUERIES for prefix in typed_prefixes(word))):
+        if SOURCE_WORDS.intersection(query.split()):
+            continue
+        if {game[0] for game in index.search(query)} != {game[0] for game in rotated.search(query)}:
+            print(f"результаты запроса {query!r} зависят от источника игр")
+            sys.exit(1)
+
+    def run(search):
+        return lambda: [search(prefix) for prefix in prefixes]
+
+    legacy = timed(run(lambda text: legacy_filter(changed, text)), args.repeat) / len(prefixes)
+    indexed = timed(run(index.search), args.repeat) / len(prefixes)
+    worst = max((timed(lambda prefix=prefix: index.search(prefix), 3), prefix) for prefix in prefixes)
+    print(f"запрос, в среднем по {len(prefixes)} вводимым запросам:")
+    print(f"  прежний фильтр (подстрока в названии): {legacy:8.2f} мс")
+    print(f"  LibrarySearchIndex:                    {indexed:8.2f} мс (худший {worst[0]:.2f} мс, {worst[1]!r})")
+    for query in ("witchr", "cybrepunk", "gold epic"):
+        names = [game[0] for game in index.search(query, limit=3)]
+        print(f"  {query!r}: {names}")
+
+
+if __name__ == "__main__":
+    main()
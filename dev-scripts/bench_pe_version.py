@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Сравнение чтения ProductName и FileDescription из PE файлов встроенным
+разборщиком pe_version с exiftool (по процессу на файл и одним пакетным запуском).
+
+Собирает все .exe в указанных каталогах, проверяет, что результаты совпадают,
+и выводит среднее время на файл. Если exiftool не установлен, измеряется только
+встроенный разборщик.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_pe_version.py ~/.wine/drive_c [другие каталоги...] [--limit 300]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from portprotonqt.exe_metadata import VERSION_FIELDS, read_native_metadata, run_exiftool  # noqa: E402
+
+
+def collect_exes(roots, limit):
+    paths = []
+    for root in roots:
+        for dirpath, _dirnames, filenames in os.walk(os.path.expanduser(root)):
+            for filename in filenames:
+                if filename.lower().endswith(".exe"):
+                    path = os.path.join(dirpath, filename)
+                    if os.path.isfile(path):
+                        paths.append(path)
+                        if len(paths) >= limit:
+                            return paths
+    return paths
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("roots", nargs="+", help="каталоги с .exe файлами")
+    parser.add_argument("--limit", type=int, default=300, help="максимальное число файлов")
+    parser.add_argument("--single-limit", type=int, default=50,
+                        help="число файлов для замера exiftool по процессу на файл")
+    args = parser.parse_args()
+
+    paths = collect_exes(args.roots, args.limit)
+    if not paths:
+        print("Не найдено ни одного .exe файла")
+        sys.exit(1)
+
+    native, native_time = timed(lambda: {path: read_native_metadata(path) for path in paths})
+    unparsed = [path for path, fields in native.items() if fields is None]
+    with_version = sum(1 for fields in native.values() if fields)
+    print(f"файлов: {len(paths)}, с ресурсом версии: {with_version}, не разобрано: {len(unparsed)}")
+    print(f"pe_version:         {native_time / len(paths) * 1e6:.0f} мкс на файл")
+
+    if shutil.which("exiftool") is None:
+        print("exiftool не найден, сравнение пропущено")
+        return
+
+    single_paths = paths[:args.single_limit]
+    _single, single_time = timed(lambda: [run_exiftool([path]) for path in single_paths])
+    batch, batch_time = timed(run_exiftool, paths)
+    batch = batch or {}
+    print(f"exiftool на файл:   {single_time / len(single_paths) * 1e3:.1f} мс на файл ({len(single_paths)} файлов)")
+    print(f"exiftool пакетно:   {batch_time / len(paths) * 1e3:.2f} мс на файл")
+
+    mismatches = []
+    for path, fields in native.items():
+        if fields is None:
+            continue
+        expected = {field: value.strip() for field, value in batch.get(path, {}).items() if field in VERSION_FIELDS}
+        if fields != {field: value for field, value in expected.items() if value}:
+            mismatches.append((path, fields, expected))
+    for path, fields, expected in mismatches[:10]:
+        print(f"расхождение {path}: {fields} != {expected}")
+    if mismatches:
+        sys.exit(1)
+    print("результаты совпадают с exiftool")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Сравнение поиска Steam приложений по триграммному индексу NameIndex
+с прежним линейным перебором словаря steam_apps_index.
+
+Использует data/games_appid.tar.xz из репозитория, проверяет, что оба способа
+возвращают одинаковые результаты, и выводит среднее время на кандидата.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_steam_search.py [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tarfile
+import time
+
+import orjson
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from portprotonqt.name_index import NameIndex  # noqa: E402
+
+ARCHIVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "games_appid.tar.xz")
+RATIO = 0.8
+
+
+def load_apps(path):
+    with tarfile.open(path, mode="r:xz") as tar:
+        member = next(m for m in tar.getmembers() if m.name.endswith(".json"))
+        fobj = tar.extractfile(member)
+        assert fobj is not None
+        return orjson.loads(fobj.read())
+
+
+def linear_search(candidate, steam_apps_index):
+    """Прежняя реализация search_app: точное совпадение, затем перебор всех имён."""
+    if candidate in steam_apps_index:
+        return steam_apps_index[candidate]["appid"]
+    for name_norm, app in steam_apps_index.items():
+        if candidate in name_norm and len(candidate) / len(name_norm) > RATIO:
+            return app["appid"]
+    return None
+
+
+def index_search(candidate, index):
+    i = index.lookup(candidate)
+    if i is None:
+        i = index.find_substring(candidate, RATIO)
+    return index.value(i) if i is not None else None
+
+
+def make_queries(names, count):
+    """Смесь точных имён, обрезанных имён (частичные совпадения) и несуществующих строк."""
+    rng = random.Random(42)
+    queries = []
+    for name in rng.sample(names, count):
+        kind = rng.random()
+        if kind < 0.3:
+            queries.append(name)
+        elif kind < 0.8:
+            queries.append(name[:max(1, int(len(name) * 0.85))])
+        else:
+            queries.append(name[::-1])
+    return queries
+
+
+def timed(func, queries, *args):
+    start = time.perf_counter()
+    results = [func(q, *args) for q in queries]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000, help="число кандидатов для индекса")
+    parser.add_argument("--linear-queries", type=int, default=200, help="число кандидатов для линейного перебора")
+    args = parser.parse_args()
+
+    apps = load_apps(ARCHIVE)
+    start = time.perf_counter()
+    steam_apps_index = {app["normalized_name"]: app for app in apps}
+    print(f"dict:      {len(steam_apps_index)} имён, построение {time.perf_counter() - start:.3f} с")
+    start = time.perf_counter()
+    index = NameIndex.build((app["normalized_name"], int(app["appid"])) for app in apps)
+    print(f"NameIndex: {len(index)} имён, построение {time.perf_counter() - start:.3f} с, "
+          f"{len(index._buffer) / 1024 / 1024:.1f} МиБ")
+
+    queries = make_queries(list(steam_apps_index), args.queries)
+    linear_queries = queries[:args.linear_queries]
+
+    linear_results, linear_time = timed(linear_search, linear_queries, steam_apps_index)
+    index_results, index_time = timed(index_search, queries, index)
+    mismatches = [q for q, a, b in zip(linear_queries, linear_results, index_results, strict=False) if a != b]
+    if mismatches:
+        print(f"Расхождения ({len(mismatches)}): {mismatches[:10]}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    index.find_substrings(queries, RATIO)
+    batch_time = time.perf_counter() - start
+
+    linear_avg = linear_time / len(linear_queries) * 1000
+    index_avg = index_time / len(queries) * 1000
+    print(f"линейный перебор: {linear_avg:.3f} мс на кандидата ({len(linear_queries)} запросов)")
+    print(f"NameIndex:        {index_avg:.3f} мс на кандидата ({len(queries)} запросов)")
+    print(f"пакетный поиск:   {batch_time * 1000:.1f} мс на {len(queries)} кандидатов")
+    print(f"ускорение:        x{linear_avg / index_avg:.0f}, результаты совпадают")
+
+
+if __name__ == "__main__":
+    main()
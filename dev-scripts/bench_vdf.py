@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Сравнение чтения VDF файлов Steam модулем vdf_reader с прежним safe_vdf_load
+(сначала vdf.binary_load, при ошибке повторный разбор vdf.load).
+
+Создаёт во временном каталоге синтетическую библиотеку Steam из appmanifest_*.acf
+и localconfig.vdf, проверяет, что результаты совпадают, и выводит время:
+полный разбор манифестов, чтение только appid и name, полный разбор localconfig.vdf
+и чтение из него только блока Software/Valve/Steam/apps.
+
+Запуск из корня репозитория:
+    python dev-scripts/bench_vdf.py [--manifests 2000] [--apps 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import vdf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from portprotonqt import vdf_reader  # noqa: E402
+
+LOCALCONFIG_APPS_SECTION = ("UserLocalConfigStore", "Software", "Valve", "Steam", "apps")
+
+
+def old_safe_vdf_load(path):
+    """Прежняя реализация safe_vdf_load из steam_api."""
+    try:
+        with open(path, "rb") as f:
+            return vdf.binary_load(f)
+    except Exception:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            return vdf.load(f)
+
+
+def make_manifest(appid, rng):
+    depots = {str(appid + i): {"manifest": str(rng.getrandbits(63)), "size": str(rng.randint(1, 10**10))}
+              for i in range(1, rng.randint(2, 6))}
+    return {"AppState": {
+        "appid": str(appid),
+        "universe": "1",
+        "LauncherPath": "/home/user/.local/share/Steam/ubuntu12_32/steam",
+        "name": f"Synthetic Game \"{appid}\" Edition",
+        "StateFlags": "4",
+        "installdir": f"Synthetic Game {appid}",
+        "LastUpdated": str(rng.randint(10**9, 2 * 10**9)),
+        "SizeOnDisk": str(rng.randint(1, 10**11)),
+        "buildid": str(rng.randint(1, 10**7)),
+        "LastOwner": "76561198000000000",
+        "AutoUpdateBehavior": "0",
+        "AllowOtherDownloadsWhileRunning": "0",
+        "ScheduledAutoUpdate": "0",
+        "InstalledDepots": depots,
+        "SharedDepots": {"228988": "228980", "228990": "228980"},
+        "UserConfig": {"language": "english", "BetaKey": "public"},
+        "MountedConfig": {"language": "english"},
+    }}
+
+
+def make_localconfig(apps, rng):
+    app_entries = {str(10 + i * 10): {
+        "LastPlayed": str(rng.randint(10**9, 2 * 10**9)),
+        "Playtime": str(rng.randint(0, 10**5)),
+        "Playtime2wks": str(rng.randint(0, 10**3)),
+        "cloud": {"last_sync_state": "synchronized", "quota_files": "12", "quota_bytes": "123456"},
+        "autocloud": {"lastlaunch": str(rng.randint(10**9, 2 * 10**9)), "lastexit": "0"},
+    } for i in range(apps)}
+    return {"UserLocalConfigStore": {
+        "friends": {str(i): {"name": f"Friend {i}", "NameHistory": {"0": f"Old {i}"}} for i in range(apps // 2)},
+        "Software": {"Valve": {"Steam": {"apps": app_entries, "LastPlayedTimesSyncTime": "1700000000"}}},
+        "WebStorage": {f"key{i}": "{\\\"x\\\": 1}" * 100 for i in range(apps)},
+        "apptickets": {str(i): "0" * 512 for i in range(apps)},
+    }}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifests", type=int, default=2000)
+    parser.add_argument("--apps", type=int, default=1000, help="число приложений в localconfig.vdf")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.manifests):
+            appid = 1000 + i * 10
+            path = os.path.join(tmp, f"appmanifest_{appid}.acf")
+            with open(path, "w", encoding="utf-8") as f:
+                vdf.dump(make_manifest(appid, rng), f, pretty=True)
+            paths.append(path)
+        localconfig = os.path.join(tmp, "localconfig.vdf")
+        with open(localconfig, "w", encoding="utf-8") as f:
+            vdf.dump(make_localconfig(args.apps, rng), f, pretty=True)
+
+        old, old_time = timed(lambda: [old_safe_vdf_load(p) for p in paths])
+        new, new_time = timed(lambda: [vdf_reader.load(p) for p in paths])
+        assert old == new, "full parse results differ"
+        keys, keys_time = timed(lambda: [vdf_reader.read_values(p, ("AppState",), ("appid", "name")) for p in paths])
+        assert keys == [{"appid": m["AppState"]["appid"], "name": m["AppState"]["name"]} for m in old], \
+            "appid/name differ"
+        print(f"{args.manifests} manifests:")
+        print(f"  safe_vdf_load (binary attempt + vdf.load): {old_time * 1000:8.1f} ms")
+        print(f"  vdf_reader.load:                           {new_time * 1000:8.1f} ms")
+        print(f"  vdf_reader.read_values(appid, name):       {keys_time * 1000:8.1f} ms")
+
+        size = os.path.getsize(localconfig) / 1024 / 1024
+        old, old_time = timed(old_safe_vdf_load, localconfig)
+        new, new_time = timed(vdf_reader.load, localconfig)
+        assert old == new, "localconfig results differ"
+        apps, apps_time = timed(vdf_reader.read_section, localconfig, LOCALCONFIG_APPS_SECTION)
+        expected = old
+        for name in LOCALCONFIG_APPS_SECTION:
+            expected = expected[name]
+        assert apps == expected, "apps section differs"
+        print(f"localconfig.vdf ({size:.1f} MiB, {args.apps} apps):")
+        print(f"  safe_vdf_load:                {old_time * 1000:8.1f} ms")
+        print(f"  vdf_reader.load:              {new_time * 1000:8.1f} ms")
+        print(f"  vdf_reader.read_section(apps): {apps_time * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
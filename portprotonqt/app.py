@@ -5,6 +5,7 @@ from PySide6.QtGui import QIcon
 from portprotonqt.main_window import MainWindow
 from portprotonqt.tray import SystemTray
 from portprotonqt.config_utils import read_theme_from_config
+from portprotonqt.image_utils import image_cache
 from portprotonqt.logger import get_logger
 
 logger = get_logger(__name__)
@@ -43,6 +44,8 @@ def main():
         tray.hide_action.triggered.connect(window.hide)
 
     window.settings_saved.connect(recreate_tray)
+    # QPixmap из кэша обложек должны быть освобождены до уничтожения QApplication
+    app.aboutToQuit.connect(image_cache.clear)
     window.show()
     sys.exit(app.exec())
 
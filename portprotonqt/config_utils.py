@@ -1,6 +1,9 @@
 import os
+import atexit
 import configparser
 import shutil
+import threading
+import time
 from portprotonqt.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +28,141 @@ THEMES_DIRS = [
     os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes")
 ]
 
+class _ConfigStore:
+    """
+    Содержимое PortProtonQT.conf в памяти. Файл перечитывается, только если изменились
+    его mtime, размер или inode (проверяется не чаще раза в CHECK_INTERVAL секунд),
+    а изменения настроек собираются и записываются одним атомарным сохранением
+    (временный файл + os.replace) через WRITE_DELAY секунд.
+    """
+    CHECK_INTERVAL = 1.0
+    WRITE_DELAY = 0.5
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._parser = configparser.ConfigParser()
+        self._signature = None
+        self._checked_at: float | None = None
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _refresh(self):
+        # Пока есть незаписанные изменения, в памяти находится самая новая версия
+        if self._dirty:
+            return
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        parser = configparser.ConfigParser()
+        if signature is not None:
+            try:
+                parser.read(self.path, encoding="utf-8")
+            except configparser.Error as e:
+                logger.error("Ошибка в конфигурационном файле: %s", e)
+                parser = configparser.ConfigParser()
+        self._parser = parser
+
+    def exists(self) -> bool:
+        """Есть ли файл настроек (или изменения, которые будут в него записаны)."""
+        with self._lock:
+            self._refresh()
+            return self._dirty or self._signature is not None
+
+    def has_section(self, section: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return self._parser.has_section(section)
+
+    def has_option(self, section: str, option: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return self._parser.has_option(section, option)
+
+    def get(self, section: str, option: str, fallback: str) -> str:
+        with self._lock:
+            self._refresh()
+            return self._parser.get(section, option, fallback=fallback)
+
+    def getint(self, section: str, option: str, fallback: int) -> int:
+        with self._lock:
+            self._refresh()
+            try:
+                return self._parser.getint(section, option, fallback=fallback)
+            except ValueError as e:
+                logger.error("Некорректное значение %s.%s в конфигурационном файле: %s", section, option, e)
+                return fallback
+
+    def getboolean(self, section: str, option: str, fallback: bool) -> bool:
+        with self._lock:
+            self._refresh()
+            try:
+                return self._parser.getboolean(section, option, fallback=fallback)
+            except ValueError as e:
+                logger.error("Некорректное значение %s.%s в конфигурационном файле: %s", section, option, e)
+                return fallback
+
+    def set(self, section: str, **values: str):
+        """Задаёт параметры секции (создавая её) и планирует запись файла."""
+        with self._lock:
+            self._refresh()
+            if not self._parser.has_section(section):
+                self._parser.add_section(section)
+            for option, value in values.items():
+                self._parser.set(section, option, value)
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.WRITE_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Записывает накопленные изменения, если они есть."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as configfile:
+                    self._parser.write(configfile)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error("Не удалось сохранить конфигурационный файл %s: %s", self.path, e)
+                return
+            self._dirty = False
+            self._signature = self._file_signature()
+            self._checked_at = time.monotonic()
+
+    def discard(self):
+        """Забывает настройки в памяти и незаписанные изменения (после удаления файла)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._parser = configparser.ConfigParser()
+            self._dirty = False
+            self._signature = None
+            self._checked_at = None
+
+_config = _ConfigStore(CONFIG_FILE)
+atexit.register(_config.flush)
+
 def read_config():
     """
     Читает конфигурационный файл и возвращает словарь параметров.
@@ -48,65 +186,31 @@ def read_theme_from_config():
     Читает из конфигурационного файла тему из секции [Appearance].
     Если параметр не задан, возвращает "standart".
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-            return "standart"
-    return cp.get("Appearance", "theme", fallback="standart")
+    return _config.get("Appearance", "theme", fallback="standart")
 
 def save_theme_to_config(theme_name):
     """
     Сохраняет имя выбранной темы в секции [Appearance] конфигурационного файла.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-    if "Appearance" not in cp:
-        cp["Appearance"] = {}
-    cp["Appearance"]["theme"] = theme_name
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Appearance", theme=theme_name)
 
 def read_time_config():
     """
     Читает настройки времени из секции [Time] конфигурационного файла.
     Если секция или параметр отсутствуют, сохраняет и возвращает "detailed" по умолчанию.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-            save_time_config("detailed")
-            return "detailed"
-        if not cp.has_section("Time") or not cp.has_option("Time", "detail_level"):
-            save_time_config("detailed")
-            return "detailed"
-        return cp.get("Time", "detail_level", fallback="detailed").lower()
-    return "detailed"
+    if not _config.exists():
+        return "detailed"
+    if not _config.has_option("Time", "detail_level"):
+        save_time_config("detailed")
+        return "detailed"
+    return _config.get("Time", "detail_level", fallback="detailed").lower()
 
 def save_time_config(detail_level):
     """
     Сохраняет настройку уровня детализации времени в секции [Time].
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-    if "Time" not in cp:
-        cp["Time"] = {}
-    cp["Time"]["detail_level"] = detail_level
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Time", detail_level=detail_level)
 
 def read_file_content(file_path):
     """
@@ -183,105 +287,54 @@ def read_card_size():
     Читает размер карточек (ширину) из секции [Cards],
     Если параметр не задан, возвращает 250.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-            save_card_size(250)
-            return 250
-        if not cp.has_section("Cards") or not cp.has_option("Cards", "card_width"):
-            save_card_size(250)
-            return 250
-        return cp.getint("Cards", "card_width", fallback=250)
-    return 250
+    if not _config.exists():
+        return 250
+    if not _config.has_option("Cards", "card_width"):
+        save_card_size(250)
+        return 250
+    return _config.getint("Cards", "card_width", fallback=250)
 
 def save_card_size(card_width):
     """
     Сохраняет размер карточек (ширину) в секцию [Cards].
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-    if "Cards" not in cp:
-        cp["Cards"] = {}
-    cp["Cards"]["card_width"] = str(card_width)
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Cards", card_width=str(card_width))
 
 def read_sort_method():
     """
     Читает метод сортировки из секции [Games].
     Если параметр не задан, возвращает last_launch.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-            save_sort_method("last_launch")
-            return "last_launch"
-        if not cp.has_section("Games") or not cp.has_option("Games", "sort_method"):
-            save_sort_method("last_launch")
-            return "last_launch"
-        return cp.get("Games", "sort_method", fallback="last_launch").lower()
-    return "last_launch"
+    if not _config.exists():
+        return "last_launch"
+    if not _config.has_option("Games", "sort_method"):
+        save_sort_method("last_launch")
+        return "last_launch"
+    return _config.get("Games", "sort_method", fallback="last_launch").lower()
 
 def save_sort_method(sort_method):
     """
     Сохраняет метод сортировки в секцию [Games].
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-    if "Games" not in cp:
-        cp["Games"] = {}
-    cp["Games"]["sort_method"] = sort_method
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Games", sort_method=sort_method)
 
 def read_display_filter():
     """
     Читает параметр display_filter из секции [Games].
     Если параметр отсутствует, сохраняет и возвращает значение "all".
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            logger.error("Ошибка чтения конфига: %s", e)
-            save_display_filter("all")
-            return "all"
-        if not cp.has_section("Games") or not cp.has_option("Games", "display_filter"):
-            save_display_filter("all")
-            return "all"
-        return cp.get("Games", "display_filter", fallback="all").lower()
-    return "all"
+    if not _config.exists():
+        return "all"
+    if not _config.has_option("Games", "display_filter"):
+        save_display_filter("all")
+        return "all"
+    return _config.get("Games", "display_filter", fallback="all").lower()
 
 def save_display_filter(filter_value):
     """
     Сохраняет параметр display_filter в секцию [Games] конфигурационного файла.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            logger.error("Ошибка чтения конфига: %s", e)
-    if "Games" not in cp:
-        cp["Games"] = {}
-    cp["Games"]["display_filter"] = filter_value
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Games", display_filter=filter_value)
 
 def read_favorites():
     """
@@ -289,58 +342,27 @@ def read_favorites():
     Список хранится как строка, заключённая в кавычки, с именами, разделёнными запятыми.
     Если секция или параметр отсутствуют, возвращает пустой список.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            logger.error("Ошибка чтения конфига: %s", e)
-            return []
-        if cp.has_section("Favorites") and cp.has_option("Favorites", "games"):
-            favs = cp.get("Favorites", "games", fallback="").strip()
-            # Если строка начинается и заканчивается кавычками, удаляем их
-            if favs.startswith('"') and favs.endswith('"'):
-                favs = favs[1:-1]
-            return [s.strip() for s in favs.split(",") if s.strip()]
-    return []
+    favs = _config.get("Favorites", "games", fallback="").strip()
+    # Если строка начинается и заканчивается кавычками, удаляем их
+    if favs.startswith('"') and favs.endswith('"'):
+        favs = favs[1:-1]
+    return [s.strip() for s in favs.split(",") if s.strip()]
 
 def save_favorites(favorites):
     """
     Сохраняет список избранных игр в секцию [Favorites] конфигурационного файла.
     Список сохраняется как строка, заключённая в двойные кавычки, где имена игр разделены запятыми.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            logger.error("Ошибка чтения конфига: %s", e)
-    if "Favorites" not in cp:
-        cp["Favorites"] = {}
     fav_str = ", ".join(favorites)
-    cp["Favorites"]["games"] = f'"{fav_str}"'
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Favorites", games=f'"{fav_str}"')
 
 def ensure_default_proxy_config():
     """
     Проверяет наличие секции [Proxy] в конфигурационном файле.
     Если секция отсутствует, создаёт её с пустыми значениями.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            logger.error("Ошибка чтения конфигурационного файла: %s", e)
-            return
-        if not cp.has_section("Proxy"):
-            cp.add_section("Proxy")
-            cp["Proxy"]["proxy_url"] = ""
-            cp["Proxy"]["proxy_user"] = ""
-            cp["Proxy"]["proxy_password"] = ""
-            with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-                cp.write(configfile)
+    if _config.exists() and not _config.has_section("Proxy"):
+        _config.set("Proxy", proxy_url="", proxy_user="", proxy_password="")
 
 
 def read_proxy_config():
@@ -349,18 +371,11 @@ def read_proxy_config():
     Если параметр proxy_url не задан или пустой, возвращает пустой словарь.
     """
     ensure_default_proxy_config()
-    cp = configparser.ConfigParser()
-    try:
-        cp.read(CONFIG_FILE, encoding="utf-8")
-    except Exception as e:
-        logger.error("Ошибка чтения конфигурационного файла: %s", e)
-        return {}
-
-    proxy_url = cp.get("Proxy", "proxy_url", fallback="").strip()
+    proxy_url = _config.get("Proxy", "proxy_url", fallback="").strip()
     if proxy_url:
         # Если указаны логин и пароль, добавляем их к URL
-        proxy_user = cp.get("Proxy", "proxy_user", fallback="").strip()
-        proxy_password = cp.get("Proxy", "proxy_password", fallback="").strip()
+        proxy_user = _config.get("Proxy", "proxy_user", fallback="").strip()
+        proxy_password = _config.get("Proxy", "proxy_password", fallback="").strip()
         if "://" in proxy_url and "@" not in proxy_url and proxy_user and proxy_password:
             protocol, rest = proxy_url.split("://", 1)
             proxy_url = f"{protocol}://{proxy_user}:{proxy_password}@{rest}"
@@ -372,97 +387,61 @@ def save_proxy_config(proxy_url="", proxy_user="", proxy_password=""):
     Сохраняет настройки proxy в секцию [Proxy] конфигурационного файла.
     Если секция отсутствует, создаёт её.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка чтения конфигурационного файла: %s", e)
-    if "Proxy" not in cp:
-        cp["Proxy"] = {}
-    cp["Proxy"]["proxy_url"] = proxy_url
-    cp["Proxy"]["proxy_user"] = proxy_user
-    cp["Proxy"]["proxy_password"] = proxy_password
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("Proxy", proxy_url=proxy_url, proxy_user=proxy_user, proxy_password=proxy_password)
 
 def read_fullscreen_config():
     """
     Читает настройку полноэкранного режима приложения из секции [Display].
     Если параметр отсутствует, сохраняет и возвращает False по умолчанию.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except Exception as e:
-            logger.error("Ошибка чтения конфигурационного файла: %s", e)
-            save_fullscreen_config(False)
-            return False
-        if not cp.has_section("Display") or not cp.has_option("Display", "fullscreen"):
-            save_fullscreen_config(False)
-            return False
-        return cp.getboolean("Display", "fullscreen", fallback=False)
-    return False
+    if not _config.exists():
+        return False
+    if not _config.has_option("Display", "fullscreen"):
+        save_fullscreen_config(False)
+        return False
+    return _config.getboolean("Display", "fullscreen", fallback=False)
 
 def save_fullscreen_config(fullscreen):
     """
     Сохраняет настройку полноэкранного режима приложения в секцию [Display].
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка чтения конфигурационного файла: %s", e)
-    if "Display" not in cp:
-        cp["Display"] = {}
-    cp["Display"]["fullscreen"] = str(fullscreen)
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
-
-
+    _config.set("Display", fullscreen=str(fullscreen))
 
 def read_window_geometry() -> tuple[int, int]:
     """
     Читает ширину и высоту окна из секции [MainWindow] конфигурационного файла.
     Возвращает кортеж (width, height). Если данные отсутствуют, возвращает (0, 0).
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-            return (0, 0)
-        if cp.has_section("MainWindow"):
-            width = cp.getint("MainWindow", "width", fallback=0)
-            height = cp.getint("MainWindow", "height", fallback=0)
-            return (width, height)
-    return (0, 0)
+    width = _config.getint("MainWindow", "width", fallback=0)
+    height = _config.getint("MainWindow", "height", fallback=0)
+    return (width, height)
 
 def save_window_geometry(width: int, height: int):
     """
     Сохраняет ширину и высоту окна в секцию [MainWindow] конфигурационного файла.
     """
-    cp = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cp.read(CONFIG_FILE, encoding="utf-8")
-        except (configparser.DuplicateSectionError, configparser.DuplicateOptionError) as e:
-            logger.error("Ошибка в конфигурационном файле: %s", e)
-    if "MainWindow" not in cp:
-        cp["MainWindow"] = {}
-    cp["MainWindow"]["width"] = str(width)
-    cp["MainWindow"]["height"] = str(height)
-    with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
-        cp.write(configfile)
+    _config.set("MainWindow", width=str(width), height=str(height))
+
+def read_image_cache_size() -> int:
+    """
+    Читает объём памяти (в МиБ) для кэша обложек из параметра image_cache_mb секции [Cards].
+    Если параметр не задан, возвращает 128.
+    """
+    return max(0, _config.getint("Cards", "image_cache_mb", fallback=128))
+
+def flush_config():
+    """
+    Немедленно записывает отложенные изменения настроек на диск.
+    Вызывается перед перезапуском процесса (os.execl не выполняет обработчики atexit).
+    """
+    _config.flush()
 
 def reset_config():
     """
     Сбрасывает конфигурационный файл, удаляя его.
     После этого все настройки будут возвращены к значениям по умолчанию при следующем чтении.
     """
+    _config.discard()
     if os.path.exists(CONFIG_FILE):
         try:
             os.remove(CONFIG_FILE)
@@ -3,6 +3,64 @@ from PySide6.QtWidgets import QLabel, QPushButton, QWidget, QLayout, QStyleOptio
 from PySide6.QtCore import Qt, Signal, QRect, QPoint, QSize
 from PySide6.QtGui import QFont, QFontMetrics, QPainter
 
+def _row_starts(widths, rect_width, spacing, first=0):
+    """
+    Разбивает элементы начиная с first на ряды и возвращает индексы первых элементов рядов.
+    Очередной элемент попадает в ряд, если сумма ширин ряда вместе с ним и spacing
+    помещается в rect_width; в ряду всегда есть хотя бы один элемент. Границы рядов
+    ищутся по накопленной сумме ширин через searchsorted, то есть за O(рядов) операций NumPy.
+    """
+    n = widths.shape[0]
+    if n > first and widths[first:].min() == widths[first:].max():
+        # Карточки одной ширины: в каждом ряду одинаковое число элементов
+        width = int(widths[first])
+        if width > 0:
+            per_row = max(1, (rect_width - spacing) // width)
+        else:
+            per_row = n - first if spacing <= rect_width else 1
+        return np.arange(first, n, per_row, dtype=np.int64)
+    # offsets[k] — суммарная ширина элементов [first, first + k)
+    offsets = np.zeros(n - first + 1, dtype=np.int64)
+    np.cumsum(widths[first:], out=offsets[1:])
+    starts = []
+    i = 0
+    while i < n - first:
+        starts.append(first + i)
+        end = int(np.searchsorted(offsets, offsets[i] + rect_width - spacing, side="right")) - 1
+        i = max(end, i + 1)
+    return np.array(starts, dtype=np.int64)
+
+def _place_rows(nat_sizes, starts, rect_width, spacing, max_scale, y=0):
+    """
+    Вычисляет [x, y, new_width, new_height] элементов nat_sizes, разбитых на ряды
+    с первыми элементами starts (starts[0] == 0), начиная с высоты y.
+    Возвращает массив (N, 4) и высоту после последнего ряда.
+    """
+    n = nat_sizes.shape[0]
+    widths = nat_sizes[:, 0].astype(np.int64)
+    heights = nat_sizes[:, 1].astype(np.int64)
+    ends = np.append(starts[1:], n)
+    counts = ends - starts
+    sums = np.add.reduceat(widths, starts)
+    # Доступная ширина ряда с учетом обязательных отступов между элементами
+    available = rect_width - spacing * (counts - 1)
+    desired = np.divide(available, sums, out=np.ones(len(starts)), where=sums > 0)
+    # Разрешаем увеличение карточек, но не более max_scale
+    row_scale = np.minimum(desired, max_scale)
+    row_heights = (np.maximum.reduceat(heights, starts) * row_scale).astype(np.int64) + spacing
+    row_y = y + np.cumsum(row_heights) - row_heights
+
+    scale = np.repeat(row_scale, counts)
+    result = np.zeros((n, 4), dtype=np.int32)
+    result[:, 2] = (widths * scale).astype(np.int32)
+    result[:, 3] = (heights * scale).astype(np.int32)
+    # Выравниваем по левому краю: x — сумма ширин и отступов предыдущих элементов ряда
+    steps = result[:, 2].astype(np.int64) + spacing
+    before = np.cumsum(steps) - steps
+    result[:, 0] = before - np.repeat(before[starts], counts)
+    result[:, 1] = np.repeat(row_y, counts)
+    return result, y + int(row_heights.sum())
+
 def compute_layout(nat_sizes, rect_width, spacing, max_scale):
     """
     Вычисляет расположение элементов с учетом отступов и возможного увеличения карточек.
@@ -15,45 +73,50 @@ def compute_layout(nat_sizes, rect_width, spacing, max_scale):
       result: массив (N, 4), где каждая строка содержит [x, y, new_width, new_height].
       total_height: итоговая высота всех рядов.
     """
-    N = nat_sizes.shape[0]
-    result = np.zeros((N, 4), dtype=np.int32)
-    y = 0
-    i = 0
-    while i < N:
-        sum_width = 0
-        row_max_height = 0
-        count = 0
-        j = i
-        # Подбираем количество элементов для текущего ряда
-        while j < N:
-            w = nat_sizes[j, 0]
-            # Если уже есть хотя бы один элемент и следующий не помещается с учетом spacing, выходим
-            if count > 0 and (sum_width + spacing + w) > rect_width:
-                break
-            sum_width += w
-            count += 1
-            h = nat_sizes[j, 1]
-            if h > row_max_height:
-                row_max_height = h
-            j += 1
-        # Доступная ширина ряда с учетом обязательных отступов между элементами
-        available_width = rect_width - spacing * (count - 1)
-        desired_scale = available_width / sum_width if sum_width > 0 else 1.0
-        # Разрешаем увеличение карточек, но не более max_scale
-        scale = desired_scale if desired_scale < max_scale else max_scale
-        # Выравниваем по левому краю (offset = 0)
-        x = 0
-        for k in range(i, j):
-            new_w = int(nat_sizes[k, 0] * scale)
-            new_h = int(nat_sizes[k, 1] * scale)
-            result[k, 0] = x
-            result[k, 1] = y
-            result[k, 2] = new_w
-            result[k, 3] = new_h
-            x += new_w + spacing
-        y += int(row_max_height * scale) + spacing
-        i = j
-    return result, y
+    if nat_sizes.shape[0] == 0:
+        return np.zeros((0, 4), dtype=np.int32), 0
+    starts = _row_starts(nat_sizes[:, 0], rect_width, spacing)
+    return _place_rows(nat_sizes, starts, rect_width, spacing, max_scale)
+
+class FlowGeometry:
+    """
+    Кэш расположения элементов для GameGrid.
+
+    Разбиение на ряды и геометрия хранятся для последних (число элементов, ширина,
+    spacing, max_scale, размеры элементов). Если с тех пор в конец добавились новые
+    элементы, а размеры прежних не изменились, пересчитываются только последний
+    прежний ряд и новые ряды.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._sizes = np.zeros((0, 2), dtype=np.int32)
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._geometry = np.zeros((0, 4), dtype=np.int32)
+        self._total_height = 0
+
+    def compute(self, nat_sizes, rect_width, spacing, max_scale):
+        """Возвращает то же, что compute_layout, используя результат предыдущего вызова."""
+        key = (rect_width, spacing, max_scale)
+        n = nat_sizes.shape[0]
+        cached = self._sizes.shape[0]
+        if key == self._key and n >= cached > 0 and np.array_equal(nat_sizes[:cached], self._sizes):
+            if n == cached:
+                return self._geometry, self._total_height
+            # Ряды до последнего прежнего не меняются при добавлении элементов в конец
+            first = int(self._starts[-1])
+            starts = _row_starts(nat_sizes[:, 0], rect_width, spacing, first)
+            tail, total_height = _place_rows(nat_sizes[first:], starts - first, rect_width, spacing,
+                                             max_scale, int(self._geometry[first, 1]))
+            self._starts = np.concatenate((self._starts[:-1], starts))
+            self._geometry = np.concatenate((self._geometry[:first], tail))
+        else:
+            self._starts = _row_starts(nat_sizes[:, 0], rect_width, spacing) if n else np.zeros(0, dtype=np.int64)
+            self._geometry, total_height = compute_layout(nat_sizes, rect_width, spacing, max_scale)
+        self._key = key
+        self._sizes = nat_sizes.copy()
+        self._total_height = total_height
+        return self._geometry, self._total_height
 
 class FlowLayout(QLayout):
     def __init__(self, parent=None):
@@ -1,10 +1,15 @@
-from PySide6.QtCore import QObject, Signal, QThread
+from PySide6.QtCore import QObject, Signal
 import threading
+import itertools
 import os
+import queue
+import time
 import requests
 import orjson
 import socket
 from pathlib import Path
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 from collections.abc import Callable
 from portprotonqt.config_utils import read_proxy_config
@@ -12,6 +17,11 @@ from portprotonqt.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Приоритеты загрузок: чем меньше число, тем раньше загрузка попадёт к рабочему потоку
+PRIORITY_HIGH = 0     # обложки, которые сейчас видны пользователю
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20     # фоновые архивы и метаданные
+
 def get_requests_session():
     session = requests.Session()
     proxy = read_proxy_config() or {}
@@ -20,10 +30,14 @@ def get_requests_session():
     session.verify = True
     return session
 
-def download_with_cache(url, local_path, timeout=5, downloader_instance=None):
+class DownloadCancelled(Exception):
+    pass
+
+def download_with_cache(url, local_path, timeout=5, downloader_instance=None, session=None, is_cancelled=None):
     if os.path.exists(local_path):
         return local_path
-    session = get_requests_session()
+    if session is None:
+        session = get_requests_session()
     try:
         with session.get(url, stream=True, timeout=timeout) as response:
             response.raise_for_status()
@@ -35,10 +49,17 @@ def download_with_cache(url, local_path, timeout=5, downloader_instance=None):
                       desc=f"Downloading {desc}", ascii=True) as pbar:
                 with open(local_path, 'wb') as f:
                     for chunk in response.iter_content(chunk_size=8192):
+                        if is_cancelled is not None and is_cancelled():
+                            raise DownloadCancelled(url)
                         if chunk:
                             f.write(chunk)
                             pbar.update(len(chunk))
         return local_path
+    except DownloadCancelled:
+        logger.debug(f"Загрузка {url} отменена")
+        if os.path.exists(local_path):
+            os.remove(local_path)
+        return None
     except Exception as e:
         logger.error(f"Ошибка загрузки {url}: {e}")
         if downloader_instance and hasattr(downloader_instance, '_last_error'):
@@ -47,17 +68,225 @@ def download_with_cache(url, local_path, timeout=5, downloader_instance=None):
             os.remove(local_path)
         return None
 
+class DownloadJob:
+    """
+    A queued download. Holds the callbacks waiting for it, cancellation state
+    and the per-request metrics filled in by the engine.
+    """
+
+    def __init__(self, url: str, local_path: str, timeout: int, priority: int,
+                 run: Callable[['DownloadJob'], str | None]):
+        self.url = url
+        self.local_path = local_path
+        self.timeout = timeout
+        self.priority = priority
+        self.host = urlsplit(url).netloc
+        self._run = run
+        self._callbacks: list[Callable[[str | None], None]] = []
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self.result: str | None = None
+        # Метрики запроса
+        self.queued_at = time.monotonic()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.bytes = 0
+
+    def cancel(self):
+        """Cancels the job: it is skipped if still queued and aborted between chunks if running."""
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def is_finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def wait_time(self) -> float:
+        return (self.started_at or time.monotonic()) - self.queued_at
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+class DownloadRequest:
+    """
+    One caller's interest in a download job that may be shared with other callers.
+    cancel() withdraws the caller's callback; the job itself is cancelled only when
+    nobody else waits for it and it has not started yet.
+    """
+
+    def __init__(self, engine: 'DownloadEngine', job: DownloadJob, callback: Callable[[str | None], None]):
+        self.job = job
+        self._engine = engine
+        self._callback = callback
+
+    def cancel(self):
+        self._engine.release(self.job, self._callback)
+
+    def raise_priority(self, priority: int):
+        """Moves the job forward in the queue if it has not started yet."""
+        self._engine.raise_priority(self.job, priority)
+
+class DownloadEngine:
+    """
+    Process-wide download engine: a fixed pool of worker threads fed from a
+    priority queue, with one pooled requests.Session per host so that
+    keep-alive and TLS sessions are reused between downloads.
+
+    Submitting a URL that is already queued for the same local path joins the
+    existing job instead of downloading it twice; a higher priority request
+    moves the job forward in the queue.
+    """
+
+    def __init__(self, max_workers: int = 6):
+        self.max_workers = max_workers
+        self._queue: queue.PriorityQueue[tuple[int, int, DownloadJob]] = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._jobs: dict[tuple[str, str], DownloadJob] = {}
+        self._sessions: dict[str, requests.Session] = {}
+        self._workers: list[threading.Thread] = []
+        self._stats = {"completed": 0, "failed": 0, "cancelled": 0, "bytes": 0, "wait_time": 0.0, "duration": 0.0}
+
+    def session_for(self, url: str) -> requests.Session:
+        """Returns the pooled session for the host of url, honouring the proxy settings."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = get_requests_session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def reset_sessions(self):
+        """Closes all pooled sessions, e.g. after the proxy settings were changed."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def submit(self, url: str, local_path: str, run: Callable[[DownloadJob], str | None],
+               callback: Callable[[str | None], None] | None = None,
+               timeout: int = 5, priority: int = PRIORITY_NORMAL) -> DownloadJob:
+        """Queues run(job) for url and calls callback(result) from a worker thread when it is done."""
+        key = (url, local_path)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.is_cancelled():
+                job = DownloadJob(url, local_path, timeout, priority, run)
+                self._jobs[key] = job
+                requeue = True
+            else:
+                requeue = priority < job.priority and job.started_at is None
+                job.priority = min(job.priority, priority)
+            if callback is not None:
+                job._callbacks.append(callback)
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker, name=f"download-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+        if requeue:
+            self._queue.put((job.priority, next(self._counter), job))
+        return job
+
+    def release(self, job: DownloadJob, callback: Callable[[str | None], None]):
+        """Removes callback from the waiters of job; a queued job left without waiters is cancelled."""
+        with self._lock:
+            if callback not in job._callbacks:
+                return
+            job._callbacks.remove(callback)
+            if not job._callbacks and job.started_at is None:
+                job.cancel()
+
+    def raise_priority(self, job: DownloadJob, priority: int):
+        """Raises the priority of a queued job and moves it forward in the queue."""
+        with self._lock:
+            requeue = priority < job.priority and job.started_at is None and not job.is_cancelled()
+            job.priority = min(job.priority, priority)
+        if requeue:
+            self._queue.put((job.priority, next(self._counter), job))
+
+    def stats(self) -> dict:
+        """Returns aggregated metrics of the finished downloads."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queued"] = sum(1 for job in self._jobs.values() if job.started_at is None)
+            stats["active"] = sum(1 for job in self._jobs.values() if job.started_at is not None)
+            return stats
+
+    def _worker(self):
+        while True:
+            _priority, _seq, job = self._queue.get()
+            with self._lock:
+                # Задача могла быть поставлена в очередь повторно с более высоким приоритетом
+                if job.started_at is not None or job.is_finished():
+                    continue
+                job.started_at = time.monotonic()
+            result = None
+            if not job.is_cancelled():
+                try:
+                    result = job._run(job)
+                except Exception as e:
+                    logger.error(f"Ошибка при загрузке {job.url}: {e}")
+            self._finish(job, result)
+
+    def _finish(self, job: DownloadJob, result: str | None):
+        job.finished_at = time.monotonic()
+        job.result = result
+        if result and os.path.exists(result):
+            job.bytes = os.path.getsize(result)
+        with self._lock:
+            if self._jobs.get((job.url, job.local_path)) is job:
+                del self._jobs[(job.url, job.local_path)]
+            outcome = "cancelled" if job.is_cancelled() else "completed" if result else "failed"
+            self._stats[outcome] += 1
+            self._stats["bytes"] += job.bytes
+            self._stats["wait_time"] += job.wait_time
+            self._stats["duration"] += job.duration
+            callbacks = job._callbacks
+            job._callbacks = []
+        logger.debug(f"Загрузка {job.url}: {outcome}, {job.bytes} байт, "
+                     f"ожидание {job.wait_time:.2f} с, загрузка {job.duration:.2f} с")
+        job._done.set()
+        for callback in callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"Ошибка в обработчике загрузки {job.url}: {e}")
+
+_engine: DownloadEngine | None = None
+_engine_lock = threading.Lock()
+
+def get_download_engine() -> DownloadEngine:
+    """Returns the download engine shared by all Downloader instances."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = DownloadEngine()
+        return _engine
+
 def download_with_parallel(urls, local_paths, max_workers=4, timeout=5, downloader_instance=None):
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
     results = {}
-    session = get_requests_session()
+    engine = get_download_engine()
 
     def _download_one(url, local_path):
         if os.path.exists(local_path):
             return local_path
         try:
-            with session.get(url, stream=True, timeout=timeout) as response:
+            with engine.session_for(url).get(url, stream=True, timeout=timeout) as response:
                 response.raise_for_status()
                 total_size = int(response.headers.get('Content-Length', 0))
                 os.makedirs(os.path.dirname(local_path), exist_ok=True)
@@ -100,7 +329,6 @@ class Downloader(QObject):
         self._cache = {}
         self._last_error = {}
         self._locks = {}
-        self._active_threads: list[QThread] = []
         self._global_lock = threading.Lock()
         self._has_internet = None
 
@@ -135,7 +363,7 @@ class Downloader(QObject):
                 self._locks[url] = threading.Lock()
             return self._locks[url]
 
-    def download(self, url, local_path, timeout=5):
+    def download(self, url, local_path, timeout=5, is_cancelled=None):
         if not self.has_internet():
             logger.warning(f"Нет интернета, пропускаем загрузку {url}")
             return None
@@ -152,7 +380,8 @@ class Downloader(QObject):
                     return None
                 if url in self._cache:
                     return self._cache[url]
-            result = download_with_cache(url, local_path, timeout, self)
+            result = download_with_cache(url, local_path, timeout, self,
+                                         session=get_download_engine().session_for(url), is_cancelled=is_cancelled)
             with self._global_lock:
                 if result:
                     self._cache[url] = result
@@ -194,47 +423,27 @@ class Downloader(QObject):
         return final_results
 
 
-    def download_async(self, url: str, local_path: str, timeout: int = 5, callback: Callable[[str | None], None] | None = None, parallel: bool = False) -> QThread:
-        class DownloadThread(QThread):
-            def __init__(self, downloader: 'Downloader', url: str, local_path: str, timeout: int, parallel: bool):
-                super().__init__()
-                self.downloader = downloader
-                self.url = url
-                self.local_path = local_path
-                self.timeout = timeout
-                self.parallel = parallel
-
-            def run(self):
-                try:
-                    if self.parallel:
-                        results = self.downloader.download_parallel([self.url], [self.local_path], timeout=self.timeout)
-                        result = results.get(self.url, None)
-                    else:
-                        result = self.downloader.download(self.url, self.local_path, self.timeout)
-                    success = result is not None
-                    logger.debug(f"Async download completed {self.url}: success={success}, path={result or ''}")
-                    self.downloader.download_completed.emit(self.url, result or "", success)
-                    if callback:
-                        callback(result)
-                except Exception as e:
-                    logger.error(f"Ошибка при асинхронной загрузке {self.url}: {e}")
-                    self.downloader.download_completed.emit(self.url, "", False)
-                    if callback:
-                        callback(None)
-
-        thread = DownloadThread(self, url, local_path, timeout, parallel)
-        thread.finished.connect(thread.deleteLater)
-
-        # Удалить из списка после завершения
-        def cleanup():
-            self._active_threads.remove(thread)
-
-        thread.finished.connect(cleanup)
+    def download_async(self, url: str, local_path: str, timeout: int = 5, callback: Callable[[str | None], None] | None = None,
+                       parallel: bool = False, priority: int = PRIORITY_NORMAL) -> DownloadRequest:
+        """
+        Queues a download on the shared DownloadEngine and calls callback(path or None)
+        from a worker thread. The returned request can be cancelled or moved forward in the queue.
+        parallel is kept for compatibility: every download now runs on the engine pool.
+        """
+        def run(job: DownloadJob) -> str | None:
+            return self.download(job.url, job.local_path, job.timeout, is_cancelled=job.is_cancelled)
+
+        def on_finished(result: str | None):
+            success = result is not None
+            logger.debug(f"Async download completed {url}: success={success}, path={result or ''}")
+            self.download_completed.emit(url, result or "", success)
+            if callback:
+                callback(result)
 
-        self._active_threads.append(thread)  # Сохраняем поток, чтобы не уничтожился досрочно
-        logger.debug(f"Запуск потока для асинхронной загрузки {url}")
-        thread.start()
-        return thread
+        logger.debug(f"Постановка в очередь асинхронной загрузки {url} (приоритет {priority})")
+        engine = get_download_engine()
+        job = engine.submit(url, local_path, run, on_finished, timeout=timeout, priority=priority)
+        return DownloadRequest(engine, job, on_finished)
 
     def clear_cache(self):
         with self._global_lock:
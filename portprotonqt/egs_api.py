@@ -9,6 +9,7 @@ from concurrent.futures import ThreadPoolExecutor
 from collections.abc import Callable
 from portprotonqt.localization import get_egs_language, _
 from portprotonqt.logger import get_logger
+from portprotonqt import network
 from portprotonqt.image_utils import load_pixmap_async
 from PySide6.QtGui import QPixmap
 
@@ -24,13 +25,9 @@ def get_cache_dir() -> Path:
     cache_dir.mkdir(parents=True, exist_ok=True)
     return cache_dir
 
-def get_egs_game_description_async(
-    app_name: str,
-    callback: Callable[[str], None],
-    cache_ttl: int = 3600
-) -> None:
+async def get_egs_game_description(app_name: str, cache_ttl: int = 3600) -> str:
     """
-    Asynchronously fetches the game description from the Epic Games Store API.
+    Fetches the game description from the Epic Games Store API.
     Uses per-app cache files named egs_app_{app_name}.json in ~/.cache/PortProtonQT.
     Checks the cache first; if the description is cached and not expired, returns it.
     Prioritizes the page with type 'productHome' for the base game description.
@@ -62,8 +59,7 @@ def get_egs_game_description_async(
                         app_name,
                         (description[:100] + "...") if len(description) > 100 else description
                     )
-                    callback(description)
-                    return
+                    return description
         except orjson.JSONDecodeError as e:
             logger.warning(
                 "Failed to parse description cache for %s: %s",
@@ -87,84 +83,80 @@ def get_egs_game_description_async(
     slug = app_name.lower().replace(":", "").replace(" ", "-")
     url = f"https://store-content.ak.epicgames.com/api/{lang}/content/products/{slug}"
 
-    def fetch_description():
-        try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = orjson.loads(response.content)
-
-            if not isinstance(data, dict):
-                logger.warning("Invalid JSON structure for %s: %s", app_name, type(data))
-                callback("")
-                return
-
-            description = ""
-            pages = data.get("pages", [])
-            if pages:
-                # Look for the page with type "productHome" for the base game
-                for page in pages:
-                    if page.get("type") == "productHome":
-                        about_data = page.get("data", {}).get("about", {})
-                        description = about_data.get("shortDescription", "")
-                        break
-                else:
-                    # Fallback to first page's description if no productHome is found
-                    description = (
-                        pages[0].get("data", {})
-                        .get("about", {})
-                        .get("shortDescription", "")
-                    )
-
-            if not description:
-                logger.warning("No valid description found for %s", app_name)
-
-            logger.debug(
-                "Fetched EGS description for %s: %s",
-                app_name,
-                (description[:100] + "...") if len(description) > 100 else description
+    try:
+        response = await network.http_get(url, timeout=5)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+    except requests.RequestException as e:
+        logger.warning(
+            "Failed to fetch EGS description for %s: %s",
+            app_name,
+            str(e)
+        )
+        return ""
+    except orjson.JSONDecodeError:
+        logger.warning(
+            "Invalid JSON response for %s", app_name
+        )
+        return ""
+
+    if not isinstance(data, dict):
+        logger.warning("Invalid JSON structure for %s: %s", app_name, type(data))
+        return ""
+
+    description = ""
+    pages = data.get("pages", [])
+    if pages:
+        # Look for the page with type "productHome" for the base game
+        for page in pages:
+            if page.get("type") == "productHome":
+                about_data = page.get("data", {}).get("about", {})
+                description = about_data.get("shortDescription", "")
+                break
+        else:
+            # Fallback to first page's description if no productHome is found
+            description = (
+                pages[0].get("data", {})
+                .get("about", {})
+                .get("shortDescription", "")
             )
 
-            cache_entry = {"description": description, "timestamp": time.time()}
-            try:
-                temp_file = cache_file.with_suffix('.tmp')
-                with open(temp_file, "wb") as f:
-                    f.write(orjson.dumps(cache_entry))
-                temp_file.replace(cache_file)
-                logger.debug(
-                    "Saved description to cache for %s", app_name
-                )
-            except Exception as e:
-                logger.error(
-                    "Failed to save description cache for %s: %s",
-                    app_name,
-                    str(e)
-                )
-            callback(description)
-        except requests.RequestException as e:
-            logger.warning(
-                "Failed to fetch EGS description for %s: %s",
-                app_name,
-                str(e)
-            )
-            callback("")
-        except orjson.JSONDecodeError:
-            logger.warning(
-                "Invalid JSON response for %s", app_name
-            )
-            callback("")
-        except Exception as e:
-            logger.error(
-                "Unexpected error fetching EGS description for %s: %s",
-                app_name,
-                str(e)
-            )
-            callback("")
+    if not description:
+        logger.warning("No valid description found for %s", app_name)
 
-    thread = threading.Thread(
-        target=fetch_description,
-        daemon=True
+    logger.debug(
+        "Fetched EGS description for %s: %s",
+        app_name,
+        (description[:100] + "...") if len(description) > 100 else description
     )
-    thread.start()
+
+    cache_entry = {"description": description, "timestamp": time.time()}
+    try:
+        temp_file = cache_file.with_suffix('.tmp')
+        with open(temp_file, "wb") as f:
+            f.write(orjson.dumps(cache_entry))
+        temp_file.replace(cache_file)
+        logger.debug(
+            "Saved description to cache for %s", app_name
+        )
+    except Exception as e:
+        logger.error(
+            "Failed to save description cache for %s: %s",
+            app_name,
+            str(e)
+        )
+    return description
+
+def get_egs_game_description_async(
+    app_name: str,
+    callback: Callable[[str], None],
+    cache_ttl: int = 3600
+) -> None:
+    """
+    Asynchronously fetches the game description from the Epic Games Store API,
+    see get_egs_game_description. Calls the callback with the description.
+    """
+    network.submit(get_egs_game_description(app_name, cache_ttl), callback, default="")
 
 def run_legendary_list_async(legendary_path: str, callback: Callable[[list | None], None]):
     """
@@ -208,9 +200,14 @@ def run_legendary_list_async(legendary_path: str, callback: Callable[[list | Non
 
     threading.Thread(target=execute_command, daemon=True).start()
 
-def load_egs_games_async(legendary_path: str, callback: Callable[[list[tuple]], None], downloader, update_progress: Callable[[int], None], update_status_message: Callable[[str, int], None]):
+def load_egs_games_async(legendary_path: str, callback: Callable[[list[tuple]], None], downloader, update_progress: Callable[[int, int], None], update_status_message: Callable[[str, int], None],
+                         known_games: dict[str, tuple] | None = None, on_game: Callable[[tuple], None] | None = None):
     """
     Асинхронно загружает Epic Games Store игры с использованием legendary CLI.
+    known_games — уже проверенные кортежи игр по app_name (например, из снимка библиотеки),
+    для них описание и обложка повторно не запрашиваются.
+    on_game вызывается для каждой игры сразу, как только известны её название и app_name,
+    и повторно после загрузки описания и обложки.
     """
     logger.debug("Starting to load Epic Games Store games")
     games: list[tuple] = []
@@ -230,7 +227,7 @@ def load_egs_games_async(legendary_path: str, callback: Callable[[list[tuple]],
                     logger.error(f"Failed to make legendary binary executable: {e}")
                     callback(games)  # Return empty games list on failure
                     return
-                _continue_loading_egs_games(legendary_path, callback, metadata_dir, cache_dir, cache_file, cache_ttl, update_progress, update_status_message)
+                _continue_loading_egs_games(legendary_path, callback, metadata_dir, cache_dir, cache_file, cache_ttl, update_progress, update_status_message, known_games, on_game)
             else:
                 logger.error("Failed to download legendary binary")
                 callback(games)  # Return empty games list on failure
@@ -241,9 +238,10 @@ def load_egs_games_async(legendary_path: str, callback: Callable[[list[tuple]],
             callback(games)
         return
     else:
-        _continue_loading_egs_games(legendary_path, callback, metadata_dir, cache_dir, cache_file, cache_ttl, update_progress, update_status_message)
+        _continue_loading_egs_games(legendary_path, callback, metadata_dir, cache_dir, cache_file, cache_ttl, update_progress, update_status_message, known_games, on_game)
 
-def _continue_loading_egs_games(legendary_path: str, callback: Callable[[list[tuple]], None], metadata_dir: Path, cache_dir: Path, cache_file: Path, cache_ttl: int, update_progress: Callable[[int], None], update_status_message: Callable[[str, int], None]):
+def _continue_loading_egs_games(legendary_path: str, callback: Callable[[list[tuple]], None], metadata_dir: Path, cache_dir: Path, cache_file: Path, cache_ttl: int, update_progress: Callable[[int, int], None], update_status_message: Callable[[str, int], None],
+                                known_games: dict[str, tuple] | None = None, on_game: Callable[[tuple], None] | None = None):
     """
     Продолжает процесс загрузки EGS игр, либо из кэша, либо через legendary CLI.
     """
@@ -276,12 +274,21 @@ def _continue_loading_egs_games(legendary_path: str, callback: Callable[[list[tu
 
         pending_images = len(valid_games)
         total_games = len(valid_games)
-        update_progress(0)
+        update_progress(0, total_games)
         update_status_message(_("Loading Epic Games Store games..."), 3000)
 
         game_results: dict[int, tuple] = {}
         results_lock = threading.Lock()
 
+        def finish_loading():
+            from portprotonqt.steam_api import get_weanticheatyet_statuses_async
+            final_games = [game_results[i] for i in sorted(game_results.keys())]
+
+            def on_anticheat_statuses(statuses: dict[str, str]):
+                callback([game[:9] + (statuses.get(game[0], ""),) + game[10:] for game in final_games])
+
+            get_weanticheatyet_statuses_async([game[0] for game in final_games], on_anticheat_statuses)
+
         def process_game_metadata(game, index):
             nonlocal pending_images
             app_name = game.get("app_name", "")
@@ -289,10 +296,23 @@ def _continue_loading_egs_games(legendary_path: str, callback: Callable[[list[tu
             if not app_name:
                 with results_lock:
                     pending_images -= 1
-                    update_progress(total_games - pending_images)
-                    if pending_images == 0:
-                        final_games = [game_results[i] for i in sorted(game_results.keys())]
-                        callback(final_games)
+                    update_progress(total_games - pending_images, total_games)
+                    done = pending_images == 0
+                if done:
+                    finish_loading()
+                return
+
+            known = known_games.get(app_name) if known_games else None
+            if known is not None and (not known[2] or os.path.exists(known[2])):
+                if on_game:
+                    on_game(tuple(known))
+                with results_lock:
+                    game_results[index] = tuple(known)
+                    pending_images -= 1
+                    update_progress(total_games - pending_images, total_games)
+                    done = pending_images == 0
+                if done:
+                    finish_loading()
                 return
 
             metadata_file = metadata_dir / f"{app_name}.json"
@@ -311,45 +331,53 @@ def _continue_loading_egs_games(legendary_path: str, callback: Callable[[list[tu
             image_folder = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "PortProtonQT", "images")
             local_path = os.path.join(image_folder, f"{app_name}.jpg") if cover_url else ""
 
+            def build_game(description: str, cover: str) -> tuple:
+                return (
+                    title,
+                    description,
+                    cover,
+                    app_name,
+                    f"legendary:launch:{app_name}",
+                    "",
+                    _("Never"),
+                    "",
+                    "",
+                    "",
+                    0,
+                    0,
+                    "epic"
+                )
+
+            if on_game:
+                # Описание и обложка подставятся после сетевых запросов
+                on_game(build_game("", ""))
+
             def on_description_fetched(api_description: str):
                 final_description = api_description or _("No description available")
 
                 def on_cover_loaded(pixmap: QPixmap):
-                    from portprotonqt.steam_api import get_weanticheatyet_status_async
-                    def on_anticheat_status(status: str):
-                        nonlocal pending_images
-                        with results_lock:
-                            game_results[index] = (
-                                title,
-                                final_description,
-                                local_path if os.path.exists(local_path) else "",
-                                app_name,
-                                f"legendary:launch:{app_name}",
-                                "",
-                                _("Never"),
-                                "",
-                                "",
-                                status or "",
-                                0,
-                                0,
-                                "epic"
-                            )
-                            pending_images -= 1
-                            update_progress(total_games - pending_images)
-                            if pending_images == 0:
-                                final_games = [game_results[i] for i in sorted(game_results.keys())]
-                                callback(final_games)
-
-                    get_weanticheatyet_status_async(title, on_anticheat_status)
+                    nonlocal pending_images
+                    game = build_game(final_description, local_path if os.path.exists(local_path) else "")
+                    if on_game:
+                        on_game(game)
+                    with results_lock:
+                        game_results[index] = game
+                        pending_images -= 1
+                        update_progress(total_games - pending_images, total_games)
+                        done = pending_images == 0
+                    if done:
+                        finish_loading()
 
                 load_pixmap_async(cover_url, 600, 900, on_cover_loaded, app_name=app_name)
 
             get_egs_game_description_async(title, on_description_fetched)
 
         max_workers = min(4, len(valid_games))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for i, game in enumerate(valid_games):
-                executor.submit(process_game_metadata, game, i)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        for i, game in enumerate(valid_games):
+            executor.submit(process_game_metadata, game, i)
+        # Не блокируем вызывающий поток: игры передаются в on_game по мере готовности
+        executor.shutdown(wait=False)
 
     # Проверяем кэш
     use_cache = False
@@ -0,0 +1,200 @@
+import asyncio
+import os
+import subprocess
+import threading
+import orjson
+from collections.abc import Iterable
+from portprotonqt import network
+from portprotonqt.logger import get_logger
+from portprotonqt.pe_version import PEFormatError, read_version_strings
+
+logger = get_logger(__name__)
+
+# Поля VS_VERSIONINFO, по которым ищутся кандидаты названия игры.
+# Читаются встроенным разборщиком PE (pe_version), exiftool используется только
+# для файлов, которые тот не смог разобрать.
+VERSION_FIELDS = ("ProductName", "FileDescription")
+# Число файлов на один запуск exiftool (ограничение длины командной строки)
+EXIFTOOL_BATCH_SIZE = 200
+# Сколько ждать остальные запросы перед запуском exiftool для накопившихся файлов
+BATCH_DELAY = 0.1
+
+_CACHE: dict[str, dict] | None = None
+_CACHE_LOCK = threading.Lock()
+_batch: dict[str, asyncio.Future] = {}  # используется только в сетевом цикле
+
+def get_cache_path():
+    """Возвращает путь к файлу кэша метаданных исполняемых файлов."""
+    cache_home = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_home, "PortProtonQT", "exe_metadata.json")
+
+def _signature(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def _load_cache() -> dict[str, dict]:
+    """Лениво загружает кэш; вызывается под _CACHE_LOCK."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = {}
+        path = get_cache_path()
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    data = orjson.loads(f.read())
+                if isinstance(data, dict):
+                    _CACHE = data
+            except (OSError, orjson.JSONDecodeError) as e:
+                logger.warning("Не удалось прочитать кэш метаданных exe %s: %s", path, e)
+    return _CACHE
+
+def _save_cache(cache: dict[str, dict]):
+    path = get_cache_path()
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error("Не удалось сохранить кэш метаданных exe %s: %s", path, e)
+
+def get_cached_metadata(path: str) -> dict | None:
+    """
+    Возвращает сохранённые поля версии файла, если его размер и время изменения
+    не изменились с момента чтения, иначе None.
+    """
+    signature = _signature(path)
+    if signature is None:
+        return None
+    with _CACHE_LOCK:
+        entry = _load_cache().get(path)
+    if entry is None or entry.get("sig") != signature:
+        return None
+    return entry.get("fields", {})
+
+def run_exiftool(paths: list[str]) -> dict[str, dict] | None:
+    """
+    Читает VERSION_FIELDS для нескольких файлов одним запуском exiftool на каждые
+    EXIFTOOL_BATCH_SIZE файлов. Возвращает {путь: поля} для прочитанных файлов
+    или None, если exiftool недоступен.
+    """
+    results: dict[str, dict] = {}
+    tags = [f"-{field}" for field in VERSION_FIELDS]
+    for start in range(0, len(paths), EXIFTOOL_BATCH_SIZE):
+        chunk = paths[start:start + EXIFTOOL_BATCH_SIZE]
+        try:
+            proc = subprocess.run(
+                ["exiftool", "-j", "-charset", "filename=utf8", *tags, *chunk],
+                capture_output=True,
+                check=False
+            )
+        except OSError as e:
+            logger.error("Failed to run exiftool: %s", e)
+            return None
+        # Для отсутствующих или нечитаемых файлов exiftool возвращает ненулевой код,
+        # но выводит данные остальных файлов
+        if proc.returncode != 0 and proc.stderr:
+            logger.warning("exiftool: %s", proc.stderr.decode("utf-8", "replace").strip())
+        if not proc.stdout.strip():
+            continue
+        try:
+            entries = orjson.loads(proc.stdout)
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid exiftool output: %s", e)
+            continue
+        for entry in entries:
+            source = entry.get("SourceFile")
+            if source:
+                results[source] = {field: str(entry[field]) for field in VERSION_FIELDS if entry.get(field)}
+    return results
+
+def read_native_metadata(path: str) -> dict | None:
+    """
+    Читает VERSION_FIELDS встроенным разборщиком PE. Возвращает None, если файл
+    не удалось разобрать и нужно обратиться к exiftool.
+    """
+    try:
+        return read_version_strings(path, VERSION_FIELDS)
+    except PEFormatError as e:
+        logger.debug("Falling back to exiftool for %s: %s", path, e)
+        return None
+    except OSError as e:
+        logger.warning("Failed to read %s: %s", path, e)
+        return {}
+
+def get_exiftool_metadata_many(paths: Iterable[str]) -> dict[str, dict]:
+    """
+    Возвращает {путь: поля версии} для файлов через exiftool. Данные берутся из кэша по
+    (путь, размер, mtime); для остальных файлов exiftool запускается пакетно,
+    а результат сохраняется в кэш между запусками.
+    """
+    results: dict[str, dict] = {}
+    misses: dict[str, list[int]] = {}
+    with _CACHE_LOCK:
+        cache = _load_cache()
+        for path in dict.fromkeys(paths):
+            signature = _signature(path)
+            if signature is None:
+                results[path] = {}
+                continue
+            entry = cache.get(path)
+            if entry is not None and entry.get("sig") == signature:
+                results[path] = entry.get("fields", {})
+            else:
+                misses[path] = signature
+    if not misses:
+        return results
+
+    logger.info("Reading version info of %d executables with exiftool", len(misses))
+    fetched = run_exiftool(list(misses))
+    if fetched is None:
+        results.update(dict.fromkeys(misses, {}))
+        return results
+    with _CACHE_LOCK:
+        cache = _load_cache()
+        for path, signature in misses.items():
+            fields = fetched.get(path, {})
+            results[path] = fields
+            cache[path] = {"sig": signature, "fields": fields}
+        _save_cache(cache)
+    return results
+
+async def get_exe_metadata(path: str) -> dict:
+    """
+    Возвращает поля версии исполняемого файла. Обычно они читаются встроенным
+    разборщиком PE; файлы, которые он не смог разобрать, передаются exiftool.
+    Такие запросы, поступившие в течение BATCH_DELAY, объединяются в один вызов
+    get_exiftool_metadata_many, поэтому при загрузке библиотеки exiftool
+    запускается не больше одного раза на все новые файлы.
+    Должна вызываться в сетевом цикле.
+    """
+    fields = await network.run_blocking(read_native_metadata, path)
+    if fields is not None:
+        return fields
+    cached = await network.run_blocking(get_cached_metadata, path)
+    if cached is not None:
+        return cached
+    future = _batch.get(path)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        if not _batch:
+            loop.call_later(BATCH_DELAY, lambda: asyncio.ensure_future(_flush_batch()))
+        future = loop.create_future()
+        _batch[path] = future
+    return await asyncio.shield(future)
+
+async def _flush_batch():
+    batch = dict(_batch)
+    _batch.clear()
+    try:
+        results = await network.run_blocking(get_exiftool_metadata_many, list(batch))
+    except Exception as e:
+        logger.error("Failed to read executables metadata: %s", e)
+        results = {}
+    for path, future in batch.items():
+        if not future.done():
+            future.set_result(results.get(path, {}))
@@ -1,9 +1,10 @@
 from PySide6.QtGui import QPainter, QPen, QColor, QConicalGradient, QBrush, QDesktopServices
 from PySide6.QtCore import QEasingCurve, Signal, Property, Qt, QPropertyAnimation, QByteArray, QUrl
-from PySide6.QtWidgets import QFrame, QGraphicsDropShadowEffect, QVBoxLayout, QWidget, QStackedLayout, QLabel
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QWidget, QStackedLayout, QLabel
 from collections.abc import Callable
 import portprotonqt.themes.standart.styles as default_styles
-from portprotonqt.image_utils import load_pixmap_async, round_corners
+from portprotonqt.image_utils import PixmapRequest, load_pixmap_async
+from portprotonqt.downloader import PRIORITY_HIGH
 from portprotonqt.localization import _
 from portprotonqt.config_utils import read_favorites, save_favorites
 from portprotonqt.theme_manager import ThemeManager
@@ -28,22 +29,9 @@ class GameCard(QFrame):
 
     def __init__(self, name, description, cover_path, appid, controller_support, exec_line,
                 last_launch, formatted_playtime, protondb_tier, anticheat_status, last_launch_ts, playtime_seconds, steam_game,
-                select_callback, theme=None, card_width=250, parent=None, context_menu_manager=None):
+                select_callback, theme=None, card_width=250, parent=None, context_menu_manager=None,
+                cover_priority=PRIORITY_HIGH):
         super().__init__(parent)
-        self.name = name
-        self.description = description
-        self.cover_path = cover_path
-        self.appid = appid
-        self.controller_support = controller_support
-        self.exec_line = exec_line
-        self.last_launch = last_launch
-        self.formatted_playtime = formatted_playtime
-        self.protondb_tier = protondb_tier
-        self.anticheat_status = anticheat_status
-        self.steam_game = steam_game
-        self.last_launch_ts = last_launch_ts
-        self.playtime_seconds = playtime_seconds
-
         self.select_callback = select_callback
         self.context_menu_manager = context_menu_manager
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -74,12 +62,8 @@ class GameCard(QFrame):
         # Флаг для отслеживания подключения слота startPulseAnimation
         self._isPulseAnimationConnected = False
 
-        # Тень
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(20)
-        shadow.setColor(QColor(0, 0, 0, 150))
-        shadow.setOffset(0, 0)
-        self.setGraphicsEffect(shadow)
+        # Тень рисует GameGrid из общего заранее отрисованного изображения:
+        # QGraphicsDropShadowEffect размывал бы карточку при каждой перерисовке
 
         # Отступы
         layout = QVBoxLayout(self)
@@ -98,49 +82,22 @@ class GameCard(QFrame):
         self.coverLabel.setFixedSize(card_width, int(card_width * 1.2))
         self.coverLabel.setStyleSheet(self.theme.COVER_LABEL_STYLE)
         coverLayout.addWidget(self.coverLabel)
-
-        # создаём слабую ссылку на label
-        label_ref = weakref.ref(self.coverLabel)
-
-        def on_cover_loaded(pixmap):
-            label = label_ref()
-            if label is None:
-                # QLabel уже удалён — ничего не делаем
-                return
-            label.setPixmap(round_corners(pixmap, 15))
-
-        # асинхронная загрузка обложки (пустая строка даст placeholder внутри load_pixmap_async)
-        load_pixmap_async(cover_path or "", card_width, int(card_width * 1.2), on_cover_loaded)
+        # Номер последнего запроса обложки: карточка может быть перепривязана к другой игре
+        # до того, как загрузится обложка предыдущей
+        self._cover_request = 0
+        # Обложка, которая показана или загружается, и её незавершённый запрос
+        self._cover_source = None
+        self._cover_pending: PixmapRequest | None = None
 
         # Значок избранного (звёздочка) в левом верхнем углу обложки
         self.favoriteLabel = ClickableLabel(coverWidget)
         self.favoriteLabel.setFixedSize(*self.theme.favoriteLabelSize)
         self.favoriteLabel.move(8, 8)
         self.favoriteLabel.clicked.connect(self.toggle_favorite)
-        self.is_favorite = self.name in read_favorites()
-        self.update_favorite_icon()
-        self.favoriteLabel.raise_()
 
         # ProtonDB бейдж
-        tier_text = self.getProtonDBText(protondb_tier)
-        if tier_text:
-            icon_filename = self.getProtonDBIconFilename(protondb_tier)
-            icon = self.theme_manager.get_icon(icon_filename, self.current_theme_name)
-            self.protondbLabel = ClickableLabel(
-                tier_text,
-                icon=icon,
-                parent=coverWidget,
-                icon_size=16,
-                icon_space=3,
-            )
-            self.protondbLabel.setStyleSheet(self.theme.get_protondb_badge_style(protondb_tier))
-            self.protondbLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину в 2/3 ширины карточки
-            protondb_visible = True
-        else:
-            self.protondbLabel = ClickableLabel("", parent=coverWidget, icon_size=16, icon_space=3)
-            self.protondbLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину даже для невидимого бейджа
-            self.protondbLabel.setVisible(False)
-            protondb_visible = False
+        self.protondbLabel = ClickableLabel("", parent=coverWidget, icon_size=16, icon_space=3)
+        self.protondbLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину в 2/3 ширины карточки
 
         # Steam бейдж
         steam_icon = self.theme_manager.get_icon("steam")
@@ -153,64 +110,152 @@ class GameCard(QFrame):
         )
         self.steamLabel.setStyleSheet(self.theme.STEAM_BADGE_STYLE)
         self.steamLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину в 2/3 ширины карточки
-        steam_visible = (str(steam_game).lower() == "true")
-        self.steamLabel.setVisible(steam_visible)
 
         # WeAntiCheatYet бейдж
+        self.anticheatLabel = ClickableLabel("", parent=coverWidget, icon_size=16, icon_space=3)
+        self.anticheatLabel.setStyleSheet(self.theme.STEAM_BADGE_STYLE)
+        self.anticheatLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину даже для невидимого бейджа
+
+        self._card_width = card_width
+        self.favoriteLabel.raise_()
+        self.anticheatLabel.raise_()
+        self.protondbLabel.raise_()
+        self.steamLabel.raise_()
+        self.protondbLabel.clicked.connect(self.open_protondb_report)
+        self.steamLabel.clicked.connect(self.open_steam_page)
+        self.anticheatLabel.clicked.connect(self.open_weanticheatyet_page)
+
+        layout.addWidget(coverWidget)
+
+        # Название игры
+        self.nameLabel = QLabel()
+        self.nameLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.nameLabel.setStyleSheet(self.theme.GAME_CARD_NAME_LABEL_STYLE)
+        layout.addWidget(self.nameLabel)
+
+        self.set_game_data(name, description, cover_path, appid, controller_support, exec_line,
+                           last_launch, formatted_playtime, protondb_tier, anticheat_status,
+                           last_launch_ts, playtime_seconds, steam_game, cover_priority=cover_priority)
+
+    def set_game_data(self, name, description, cover_path, appid, controller_support, exec_line,
+                      last_launch, formatted_playtime, protondb_tier, anticheat_status, last_launch_ts,
+                      playtime_seconds, steam_game, favorites=None, cover_priority=PRIORITY_HIGH):
+        """
+        Привязывает карточку к игре: обновляет поля, название, обложку, избранное и бейджи.
+        Используется и при создании карточки, и при её повторном использовании для другой
+        игры в сетке. favorites — уже прочитанный список избранного, чтобы не читать
+        конфиг для каждой карточки; cover_priority — приоритет загрузки обложки из сети.
+        """
+        cover_changed = cover_path != self._cover_source
+        self.name = name
+        self.description = description
+        self.cover_path = cover_path
+        self.appid = appid
+        self.controller_support = controller_support
+        self.exec_line = exec_line
+        self.last_launch = last_launch
+        self.formatted_playtime = formatted_playtime
+        self.protondb_tier = protondb_tier
+        self.anticheat_status = anticheat_status
+        self.steam_game = steam_game
+        self.last_launch_ts = last_launch_ts
+        self.playtime_seconds = playtime_seconds
+
+        self.nameLabel.setText(name)
+
+        if cover_changed:
+            self.release_cover()
+            self._cover_source = cover_path
+            self._cover_request += 1
+            request = self._cover_request
+            # создаём слабую ссылку на карточку
+            card_ref = weakref.ref(self)
+
+            def on_cover_loaded(pixmap):
+                card = card_ref()
+                if card is None or card._cover_request != request:
+                    # карточка удалена или уже показывает другую игру — ничего не делаем
+                    return
+                card.coverLabel.setPixmap(pixmap)
+                card._cover_pending = None
+
+            # асинхронная загрузка обложки со скруглёнными углами (пустая строка даст placeholder внутри load_pixmap_async)
+            self.coverLabel.clear()
+            pixmap_request = load_pixmap_async(cover_path or "", self._card_width, int(self._card_width * 1.2),
+                                               on_cover_loaded, radius=15, priority=cover_priority)
+            self._cover_pending = None if pixmap_request.is_finished() else pixmap_request
+
+        self.is_favorite = self.name in (favorites if favorites is not None else read_favorites())
+        self.update_favorite_icon()
+
+        self._apply_protondb_badge(protondb_tier)
+
+        self._steam_visible = (str(steam_game).lower() == "true")
+        self.steamLabel.setVisible(self._steam_visible)
+
         anticheat_text = self.getAntiCheatText(anticheat_status)
         if anticheat_text:
             icon_filename = self.getAntiCheatIconFilename(anticheat_status)
-            icon = self.theme_manager.get_icon(icon_filename, self.current_theme_name)
-            self.anticheatLabel = ClickableLabel(
-                anticheat_text,
-                icon=icon,
-                parent=coverWidget,
-                icon_size=16,
-                icon_space=3,
-            )
-            self.anticheatLabel.setStyleSheet(self.theme.STEAM_BADGE_STYLE)
-            self.anticheatLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину в 2/3 ширины карточки
-            anticheat_visible = True
-        else:
-            self.anticheatLabel = ClickableLabel("", parent=coverWidget, icon_size=16, icon_space=3)
-            self.anticheatLabel.setFixedWidth(int(card_width * 2/3))  # Устанавливаем ширину даже для невидимого бейджа
-            self.anticheatLabel.setVisible(False)
-            anticheat_visible = False
+            self.anticheatLabel.setText(anticheat_text)
+            self.anticheatLabel.setIcon(self.theme_manager.get_icon(icon_filename, self.current_theme_name))
+        self._anticheat_visible = bool(anticheat_text)
+        self.anticheatLabel.setVisible(self._anticheat_visible)
 
         # Расположение бейджей
+        self._layout_badges()
+
+    def release_cover(self):
+        """
+        Отзывает незавершённую загрузку обложки, например когда сетка убирает карточку
+        из видимой области. При следующей привязке обложка запрашивается заново.
+        """
+        if self._cover_pending is not None:
+            self._cover_pending.cancel()
+            self._cover_pending = None
+            self._cover_source = None
+
+    def raise_cover_priority(self, priority: int):
+        """Продвигает в очереди ещё не загруженную обложку, например когда карточка стала видимой."""
+        if self._cover_pending is not None:
+            self._cover_pending.raise_priority(priority)
+
+    def _apply_protondb_badge(self, tier):
+        """Обновляет текст, иконку и стиль бейджа ProtonDB для указанного рейтинга."""
+        tier_text = self.getProtonDBText(tier)
+        if tier_text:
+            icon_filename = self.getProtonDBIconFilename(tier)
+            self.protondbLabel.setText(tier_text)
+            self.protondbLabel.setIcon(self.theme_manager.get_icon(icon_filename, self.current_theme_name))
+            self.protondbLabel.setStyleSheet(self.theme.get_protondb_badge_style(tier))
+        self._protondb_visible = bool(tier_text)
+        self.protondbLabel.setVisible(self._protondb_visible)
+
+    def _layout_badges(self):
+        """Располагает видимые бейджи столбиком в правом верхнем углу обложки."""
         right_margin = 8
         badge_spacing = 5
         top_y = 10
         badge_y_positions = []
-        badge_width = int(card_width * 2/3)  # Фиксированная ширина бейджей
-        if steam_visible:
-            steam_x = card_width - badge_width - right_margin
-            self.steamLabel.move(steam_x, top_y)
+        badge_width = int(self._card_width * 2/3)  # Фиксированная ширина бейджей
+        badge_x = self._card_width - badge_width - right_margin
+        if self._steam_visible:
+            self.steamLabel.move(badge_x, top_y)
             badge_y_positions.append(top_y + self.steamLabel.height())
-        if protondb_visible:
-            protondb_x = card_width - badge_width - right_margin
+        if self._protondb_visible:
             protondb_y = badge_y_positions[-1] + badge_spacing if badge_y_positions else top_y
-            self.protondbLabel.move(protondb_x, protondb_y)
+            self.protondbLabel.move(badge_x, protondb_y)
             badge_y_positions.append(protondb_y + self.protondbLabel.height())
-        if anticheat_visible:
-            anticheat_x = card_width - badge_width - right_margin
+        if self._anticheat_visible:
             anticheat_y = badge_y_positions[-1] + badge_spacing if badge_y_positions else top_y
-            self.anticheatLabel.move(anticheat_x, anticheat_y)
-
-        self.anticheatLabel.raise_()
-        self.protondbLabel.raise_()
-        self.steamLabel.raise_()
-        self.protondbLabel.clicked.connect(self.open_protondb_report)
-        self.steamLabel.clicked.connect(self.open_steam_page)
-        self.anticheatLabel.clicked.connect(self.open_weanticheatyet_page)
+            self.anticheatLabel.move(badge_x, anticheat_y)
 
-        layout.addWidget(coverWidget)
-
-        # Название игры
-        nameLabel = QLabel(name)
-        nameLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        nameLabel.setStyleSheet(self.theme.GAME_CARD_NAME_LABEL_STYLE)
-        layout.addWidget(nameLabel)
+    def set_protondb_tier(self, tier):
+        """Обновляет рейтинг ProtonDB на уже созданной карточке без её пересоздания."""
+        if tier == self.protondb_tier:
+            return
+        self.protondb_tier = tier
+        self._apply_protondb_badge(tier)
+        self._layout_badges()
 
     def _show_context_menu(self, pos):
         """Delegate context menu display to ContextMenuManager."""
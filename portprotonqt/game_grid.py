@@ -0,0 +1,368 @@
+import numpy as np
+from PySide6.QtCore import QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QPainter, QPixmap
+from PySide6.QtWidgets import (QApplication, QGraphicsBlurEffect, QGraphicsScene, QScrollArea, QSizePolicy,
+                               QStyle, QStyleOption, QWidget)
+import portprotonqt.themes.standart.styles as default_styles
+from portprotonqt.config_utils import read_favorites
+from portprotonqt.custom_widgets import FlowGeometry
+from portprotonqt.downloader import PRIORITY_HIGH, PRIORITY_NORMAL
+from portprotonqt.game_card import GameCard
+
+# Сколько рядов карточек создаётся выше и ниже видимой области, чтобы при прокрутке
+# карточки появлялись уже с обложками
+OVERSCAN_ROWS = 2
+# Радиус скругления фона карточки (GAME_CARD_WINDOW_STYLE), по которому строится тень
+CARD_RADIUS = 20
+
+_shadow_cache: dict[tuple, QPixmap] = {}
+
+
+def _shadow_extent(blur_radius: int) -> int:
+    # Насколько размытие выходит за края, как у фильтров размытия Qt
+    return int(blur_radius * 1.5) + 1
+
+
+def _render_shadow_patch(color: QColor, blur_radius: int, radius: int) -> QPixmap:
+    """
+    Рисует размытую тень скруглённого прямоугольника минимального размера, из которой
+    собирается тень любого размера (nine-patch): углы переносятся как есть, а края
+    и середина растягиваются. Размытие то же, что у QGraphicsDropShadowEffect.
+    """
+    extent = _shadow_extent(blur_radius)
+    # Прямоугольник достаточно велик, чтобы размытие соседних углов не пересекалось
+    inner = 2 * (radius + extent) + 1
+    size = inner + 2 * extent
+    source = QPixmap(inner, inner)
+    source.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(source)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(color)
+    painter.drawRoundedRect(QRectF(0, 0, inner, inner), radius, radius)
+    painter.end()
+
+    scene = QGraphicsScene()
+    item = scene.addPixmap(source)
+    blur = QGraphicsBlurEffect()
+    blur.setBlurRadius(blur_radius)
+    item.setGraphicsEffect(blur)
+    patch = QPixmap(size, size)
+    patch.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(patch)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(-extent, -extent, size, size))
+    painter.end()
+    return patch
+
+
+def card_shadow_pixmap(width: int, height: int, theme=None) -> QPixmap:
+    """
+    Возвращает тень карточки размером width x height с отступом _shadow_extent
+    с каждой стороны. Изображение собирается из nine-patch один раз для каждого
+    сочетания размера карточки и параметров тени темы.
+    """
+    theme = theme if theme is not None else default_styles
+    color = tuple(theme.gameCardShadowColor)
+    blur_radius = int(theme.gameCardShadowBlurRadius)
+    key = (width, height, color, blur_radius)
+    pixmap = _shadow_cache.get(key)
+    if pixmap is not None:
+        return pixmap
+
+    patch_key = (color, blur_radius)
+    patch = _shadow_cache.get(patch_key)
+    if patch is None:
+        patch = _render_shadow_patch(QColor(*color), blur_radius, CARD_RADIUS)
+        _shadow_cache[patch_key] = patch
+    extent = _shadow_extent(blur_radius)
+    corner = 2 * extent + CARD_RADIUS
+    full_width, full_height = width + 2 * extent, height + 2 * extent
+    pixmap = QPixmap(full_width, full_height)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+    # Столбцы и строки nine-patch: (начало в патче, размер в патче, начало в тени, размер в тени)
+    patch_size = patch.width()
+    mid_width, mid_height = full_width - 2 * corner, full_height - 2 * corner
+    columns = ((0, corner, 0, corner), (corner, patch_size - 2 * corner, corner, mid_width),
+               (patch_size - corner, corner, full_width - corner, corner))
+    rows = ((0, corner, 0, corner), (corner, patch_size - 2 * corner, corner, mid_height),
+            (patch_size - corner, corner, full_height - corner, corner))
+    for sx, sw, tx, tw in columns:
+        for sy, sh, ty, th in rows:
+            if tw > 0 and th > 0:
+                painter.drawPixmap(QRect(tx, ty, tw, th), patch, QRect(sx, sy, sw, sh))
+    painter.end()
+    _shadow_cache[key] = pixmap
+    return pixmap
+
+
+
+class GameGrid(QWidget):
+    """
+    Виртуализированная сетка карточек игр для QScrollArea.
+
+    Расположение карточек вычисляется по списку игр так же, как в FlowLayout, но
+    виджеты GameCard создаются только для видимых рядов и OVERSCAN_ROWS рядов
+    сверху и снизу. Карточки, ушедшие из видимой области при прокрутке, не удаляются,
+    а перепривязываются к играм, которые в неё попали. Карточка с фокусом ввода
+    остаётся на месте, пока её игра есть в списке.
+    """
+
+    def __init__(self, select_callback, context_menu_manager, theme, card_width=250, parent=None):
+        super().__init__(parent)
+        self.select_callback = select_callback
+        self.context_menu_manager = context_menu_manager
+        self.theme = theme
+        self.card_width = card_width
+        self._spacing = 3  # отступ между карточками, как в FlowLayout
+        self._max_scale = 1.2  # максимальное увеличение шага карточек в ряду
+
+        self._games: list[tuple] = []
+        self._index: dict[str, int] = {}  # название игры -> позиция в сетке
+        self._cards: dict[str, GameCard] = {}  # карточки видимых игр
+        self._card_data: dict[str, tuple] = {}  # данные, к которым привязана карточка
+        self._free_cards: list[GameCard] = []
+        self._geometry = np.zeros((0, 4), dtype=np.int32)
+        self._geometry_key = None
+        self._flow_geometry = FlowGeometry()
+        self._total_height = 0
+
+        policy = QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+
+    def _card_size(self) -> tuple[int, int]:
+        # Размер GameCard вместе с полями под анимацию обводки
+        return self.card_width + 20, int(self.card_width * 1.6) + 20
+
+    def _compute_geometry(self, width: int):
+        """Пересчитывает [x, y, ширина, высота] всех позиций, если изменились число игр, ширина или размер карточек."""
+        key = (len(self._games), width, self._spacing, self.card_width)
+        if key == self._geometry_key:
+            return
+        self._geometry_key = key
+        if not self._games:
+            self._geometry = np.zeros((0, 4), dtype=np.int32)
+            self._total_height = 0
+            return
+        nat_sizes = np.empty((len(self._games), 2), dtype=np.int32)
+        nat_sizes[:] = self._card_size()
+        # При добавлении игр в конец списка пересчитываются только последние ряды
+        self._geometry, self._total_height = self._flow_geometry.compute(nat_sizes, width, self._spacing,
+                                                                         self._max_scale)
+
+    def hasHeightForWidth(self) -> bool:
+        return True
+
+    def heightForWidth(self, width: int) -> int:
+        self._compute_geometry(width)
+        return self._total_height
+
+    def sizeHint(self) -> QSize:
+        return QSize(self._card_size()[0], self.heightForWidth(self.width()))
+
+    def minimumSizeHint(self) -> QSize:
+        return QSize(self._card_size()[0], 0)
+
+    def set_games(self, games: list[tuple]):
+        """Задаёт список игр в порядке отображения и обновляет видимые карточки."""
+        if games == self._games:
+            return
+        count_changed = len(games) != len(self._games)
+        self._games = list(games)
+        self._index = {game[0]: i for i, game in enumerate(self._games)}
+        if count_changed:
+            self._geometry_key = None
+            self.updateGeometry()
+        self.refresh()
+
+    def set_card_width(self, card_width: int):
+        """Меняет размер карточек; карточки старого размера удаляются и создаются заново."""
+        if card_width == self.card_width:
+            return
+        self.card_width = card_width
+        for card in [*self._cards.values(), *self._free_cards]:
+            card.release_cover()
+            card.hide()
+            card.deleteLater()
+        self._cards.clear()
+        self._card_data.clear()
+        self._free_cards.clear()
+        self._geometry_key = None
+        self.updateGeometry()
+        self.refresh()
+
+    def set_protondb_tier(self, appid: str, tier: str):
+        """Обновляет рейтинг ProtonDB игры в списке и на её карточке, если она создана."""
+        for i, game in enumerate(self._games):
+            if str(game[3]) == appid and game[12] != "epic":
+                game = game[:8] + (tier,) + game[9:]
+                self._games[i] = game
+                card = self._cards.get(game[0])
+                if card is not None:
+                    card.set_protondb_tier(tier)
+                    self._card_data[game[0]] = game
+
+    def card_index(self, card) -> int:
+        """Возвращает позицию карточки в сетке или -1, если она не относится к сетке."""
+        if not isinstance(card, GameCard) or self._cards.get(card.name) is not card:
+            return -1
+        return self._index[card.name]
+
+    def focus_card(self, index: int) -> GameCard | None:
+        """
+        Прокручивает сетку к игре с позицией index, передаёт фокус её карточке и
+        возвращает карточку. Если такой позиции нет, возвращает None.
+        """
+        if not 0 <= index < len(self._games):
+            return None
+        self._compute_geometry(self.width())
+        x, y, w, h = (int(v) for v in self._geometry[index])
+        scroll_area = self._scroll_area()
+        if scroll_area is not None:
+            scroll_area.ensureVisible(x + w // 2, y + h // 2, w // 2 + 50, h // 2 + 50)
+        self.refresh(extra_index=index)
+        card = self._cards[self._games[index][0]]
+        card.setFocus()
+        return card
+
+    def focusNextPrevChild(self, next: bool) -> bool:
+        # Порядок фокуса между карточками задаётся позицией в сетке, а не порядком
+        # создания виджетов, которые переиспользуются при прокрутке
+        index = self.card_index(QApplication.focusWidget())
+        if index >= 0 and self.focus_card(index + 1 if next else index - 1):
+            return True
+        return super().focusNextPrevChild(next)
+
+    def _scroll_area(self) -> QScrollArea | None:
+        parent = self.parentWidget()
+        while parent is not None and not isinstance(parent, QScrollArea):
+            parent = parent.parentWidget()
+        return parent
+
+    def _visible_range(self, overscan_rows: int = OVERSCAN_ROWS) -> tuple[int, int]:
+        """Возвращает [first, last) позиций, попадающих в видимую область вместе с overscan_rows рядов запаса."""
+        if not self._games:
+            return 0, 0
+        viewport = self.parentWidget()
+        if viewport is not None:
+            top = -self.y()
+            bottom = top + viewport.height()
+        else:
+            top, bottom = 0, self.height()
+        overscan = overscan_rows * (self._card_size()[1] + self._spacing)
+        tops = self._geometry[:, 1]
+        bottoms = tops + self._geometry[:, 3]
+        first = int(np.searchsorted(bottoms, top - overscan, side="right"))
+        last = int(np.searchsorted(tops, bottom + overscan, side="left"))
+        return first, last
+
+    def _create_card(self, game: tuple, cover_priority: int) -> GameCard:
+        card = GameCard(
+            *game,
+            select_callback=self.select_callback,
+            theme=self.theme,
+            card_width=self.card_width,
+            parent=self,
+            context_menu_manager=self.context_menu_manager,
+            cover_priority=cover_priority
+        )
+        # Connect context menu signals
+        manager = self.context_menu_manager
+        card.editShortcutRequested.connect(manager.edit_game_shortcut)
+        card.deleteGameRequested.connect(manager.delete_game)
+        card.addToMenuRequested.connect(manager.add_to_menu)
+        card.removeFromMenuRequested.connect(manager.remove_from_menu)
+        card.addToDesktopRequested.connect(manager.add_to_desktop)
+        card.removeFromDesktopRequested.connect(manager.remove_from_desktop)
+        card.addToSteamRequested.connect(manager.add_to_steam)
+        card.removeFromSteamRequested.connect(manager.remove_from_steam)
+        card.openGameFolderRequested.connect(manager.open_game_folder)
+        return card
+
+    def refresh(self, extra_index: int | None = None):
+        """Создаёт, перепривязывает и расставляет карточки для видимых игр."""
+        self._compute_geometry(self.width())
+        first, last = self._visible_range()
+        indexes = list(range(first, last))
+        if extra_index is not None and not first <= extra_index < last:
+            indexes.append(extra_index)
+        # Карточка с фокусом не перепривязывается, даже если ушла из видимой области
+        focused = QApplication.focusWidget()
+        if isinstance(focused, GameCard) and self._cards.get(focused.name) is focused:
+            focused_index = self._index.get(focused.name)
+            if focused_index is not None and not first <= focused_index < last and focused_index != extra_index:
+                indexes.append(focused_index)
+
+        wanted = {self._games[i][0] for i in indexes}
+        for name in [name for name in self._cards if name not in wanted]:
+            card = self._cards.pop(name)
+            self._card_data.pop(name, None)
+            card.release_cover()
+            card.hide()
+            self._update_shadow(card.geometry())
+            self._free_cards.append(card)
+
+        # Обложки видимых карточек загружаются раньше обложек рядов запаса
+        visible_first, visible_last = self._visible_range(overscan_rows=0)
+        favorites = None
+        for i in indexes:
+            game = self._games[i]
+            name = game[0]
+            card = self._cards.get(name)
+            priority = PRIORITY_HIGH if visible_first <= i < visible_last or i == extra_index else PRIORITY_NORMAL
+            if card is None and not self._free_cards:
+                card = self._create_card(game, priority)
+            elif card is None or self._card_data.get(name) != game:
+                if card is None:
+                    card = self._free_cards.pop()
+                if favorites is None:
+                    favorites = read_favorites()
+                card.set_game_data(*game, favorites=favorites, cover_priority=priority)
+            card.raise_cover_priority(priority)
+            self._cards[name] = card
+            self._card_data[name] = game
+            x, y = int(self._geometry[i, 0]), int(self._geometry[i, 1])
+            if card.isHidden() or card.x() != x or card.y() != y:
+                # Тень рисуется сеткой и выходит за границы карточки
+                self._update_shadow(card.geometry())
+                card.move(x, y)
+                card.show()
+                self._update_shadow(card.geometry())
+
+    def _update_shadow(self, rect: QRect):
+        """Перерисовывает область карточки вместе с её тенью."""
+        extent = _shadow_extent(int((self.theme or default_styles).gameCardShadowBlurRadius))
+        self.update(rect.adjusted(-extent, -extent, extent, extent))
+
+    def paintEvent(self, event):
+        # Фон из таблицы стилей и тени карточек под ними
+        option = QStyleOption()
+        option.initFrom(self)
+        painter = QPainter(self)
+        self.style().drawPrimitive(QStyle.PrimitiveElement.PE_Widget, option, painter, self)
+        if not self._cards:
+            return
+        width, height = self._card_size()
+        shadow = card_shadow_pixmap(width, height, self.theme)
+        extent = (shadow.width() - width) // 2
+        for card in self._cards.values():
+            if card.isHidden():
+                continue
+            target = card.geometry().adjusted(-extent, -extent, extent, extent)
+            if target.intersects(event.rect()):
+                painter.drawPixmap(target.topLeft(), shadow)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def moveEvent(self, event):
+        # QScrollArea прокручивает содержимое, перемещая виджет
+        super().moveEvent(event)
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
@@ -1,13 +1,16 @@
+import hashlib
 import os
-from PySide6.QtGui import QPen, QColor, QPixmap, QPainter, QPainterPath
-from PySide6.QtCore import Qt, QFile, QEvent, QByteArray, QEasingCurve, QPropertyAnimation
+import time
+from PySide6.QtGui import QPen, QColor, QImage, QImageReader, QPixmap, QPainter, QPainterPath
+from PySide6.QtCore import Qt, QFile, QEvent, QByteArray, QEasingCurve, QPropertyAnimation, QObject, QThread, QCoreApplication, Signal, Slot
 from PySide6.QtWidgets import QGraphicsItem, QToolButton, QFrame, QLabel, QGraphicsScene, QHBoxLayout, QWidget, QGraphicsView, QVBoxLayout, QSizePolicy
 from PySide6.QtWidgets import QSpacerItem, QGraphicsPixmapItem, QDialog, QApplication
 import portprotonqt.themes.standart.styles as default_styles
-from portprotonqt.config_utils import read_theme_from_config
+from portprotonqt.config_utils import read_theme_from_config, read_image_cache_size
 from portprotonqt.theme_manager import ThemeManager
-from portprotonqt.downloader import Downloader
+from portprotonqt.downloader import Downloader, DownloadRequest, PRIORITY_NORMAL
 from portprotonqt.logger import get_logger
+from collections import OrderedDict
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
@@ -21,114 +24,351 @@ image_load_queue = Queue()
 image_executor = ThreadPoolExecutor(max_workers=4)
 queue_lock = threading.Lock()
 
-def load_pixmap_async(cover: str, width: int, height: int, callback: Callable[[QPixmap], None], app_name: str = ""):
+def _pixmap_cost(pixmap: QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+class ImageCache:
+    """
+    LRU-кэш готовых обложек (QPixmap) в памяти с ограничением по объёму в байтах.
+    Вместе с обложкой хранится сигнатура (mtime, размер) файла, из которого она получена.
+    При превышении бюджета вытесняются давно не использованные обложки.
+    Используется только в GUI потоке.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[tuple, tuple[QPixmap, tuple[int, int] | None]] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: tuple) -> tuple[QPixmap, tuple[int, int] | None] | None:
+        """Возвращает (обложка, сигнатура файла) или None."""
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def put(self, key: tuple, pixmap: QPixmap, signature: tuple[int, int] | None = None):
+        cost = _pixmap_cost(pixmap)
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._size -= _pixmap_cost(old[0])
+        if cost > self.max_bytes:
+            return
+        self._items[key] = (pixmap, signature)
+        self._size += cost
+        self._evict()
+
+    def signatures(self) -> list[tuple[tuple, tuple[int, int] | None]]:
+        """Возвращает (ключ, сигнатура файла) для всех обложек в кэше."""
+        return [(key, signature) for key, (_pixmap, signature) in self._items.items()]
+
+    def discard_stale(self, entries: list[tuple[tuple, tuple[int, int] | None]]):
+        """Удаляет обложки, сигнатура которых всё ещё совпадает с устаревшей."""
+        for key, signature in entries:
+            item = self._items.get(key)
+            if item is not None and item[1] == signature:
+                del self._items[key]
+                self._size -= _pixmap_cost(item[0])
+
+    def set_max_bytes(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self._items.clear()
+        self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._items:
+            _key, (pixmap, _signature) = self._items.popitem(last=False)
+            self._size -= _pixmap_cost(pixmap)
+
+class ImageLoadBridge(QObject):
+    """
+    Передаёт изображения, декодированные в потоках image_executor, в GUI поток.
+    Там QImage один раз преобразуется в QPixmap, который кэшируется и передаётся в callback.
+    """
+    image_ready = Signal(object, object, object, object)  # callback, QImage, ключ кэша или None, сигнатура файла
+    cache_stale = Signal(object)  # [(ключ кэша, устаревшая сигнатура)]
+
+    def __init__(self):
+        super().__init__()
+        self.image_ready.connect(self._deliver)
+        self.cache_stale.connect(self._discard_stale)
+
+    @Slot(object, object, object, object)
+    def _deliver(self, callback, image, memory_key, signature):
+        pixmap = QPixmap.fromImage(image)
+        if memory_key is not None:
+            image_cache.put(memory_key, pixmap, signature)
+        callback(pixmap)
+
+    @Slot(object)
+    def _discard_stale(self, entries):
+        image_cache.discard_stale(entries)
+
+image_load_bridge = ImageLoadBridge()
+
+image_cache = ImageCache(read_image_cache_size() * 1024 * 1024)
+
+# Миниатюры, к которым не обращались дольше этого срока, удаляются
+THUMBNAIL_MAX_AGE = 30 * 24 * 60 * 60
+_thumbnails_pruned = False
+
+def get_image_cache_dir():
+    """Возвращает папку с загруженными обложками."""
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(xdg_cache_home, "PortProtonQT", "images")
+
+def get_thumbnail_dir():
+    """Возвращает папку с готовыми к отрисовке миниатюрами обложек."""
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(xdg_cache_home, "PortProtonQT", "thumbnails")
+
+def _thumbnail_path(source: str, width: int, height: int, radius: int) -> str | None:
+    """
+    Путь к миниатюре для (источник, mtime, размер файла, ширина, высота, радиус).
+    Изменение исходного файла даёт новый ключ, поэтому устаревшие миниатюры не используются.
+    """
+    try:
+        st = os.stat(source)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(source)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}|{radius}"
+    return os.path.join(get_thumbnail_dir(), f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png")
+
+def prune_thumbnail_cache():
+    """Удаляет миниатюры, к которым не обращались дольше THUMBNAIL_MAX_AGE."""
+    thumbnail_dir = get_thumbnail_dir()
+    if not os.path.isdir(thumbnail_dir):
+        return
+    deadline = time.time() - THUMBNAIL_MAX_AGE
+    for entry in os.scandir(thumbnail_dir):
+        try:
+            if entry.is_file() and entry.stat().st_atime < deadline:
+                os.remove(entry.path)
+        except OSError as e:
+            logger.debug("Failed to remove thumbnail %s: %s", entry.path, e)
+
+def _round_image(image: QImage, radius: int) -> QImage:
+    rounded = QImage(image.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    rounded.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(rounded)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    path = QPainterPath()
+    path.addRoundedRect(0, 0, image.width(), image.height(), radius, radius)
+    painter.setClipPath(path)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return rounded
+
+def decode_scaled(source: str, width: int, height: int) -> QImage:
+    """
+    Декодирует изображение сразу в размере, покрывающем width x height с сохранением пропорций.
+    Для JPEG масштабирование выполняется при декодировании (DCT), поэтому время и пиковая
+    память зависят от размера карточки, а не исходной обложки. Изображения меньше нужного
+    размера декодируются как есть.
+    """
+    reader = QImageReader(source)
+    source_size = reader.size()
+    if source_size.isValid() and source_size.width() > width and source_size.height() > height:
+        reader.setScaledSize(source_size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding))
+    image = reader.read()
+    if image.isNull():
+        logger.debug("Failed to decode %s: %s", source, reader.errorString())
+    return image
+
+def render_cover(source: str, width: int, height: int, radius: int = 0) -> QImage:
+    """Загружает изображение, масштабирует его с заполнением и обрезкой до width x height и скругляет углы."""
+    image = decode_scaled(source, width, height)
+    if image.isNull():
+        return image
+    scaled = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+    x = (scaled.width() - width) // 2
+    y = (scaled.height() - height) // 2
+    cropped = scaled.copy(x, y, width, height)
+    return _round_image(cropped, radius) if radius else cropped
+
+def load_thumbnail(source: str, width: int, height: int, radius: int = 0) -> QImage:
+    """
+    Возвращает обложку, подготовленную render_cover, из дискового кэша миниатюр,
+    при отсутствии создаёт и сохраняет её. Повторная отрисовка карточки сводится
+    к декодированию небольшого PNG вместо полноразмерной обложки.
+    """
+    thumbnail_path = _thumbnail_path(source, width, height, radius)
+    if thumbnail_path and os.path.exists(thumbnail_path):
+        image = QImage(thumbnail_path)
+        if not image.isNull():
+            return image
+    image = render_cover(source, width, height, radius)
+    if thumbnail_path and not image.isNull():
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        # Формат определяется по расширению временного файла
+        tmp_path = f"{thumbnail_path[:-len('.png')]}.{threading.get_ident()}.tmp.png"
+        if image.save(tmp_path):
+            os.replace(tmp_path, thumbnail_path)
+        else:
+            logger.warning("Failed to save thumbnail %s", thumbnail_path)
+    return image
+
+def _no_image(width: int, height: int, radius: int) -> QImage:
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor("#333333"))
+    painter = QPainter(image)
+    painter.setPen(QPen(QColor("white")))
+    painter.drawText(image.rect(), Qt.AlignmentFlag.AlignCenter, "No Image")
+    painter.end()
+    return _round_image(image, radius) if radius else image
+
+def _local_cover_path(cover: str, app_name: str) -> str | None:
+    """Для URL обложки возвращает путь, по которому она сохраняется в кэше, иначе None."""
+    image_folder = get_image_cache_dir()
+    if cover.startswith("https://steamcdn-a.akamaihd.net/steam/apps/"):
+        parts = cover.split("/")
+        idx = parts.index("apps")
+        if idx + 1 < len(parts) and parts[idx + 1]:
+            return os.path.join(image_folder, f"{parts[idx + 1]}.jpg")
+    if cover.startswith(("http://", "https://")):
+        return os.path.join(image_folder, f"{app_name}.jpg")
+    return None
+
+def _file_signature(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def revalidate_image_cache():
+    """
+    Проверяет в потоке image_executor файлы обложек из image_cache и удаляет из кэша
+    обложки, файлы которых изменились или исчезли. Вызывается из GUI потока при
+    перезагрузке библиотеки, поэтому обращения к кэшу при прокрутке не затрагивают диск.
+    """
+    entries = image_cache.signatures()
+    if not entries:
+        return
+
+    def check():
+        stale = [(key, signature) for key, signature in entries if _file_signature(key[0]) != signature]
+        if stale:
+            logger.debug("Evicting %d changed covers from memory cache", len(stale))
+            image_load_bridge.cache_stale.emit(stale)
+
+    image_executor.submit(check)
+
+class PixmapRequest:
+    """
+    Запрос обложки, возвращаемый load_pixmap_async. cancel() отзывает запрос, когда обложка
+    больше не нужна: callback не вызывается, а загрузка, которую не ждут другие запросы,
+    снимается с очереди. raise_priority() продвигает ещё не начатую загрузку в очереди.
+    """
+    def __init__(self, priority: int):
+        self.priority = priority
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._finished = False
+        self._download: DownloadRequest | None = None
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            download, self._download = self._download, None
+        if download is not None:
+            download.cancel()
+
+    def raise_priority(self, priority: int):
+        with self._lock:
+            self.priority = min(self.priority, priority)
+            download = self._download
+        if download is not None:
+            download.raise_priority(priority)
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def is_finished(self) -> bool:
+        """Обложка уже передана в callback."""
+        return self._finished
+
+    def _start_download(self, start: Callable[[int], DownloadRequest]) -> bool:
+        """Запускает загрузку с текущим приоритетом, если запрос не отозван."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._download = start(self.priority)
+            return True
+
+def load_pixmap_async(cover: str, width: int, height: int, callback: Callable[[QPixmap], None], app_name: str = "",
+                      radius: int = 0, priority: int = PRIORITY_NORMAL) -> PixmapRequest:
     """
     Асинхронно загружает обложку через очередь задач.
+    Обложка масштабируется и обрезается до width x height, при radius > 0 углы скругляются.
+    Декодирование и масштабирование выполняются в QImage в потоках image_executor,
+    callback всегда вызывается в GUI потоке. Если такая обложка уже есть в image_cache
+    и вызов сделан из GUI потока, callback вызывается сразу, без обращения к очереди.
+    Изменившиеся файлы обложек вытесняются из кэша revalidate_image_cache.
+    priority — приоритет загрузки обложки из сети (PRIORITY_HIGH для видимых обложек).
     """
-    def process_image():
-        theme_manager = ThemeManager()
-        current_theme_name = read_theme_from_config()
-
-        def finish_with(pixmap: QPixmap):
-            scaled = pixmap.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-            x = (scaled.width() - width) // 2
-            y = (scaled.height() - height) // 2
-            cropped = scaled.copy(x, y, width, height)
-            callback(cropped)
-            # Removed: pixmap = None (unnecessary, causes type error)
-
-        xdg_cache_home = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
-        image_folder = os.path.join(xdg_cache_home, "PortProtonQT", "images")
-        os.makedirs(image_folder, exist_ok=True)
-
-        if cover and cover.startswith("https://steamcdn-a.akamaihd.net/steam/apps/"):
-            try:
-                parts = cover.split("/")
-                appid = None
-                if "apps" in parts:
-                    idx = parts.index("apps")
-                    if idx + 1 < len(parts):
-                        appid = parts[idx + 1]
-                if appid:
-                    local_path = os.path.join(image_folder, f"{appid}.jpg")
-                    if os.path.exists(local_path):
-                        pixmap = QPixmap(local_path)
-                        finish_with(pixmap)
-                        return
-
-                    def on_downloaded(result: str | None):
-                        pixmap = QPixmap()
-                        if result and os.path.exists(result):
-                            pixmap.load(result)
-                        if pixmap.isNull():
-                            placeholder_path = theme_manager.get_theme_image("placeholder", current_theme_name)
-                            if placeholder_path and QFile.exists(placeholder_path):
-                                pixmap.load(placeholder_path)
-                            else:
-                                pixmap = QPixmap(width, height)
-                                pixmap.fill(QColor("#333333"))
-                                painter = QPainter(pixmap)
-                                painter.setPen(QPen(QColor("white")))
-                                painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "No Image")
-                                painter.end()
-                        finish_with(pixmap)
-
-                    downloader.download_async(cover, local_path, timeout=5, callback=on_downloaded)
-                    return
-            except Exception as e:
-                logger.error(f"Ошибка обработки URL {cover}: {e}")
-
-        if cover and cover.startswith(("http://", "https://")):
-            try:
-                local_path = os.path.join(image_folder, f"{app_name}.jpg")
-                if os.path.exists(local_path):
-                    pixmap = QPixmap(local_path)
-                    finish_with(pixmap)
-                    return
-
-                def on_downloaded(result: str | None):
-                    pixmap = QPixmap()
-                    if result and os.path.exists(result):
-                        pixmap.load(result)
-                    if pixmap.isNull():
-                        placeholder_path = theme_manager.get_theme_image("placeholder", current_theme_name)
-                        if placeholder_path and QFile.exists(placeholder_path):
-                            pixmap.load(placeholder_path)
-                        else:
-                            pixmap = QPixmap(width, height)
-                            pixmap.fill(QColor("#333333"))
-                            painter = QPainter(pixmap)
-                            painter.setPen(QPen(QColor("white")))
-                            painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "No Image")
-                            painter.end()
-                    finish_with(pixmap)
-
-                downloader.download_async(cover, local_path, timeout=5, callback=on_downloaded)
-                return
-            except Exception as e:
-                logger.error("Error processing EGS URL %s: %s", cover, str(e))
+    request = PixmapRequest(priority)
+    local_path = _local_cover_path(cover, app_name) if cover else None
+    # Ключ кэша в памяти — путь к файлу обложки без обращения к диску; сигнатура файла
+    # определяется в потоке загрузки и хранится вместе с обложкой для revalidate_image_cache
+    memory_key = (local_path or cover, width, height, radius)
+    app = QCoreApplication.instance()
+    if app is not None and QThread.currentThread() is app.thread():
+        cached = image_cache.get(memory_key)
+        if cached is not None:
+            request._finished = True
+            callback(cached[0])
+            return request
+
+    def deliver(pixmap: QPixmap):
+        if not request.is_cancelled():
+            request._finished = True
+            callback(pixmap)
 
-        if cover and QFile.exists(cover):
-            pixmap = QPixmap(cover)
-            finish_with(pixmap)
+    def process_image():
+        global _thumbnails_pruned
+        if request.is_cancelled():
             return
-
-        placeholder_path = theme_manager.get_theme_image("placeholder", current_theme_name)
-        pixmap = QPixmap()
-        if placeholder_path and QFile.exists(placeholder_path):
-            pixmap.load(placeholder_path)
+        if not _thumbnails_pruned:
+            _thumbnails_pruned = True
+            prune_thumbnail_cache()
+
+        def finish_with(source: str | None):
+            signature = _file_signature(source) if source else None
+            image = load_thumbnail(source, width, height, radius) if source else QImage()
+            cache_key = memory_key
+            if image.isNull():
+                # Заглушки не кэшируются, чтобы обложка появилась после успешной загрузки
+                cache_key = None
+                placeholder_path = ThemeManager().get_theme_image("placeholder", read_theme_from_config())
+                if placeholder_path and QFile.exists(placeholder_path):
+                    image = load_thumbnail(str(placeholder_path), width, height, radius)
+                if image.isNull():
+                    image = _no_image(width, height, radius)
+            image_load_bridge.image_ready.emit(deliver, image, cache_key, signature)
+
+        os.makedirs(get_image_cache_dir(), exist_ok=True)
+        if local_path is None:
+            finish_with(cover if cover and QFile.exists(cover) else None)
+        elif os.path.exists(local_path):
+            finish_with(local_path)
         else:
-            pixmap = QPixmap(width, height)
-            pixmap.fill(QColor("#333333"))
-            painter = QPainter(pixmap)
-            painter.setPen(QPen(QColor("white")))
-            painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "No Image")
-            painter.end()
-        finish_with(pixmap)
+            def on_downloaded(result: str | None):
+                finish_with(result if result and os.path.exists(result) else None)
+
+            request._start_download(lambda priority: downloader.download_async(
+                cover, local_path, timeout=5, callback=on_downloaded, priority=priority))
 
     with queue_lock:
         image_load_queue.put(process_image)
         image_executor.submit(lambda: image_load_queue.get()())
+    return request
 
 def round_corners(pixmap, radius):
     """
@@ -3,13 +3,14 @@ import threading
 from typing import Protocol, cast
 from evdev import InputDevice, ecodes, list_devices
 import pyudev
-from PySide6.QtWidgets import QWidget, QStackedWidget, QApplication, QScrollArea, QLineEdit
+from PySide6.QtWidgets import QWidget, QStackedWidget, QApplication, QLineEdit
 from PySide6.QtCore import Qt, QObject, QEvent, QPoint
 from PySide6.QtGui import QKeyEvent
 from portprotonqt.logger import get_logger
 from portprotonqt.image_utils import FullscreenDialog
 from portprotonqt.custom_widgets import NavLabel
 from portprotonqt.game_card import GameCard
+from portprotonqt.game_grid import GameGrid
 from portprotonqt.config_utils import read_fullscreen_config
 
 logger = get_logger(__name__)
@@ -27,7 +28,7 @@ class MainWindowProtocol(Protocol):
         ...
     stackedWidget: QStackedWidget
     tabButtons: dict[int, QWidget]
-    gamesListWidget: QWidget
+    gamesListWidget: GameGrid
     currentDetailPage: QWidget | None
     current_exec_line: str | None
 
@@ -142,47 +143,22 @@ class InputManager(QObject):
                 return True
 
         # 7) Навигация по карточкам в Library
+        # Сетка создаёт карточки только для видимых рядов, поэтому переход идёт по позиции
+        # в сетке: focus_card прокручивает к нужной игре и создаёт её карточку
         if self._parent.stackedWidget.currentIndex() == 0:
-            game_cards = self._parent.gamesListWidget.findChildren(GameCard)
-            scroll_area = self._parent.gamesListWidget.parentWidget()
-            while scroll_area and not isinstance(scroll_area, QScrollArea):
-                scroll_area = scroll_area.parentWidget()
-            if not scroll_area:
-                logger.warning("No QScrollArea found for gamesListWidget")
-
+            games_grid = self._parent.gamesListWidget
             if isinstance(focused, GameCard):
-                current_index = game_cards.index(focused) if focused in game_cards else -1
-                if key == Qt.Key.Key_Down:
-                    if current_index >= 0 and current_index + 1 < len(game_cards):
-                        next_card = game_cards[current_index + 1]
-                        next_card.setFocus()
-                        if scroll_area:
-                            scroll_area.ensureWidgetVisible(next_card, 50, 50)
+                current_index = games_grid.card_index(focused)
+                if key in (Qt.Key.Key_Down, Qt.Key.Key_Right):
+                    if current_index >= 0 and games_grid.focus_card(current_index + 1):
                         return True
-                elif key == Qt.Key.Key_Up:
+                elif key in (Qt.Key.Key_Up, Qt.Key.Key_Left):
                     if current_index > 0:
-                        prev_card = game_cards[current_index - 1]
-                        prev_card.setFocus()
-                        if scroll_area:
-                            scroll_area.ensureWidgetVisible(prev_card, 50, 50)
+                        games_grid.focus_card(current_index - 1)
                         return True
-                    elif current_index == 0:
+                    elif current_index == 0 and key == Qt.Key.Key_Up:
                         self._parent.tabButtons[0].setFocus()
                         return True
-                elif key == Qt.Key.Key_Left:
-                    if current_index > 0:
-                        prev_card = game_cards[current_index - 1]
-                        prev_card.setFocus()
-                        if scroll_area:
-                            scroll_area.ensureWidgetVisible(prev_card, 50, 50)
-                        return True
-                elif key == Qt.Key.Key_Right:
-                    if current_index >= 0 and current_index + 1 < len(game_cards):
-                        next_card = game_cards[current_index + 1]
-                        next_card.setFocus()
-                        if scroll_area:
-                            scroll_area.ensureWidgetVisible(next_card, 50, 50)
-                        return True
 
         # 8) Переключение вкладок ←/→
         idx = self._parent.stackedWidget.currentIndex()
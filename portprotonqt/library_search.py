@@ -0,0 +1,396 @@
+import bisect
+import re
+from collections.abc import Iterable
+
+# Вес совпадения в зависимости от поля игры
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "appid": 0.9,
+    "source": 0.6,
+    "protondb": 0.6,
+    "anticheat": 0.6,
+    "description": 0.3,
+}
+# Поля, слова которых совпадают по префиксу, внутри слова и с опечатками.
+# Слова остальных полей (appid, источник, рейтинги) совпадают только целиком,
+# иначе обычные слова вроде «team» или «port» находили бы все игры одного источника
+FUZZY_FIELDS = ("name", "description")
+# Качество совпадения слова запроса со словом из индекса
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+INFIX_MATCH = 0.6
+TYPO_MATCH = 0.45
+# Бонусы за совпадение всего запроса с названием игры
+NAME_EXACT_BONUS = 6.0
+NAME_PREFIX_BONUS = 4.0
+NAME_SUBSTRING_BONUS = 2.0
+# Слова запроса короче MIN_PREFIX_LENGTH символов совпадают только со словами целиком:
+# префиксу из одной-двух букв подходит почти весь словарь, а такие запросы
+# и так находятся по подстроке в названии
+MIN_PREFIX_LENGTH = 3
+# Опечатки допускаются в словах запроса не короче MIN_TYPO_LENGTH символов:
+# одна до LONG_WORD_LENGTH символов, две — в более длинных словах
+MIN_TYPO_LENGTH = 4
+LONG_WORD_LENGTH = 8
+
+_TOKEN_RE = re.compile(r"\w+")
+# Названия источников, по которым можно искать, для значения steam_game
+_SOURCE_NAMES = {"true": "steam", "epic": "epic egs"}
+
+
+def normalize(text) -> str:
+    return str(text).casefold()
+
+
+def tokenize(text) -> list[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _token_trigrams(token: str) -> set[str]:
+    # Метка начала слова, чтобы короткие слова и опечатки в начале слова тоже находились
+    return _trigrams(f"^{token}") or {f"^{token}"}
+
+
+def prefix_distance(query: str, token: str, limit: int) -> int:
+    """
+    Возвращает расстояние Левенштейна от query до ближайшего префикса token
+    (то есть опечатки в ещё не дописанном слове не учитываются как лишние символы)
+    или limit + 1, если оно больше limit.
+    """
+    previous = list(range(len(token) + 1))
+    for i, char in enumerate(query, 1):
+        current = [i]
+        best = i
+        for j, token_char in enumerate(token, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != token_char))
+            current.append(value)
+            if value < best:
+                best = value
+        if best > limit:
+            return limit + 1
+        previous = current
+    return min(min(previous), limit + 1)
+
+
+def _term_mode(term: str) -> tuple[bool, int]:
+    """Какие совпадения допускаются для слова запроса: по префиксу и внутри слова, число опечаток."""
+    if len(term) < MIN_TYPO_LENGTH:
+        typos = 0
+    else:
+        typos = 1 if len(term) < LONG_WORD_LENGTH else 2
+    return len(term) >= MIN_PREFIX_LENGTH, typos
+
+
+def _game_fields(game: tuple) -> dict[str, str]:
+    """Возвращает текст индексируемых полей кортежа игры."""
+    return {
+        "name": game[0],
+        "description": game[1] or "",
+        "appid": str(game[3] or ""),
+        "protondb": game[8] or "",
+        "anticheat": game[9] or "",
+        "source": _SOURCE_NAMES.get(str(game[12]).lower(), "portproton"),
+    }
+
+
+class LibrarySearchIndex:
+    """
+    Поисковый индекс библиотеки игр (кортежей из 13 полей, ключ — название).
+
+    Слова названия и описания хранятся в обратном индексе; для поиска по префиксу
+    используется отсортированный словарь, для поиска внутри слова и опечаток — триграммы
+    слов. Слова appid, источника и рейтингов ProtonDB/WeAntiCheatYet хранятся в отдельном
+    обратном индексе и находятся только целиком. Весь запрос
+    дополнительно ищется как подстрока названия (как в прежнем фильтре) через
+    триграммы названий. Индекс обновляется по изменившимся играм, а не строится заново.
+    Когда запрос дописывается, новые результаты ищутся среди результатов предыдущего.
+    """
+
+    def __init__(self):
+        self._games: dict[str, tuple] = {}
+        self._position: dict[str, int] = {}  # порядок игр в библиотеке для равных оценок
+        self._names: dict[str, str] = {}  # название -> нормализованное название
+        self._doc_tokens: dict[str, dict[str, float]] = {}  # название -> слово -> вес поля
+        self._postings: dict[str, dict[str, float]] = {}  # слово -> название -> вес поля
+        self._doc_exact_tokens: dict[str, dict[str, float]] = {}  # то же для полей вне FUZZY_FIELDS
+        self._exact_postings: dict[str, dict[str, float]] = {}
+        self._vocabulary: list[str] = []  # отсортированные слова
+        self._token_trigrams: dict[str, set[str]] = {}  # триграмма -> слова
+        self._name_trigrams: dict[str, set[str]] = {}  # триграмма -> названия игр
+        self._token_count = 0  # сумма числа слов по играм
+        self._order: list[str] | None = None  # названия в порядке библиотеки
+        self._last_search: tuple[str, list[str], set[str]] | None = None  # запрос, его слова и найденные игры
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def update(self, games: Iterable[tuple]):
+        """
+        Приводит индекс к списку games: удаляет пропавшие игры, добавляет новые
+        и переиндексирует только те, у которых изменились данные. Порядок games
+        используется при равной оценке.
+        """
+        games = list(games)
+        current = {game[0] for game in games}
+        for name in [name for name in self._games if name not in current]:
+            self._remove(name)
+        self._position = {}
+        self._order = None
+        for position, game in enumerate(games):
+            self.update_game(game)
+            self._position.setdefault(game[0], position)
+
+    def update_game(self, game: tuple):
+        """Добавляет игру или переиндексирует её, если данные изменились."""
+        name = game[0]
+        previous = self._games.get(name)
+        if previous == game:
+            return
+        if previous is not None:
+            self._remove(name)
+        self._add(game)
+        if name not in self._position:
+            self._position[name] = len(self._position)
+            self._order = None
+
+    def _add(self, game: tuple):
+        name = game[0]
+        self._games[name] = game
+        self._last_search = None
+        normalized = normalize(name)
+        self._names[name] = normalized
+        for trigram in _trigrams(normalized):
+            self._name_trigrams.setdefault(trigram, set()).add(name)
+
+        tokens: dict[str, float] = {}
+        exact_tokens: dict[str, float] = {}
+        for field, text in _game_fields(game).items():
+            weight = FIELD_WEIGHTS[field]
+            field_tokens = tokens if field in FUZZY_FIELDS else exact_tokens
+            for token in tokenize(text):
+                if weight > field_tokens.get(token, 0.0):
+                    field_tokens[token] = weight
+        self._doc_tokens[name] = tokens
+        self._doc_exact_tokens[name] = exact_tokens
+        for token, weight in exact_tokens.items():
+            self._exact_postings.setdefault(token, {})[name] = weight
+        self._token_count += len(tokens)
+        for token, weight in tokens.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+                for trigram in _token_trigrams(token):
+                    self._token_trigrams.setdefault(trigram, set()).add(token)
+            postings[name] = weight
+
+    def _remove(self, name: str):
+        self._games.pop(name, None)
+        if self._position.pop(name, None) is not None:
+            self._order = None
+        self._last_search = None
+        normalized = self._names.pop(name, "")
+        for trigram in _trigrams(normalized):
+            names = self._name_trigrams.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._name_trigrams[trigram]
+
+        for token in self._doc_exact_tokens.pop(name, {}):
+            postings = self._exact_postings.get(token)
+            if postings is not None:
+                postings.pop(name, None)
+                if not postings:
+                    del self._exact_postings[token]
+
+        tokens = self._doc_tokens.pop(name, {})
+        self._token_count -= len(tokens)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(name, None)
+            if postings:
+                continue
+            del self._postings[token]
+            index = bisect.bisect_left(self._vocabulary, token)
+            if index < len(self._vocabulary) and self._vocabulary[index] == token:
+                del self._vocabulary[index]
+            for trigram in _token_trigrams(token):
+                tokens = self._token_trigrams.get(trigram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._token_trigrams[trigram]
+
+    def _ordered_names(self) -> list[str]:
+        """Возвращает названия игр в порядке библиотеки."""
+        if self._order is None:
+            self._order = sorted(self._games, key=lambda name: self._position.get(name, 0))
+        return self._order
+
+    def _ordered(self, names: Iterable[str]) -> list[tuple]:
+        return [self._games[name] for name in sorted(names, key=lambda name: self._position.get(name, 0))]
+
+    def _name_matches(self, query: str, within: set[str] | None = None) -> Iterable[str]:
+        """Возвращает игры (из within, если задано), в названии которых есть query целиком."""
+        trigrams = _trigrams(query)
+        if within is not None and (not trigrams or len(within) < len(self._games) // 4):
+            return [name for name in within if query in self._names[name]]
+        if not trigrams:
+            return [name for name, normalized in self._names.items() if query in normalized]
+        sets = sorted((self._name_trigrams.get(trigram, set()) for trigram in trigrams), key=len)
+        candidates = set.intersection(*sets) if sets[0] else set()
+        return [name for name in candidates if query in self._names[name]]
+
+    def _token_matches(self, term: str) -> dict[str, float]:
+        """Возвращает слова индекса, подходящие к слову запроса, с качеством совпадения."""
+        matches: dict[str, float] = {}
+        if term in self._postings:
+            matches[term] = EXACT_MATCH
+        with_prefix, limit = _term_mode(term)
+        if not with_prefix:
+            return matches
+        start = bisect.bisect_left(self._vocabulary, term)
+        for index in range(start, len(self._vocabulary)):
+            token = self._vocabulary[index]
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, PREFIX_MATCH)
+
+        trigrams = _trigrams(term)
+        if trigrams:
+            sets = sorted((self._token_trigrams.get(trigram, set()) for trigram in trigrams), key=len)
+            if sets[0]:
+                for token in set.intersection(*sets):
+                    if term in token:
+                        matches.setdefault(token, INFIX_MATCH)
+
+        if limit:
+            term_trigrams = _token_trigrams(term)
+            # Каждая опечатка портит не больше трёх триграмм
+            needed = max(1, len(term_trigrams) - 3 * limit)
+            counts: dict[str, int] = {}
+            for trigram in term_trigrams:
+                for token in self._token_trigrams.get(trigram, ()):
+                    counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                if count < needed or token in matches:
+                    continue
+                distance = prefix_distance(term, token, limit)
+                if distance <= limit:
+                    matches[token] = TYPO_MATCH * (1 - distance / (len(term) + 1))
+        return matches
+
+    def _term_scores(self, matches: dict[str, float], within: set[str] | dict[str, float] | None) -> dict[str, float]:
+        """
+        Возвращает лучшую оценку совпадения слова запроса для каждой игры (из within, если задано).
+        Если игр в within меньше, чем записей в обратном индексе подходящих слов,
+        перебираются слова этих игр, а не списки игр по словам.
+        """
+        term_scores: dict[str, float] = {}
+        if within is not None and self._games:
+            postings_size = sum(len(self._postings[token]) for token in matches)
+            if len(within) * self._token_count < postings_size * len(self._games):
+                for name in within:
+                    best = 0.0
+                    for token, weight in self._doc_tokens[name].items():
+                        quality = matches.get(token)
+                        if quality is not None and quality * weight > best:
+                            best = quality * weight
+                    if best:
+                        term_scores[name] = best
+                return term_scores
+        for token, quality in matches.items():
+            for name, weight in self._postings[token].items():
+                score = quality * weight
+                if score > term_scores.get(name, 0.0):
+                    term_scores[name] = score
+        if within is not None:
+            term_scores = {name: score for name, score in term_scores.items() if name in within}
+        return term_scores
+
+    def _refinable(self, query: str, terms: list[str]) -> set[str] | None:
+        """
+        Если query дописывает предыдущий запрос, возвращает найденные по нему игры:
+        результаты дописанного запроса — их подмножество. Если дописано последнее слово,
+        это верно, только пока слово ищется по префиксу, допустимое число опечаток
+        не изменилось, отбор слов с опечатками по триграммам не упирается в минимум
+        и слово не появилось среди слов, которые находятся только целиком.
+        """
+        if self._last_search is None:
+            return None
+        last_query, last_terms, found = self._last_search
+        if not last_terms or not query.startswith(last_query):
+            return None
+        previous, current = last_terms[-1], terms[len(last_terms) - 1]
+        if current != previous:
+            # Дописанное слово может целиком совпасть со словом источника или рейтинга,
+            # которому не подходил его префикс
+            if current in self._exact_postings:
+                return None
+            with_prefix, typos = _term_mode(previous)
+            if not with_prefix or _term_mode(current) != (with_prefix, typos):
+                return None
+            if typos and len(_token_trigrams(previous)) - 3 * typos < 1:
+                return None
+        return found
+
+    def search(self, text: str, limit: int | None = None) -> list[tuple]:
+        """
+        Возвращает игры, подходящие к запросу, от лучшего совпадения к худшему.
+        Игра подходит, если весь запрос есть в её названии или если каждое слово
+        запроса совпадает со словом одного из полей: в названии и описании точно,
+        по префиксу, внутри слова или с опечаткой, в остальных полях — только целиком.
+        Пустой запрос возвращает всю библиотеку.
+        """
+        query = normalize(text).strip()
+        if not query:
+            self._last_search = None
+            return self._ordered(self._games)
+
+        terms = tokenize(query)
+        candidates = self._refinable(query, terms)
+        scores: dict[str, float] = {}
+        first = True
+        for term in dict.fromkeys(terms):
+            within = candidates if first else scores
+            term_scores = self._term_scores(self._token_matches(term), within)
+            for name, weight in self._exact_postings.get(term, {}).items():
+                score = EXACT_MATCH * weight
+                if score > term_scores.get(name, 0.0) and (within is None or name in within):
+                    term_scores[name] = score
+            if first:
+                scores = term_scores
+                first = False
+            else:
+                scores = {name: score + term_scores[name] for name, score in scores.items() if name in term_scores}
+            if not scores:
+                break
+
+        for name in self._name_matches(query, candidates):
+            normalized = self._names[name]
+            if normalized == query:
+                bonus = NAME_EXACT_BONUS
+            elif normalized.startswith(query):
+                bonus = NAME_PREFIX_BONUS
+            else:
+                bonus = NAME_SUBSTRING_BONUS
+            scores[name] = scores.get(name, 0.0) + bonus
+        self._last_search = (query, terms, set(scores))
+
+        # Игры берутся в порядке библиотеки и устойчиво сортируются по оценке,
+        # поэтому при равной оценке сохраняется порядок библиотеки
+        if len(scores) * 8 < len(self._games):
+            ranked = sorted(scores, key=lambda name: (-scores[name], self._position.get(name, 0)))
+        else:
+            ranked = [name for name in self._ordered_names() if name in scores]
+            ranked.sort(key=scores.__getitem__, reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self._games[name] for name in ranked]
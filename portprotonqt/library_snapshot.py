@@ -0,0 +1,104 @@
+import os
+import time
+from datetime import datetime
+import orjson
+from collections.abc import Iterable
+from portprotonqt.localization import _
+from portprotonqt.logger import get_logger
+from portprotonqt.time_utils import format_last_launch, format_playtime, time_formatter
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SOURCES = ("portproton", "steam", "epic")
+# Как долго сохранённые метаданные игры (описание, обложка, appid) используются без повторного запроса
+REVALIDATE_INTERVAL = 7 * 24 * 60 * 60
+
+def get_snapshot_path():
+    """Возвращает путь к файлу снимка библиотеки."""
+    cache_home = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_home, "PortProtonQT", "library_snapshot.json")
+
+def file_signature(path) -> list[int] | None:
+    """Возвращает [mtime_ns, size] файла или None, если файл недоступен."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def is_entry_current(entry: dict | None, signature) -> bool:
+    """
+    Проверяет, что запись снимка сделана для источника с той же сигнатурой
+    (mtime и размер файла или другой ключ) и ещё не требует повторной проверки.
+    """
+    if not isinstance(entry, dict) or entry.get("sig") != signature:
+        return False
+    return time.time() - entry.get("checked_at", 0) < REVALIDATE_INTERVAL
+
+def empty_snapshot() -> dict[str, dict]:
+    return {source: {} for source in SNAPSHOT_SOURCES}
+
+def load_library_snapshot() -> dict[str, dict]:
+    """
+    Загружает снимок библиотеки: для каждого источника игр (portproton, steam, epic)
+    словарь записей, в которых хранится кортеж игры и данные для его проверки.
+    При отсутствии файла или несовместимой версии возвращает пустой снимок.
+    """
+    snapshot = empty_snapshot()
+    path = get_snapshot_path()
+    if not os.path.exists(path):
+        return snapshot
+    try:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Не удалось прочитать снимок библиотеки %s: %s", path, e)
+        return snapshot
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return snapshot
+    for source in SNAPSHOT_SOURCES:
+        entries = data.get(source)
+        if isinstance(entries, dict):
+            snapshot[source] = entries
+    return snapshot
+
+def save_library_snapshot(snapshot: dict[str, dict]):
+    """Атомарно сохраняет снимок библиотеки."""
+    path = get_snapshot_path()
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps({"version": SNAPSHOT_VERSION, **snapshot}))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error("Не удалось сохранить снимок библиотеки %s: %s", path, e)
+
+def refresh_time_fields(game: tuple | list, with_playtime: bool = True) -> tuple:
+    """
+    Пересчитывает отформатированные поля времени (последний запуск и время в игре)
+    из сохранённых метки времени и числа секунд, так как они зависят от текущего
+    времени и настроек отображения. С with_playtime=False обновляется только
+    время последнего запуска.
+    """
+    game = tuple(game)
+    last_launch_ts, playtime_seconds = game[10], game[11]
+    last_launch = format_last_launch(datetime.fromtimestamp(last_launch_ts)) if last_launch_ts else _("Never")
+    formatted_playtime = format_playtime(playtime_seconds) if with_playtime and playtime_seconds else game[7]
+    return game[:6] + (last_launch, formatted_playtime) + game[8:]
+
+def snapshot_games(snapshot: dict[str, dict], sources: Iterable[str]) -> list[tuple]:
+    """Возвращает игры из снимка для указанных источников с обновлёнными полями времени."""
+    games = []
+    for source in sources:
+        for entry in snapshot.get(source, {}).values():
+            game = entry.get("game")
+            if isinstance(game, list) and len(game) == 13:
+                games.append(tuple(game))
+    # Время в игре форматируется одним вызовом для всех игр, одинаковые значения — один раз
+    playtimes = time_formatter.format_many([game[11] for game in games])
+    return [
+        refresh_time_fields(game[:7] + (playtime if game[11] else game[7],) + game[8:], with_playtime=False)
+        for game, playtime in zip(games, playtimes, strict=True)
+    ]
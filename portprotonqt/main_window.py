@@ -4,29 +4,40 @@ import shutil
 import signal
 import subprocess
 import sys
+import threading
+import time
 
 import portprotonqt.themes.standart.styles as default_styles
 import psutil
 
 from portprotonqt.dialogs import AddGameDialog
 from portprotonqt.game_card import GameCard
-from portprotonqt.custom_widgets import FlowLayout, ClickableLabel, AutoSizeButton, NavLabel
+from portprotonqt.game_grid import GameGrid
+from portprotonqt.library_search import LibrarySearchIndex
+from portprotonqt.custom_widgets import ClickableLabel, AutoSizeButton, NavLabel
 from portprotonqt.input_manager import InputManager
 from portprotonqt.context_menu_manager import ContextMenuManager
 
-from portprotonqt.image_utils import load_pixmap_async, round_corners, ImageCarousel
-from portprotonqt.steam_api import get_steam_game_info_async, get_full_steam_game_info_async, get_steam_installed_games
+from portprotonqt.image_utils import load_pixmap_async, image_cache, revalidate_image_cache, ImageCarousel
+from portprotonqt.steam_api import (
+    get_steam_game_info_async, get_full_steam_game_info_async, get_steam_installed_games_async,
+    get_weanticheatyet_statuses_async, get_protondb_tier, protondb_notifier
+)
 from portprotonqt.egs_api import load_egs_games_async
+from portprotonqt.library_snapshot import (
+    SNAPSHOT_SOURCES, load_library_snapshot, save_library_snapshot, empty_snapshot, snapshot_games, file_signature, is_entry_current,
+    refresh_time_fields
+)
 from portprotonqt.theme_manager import ThemeManager, load_theme_screenshots, load_logo
-from portprotonqt.time_utils import save_last_launch, get_last_launch, parse_playtime_file, format_playtime, get_last_launch_timestamp, format_last_launch
+from portprotonqt.time_utils import save_last_launch, get_last_launch, get_exe_playtimes, format_playtime, get_last_launch_timestamp, format_last_launch, time_formatter
 from portprotonqt.config_utils import (
     get_portproton_location, read_theme_from_config, save_theme_to_config, parse_desktop_entry, load_theme_metainfo, read_time_config, read_card_size, save_card_size,
     read_sort_method, read_display_filter, read_favorites, save_favorites, save_time_config, save_sort_method, save_display_filter, save_proxy_config, read_proxy_config,
-    read_fullscreen_config, save_fullscreen_config, read_window_geometry, save_window_geometry, reset_config, clear_cache
+    read_fullscreen_config, save_fullscreen_config, read_window_geometry, save_window_geometry, reset_config, clear_cache, flush_config
 )
 from portprotonqt.localization import _
 from portprotonqt.logger import get_logger
-from portprotonqt.downloader import Downloader
+from portprotonqt.downloader import Downloader, get_download_engine, PRIORITY_HIGH
 
 from PySide6.QtWidgets import (QLineEdit, QMainWindow, QStatusBar, QWidget, QVBoxLayout, QLabel, QHBoxLayout, QStackedWidget, QComboBox, QScrollArea, QSlider,
                                QDialog, QFormLayout, QFrame, QGraphicsDropShadowEffect, QMessageBox, QGraphicsEffect, QGraphicsOpacityEffect, QApplication, QPushButton, QProgressBar, QCheckBox)
@@ -43,8 +54,11 @@ class MainWindow(QMainWindow):
     """Main window of PortProtonQT."""
     settings_saved = Signal()
     games_loaded = Signal(list)
-    update_progress = Signal(int)  # Signal to update progress bar
+    game_streamed = Signal(int, object)  # (поколение загрузки, кортеж игры)
+    update_progress = Signal(int, str, int, int)  # (поколение загрузки, источник, обработано, всего)
     update_status_message = Signal(str, int)  # Signal to update status message
+    # Поля кортежа игры, получаемые из сети: описание, обложка, поддержка геймпада, рейтинги ProtonDB и античита
+    _STREAMED_NETWORK_FIELDS = (1, 2, 5, 8, 9)
 
     def __init__(self):
         super().__init__()
@@ -52,14 +66,27 @@ class MainWindow(QMainWindow):
         self.current_exec_line = None
         self.currentDetailPage = None
         self.current_play_button = None
-        self.pending_games = []
-        self.game_card_cache = {}
-        self.pending_images = {}
-        self.total_games = 0
+        # Прогресс загрузки по источникам: источник -> (обработано, всего)
+        self._source_progress: dict[str, tuple[int, int]] = {}
         self.games_load_timer = QTimer(self)
         self.games_load_timer.setSingleShot(True)
         self.games_load_timer.timeout.connect(self.finalize_game_loading)
         self.games_loaded.connect(self.on_games_loaded)
+        # Игры из источников приходят по одной и добавляются в сетку пачками
+        self._load_generation = 0
+        self._stream_favorites: list[str] | None = None
+        self._streamed_games: dict[str, tuple] = {}
+        self.stream_flush_timer = QTimer(self)
+        self.stream_flush_timer.setSingleShot(True)
+        self.stream_flush_timer.setInterval(50)
+        self.stream_flush_timer.timeout.connect(self._flush_streamed_games)
+        self.game_streamed.connect(self.on_game_streamed)
+        # Относительное время последнего запуска ("5 мин. назад") обновляется без перезагрузки библиотеки
+        self.relative_time_timer = QTimer(self)
+        self.relative_time_timer.setInterval(60_000)
+        self.relative_time_timer.timeout.connect(self.refresh_relative_times)
+        self.relative_time_timer.start()
+        protondb_notifier.tier_updated.connect(self.on_protondb_tier_updated)
 
         read_time_config()
         # Set LEGENDARY_CONFIG_PATH to ~/.cache/PortProtonQT/legendary
@@ -91,6 +118,7 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(800, 600)
 
         self.games = []
+        self.search_index = LibrarySearchIndex()
         self.game_processes = []
         self.target_exe = None
         self.current_running_button = None
@@ -111,7 +139,7 @@ class MainWindow(QMainWindow):
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setVisible(False)
         self.statusBar().addPermanentWidget(self.progress_bar)
-        self.update_progress.connect(self.progress_bar.setValue)
+        self.update_progress.connect(self.on_progress_updated)
         self.update_status_message.connect(self.statusBar().showMessage)
 
         # Центральный виджет и основной layout
@@ -200,9 +228,89 @@ class MainWindow(QMainWindow):
                 self.resize(width, height)
             else:
                 self.showNormal()
+
+    @Slot(str, str)
+    def on_protondb_tier_updated(self, appid: str, tier: str):
+        """Обновляет рейтинг ProtonDB в списке игр и на карточках после фонового обновления."""
+        self.games = [
+            game[:8] + (tier,) + game[9:] if str(game[3]) == appid and game[12] != "epic" else game
+            for game in self.games
+        ]
+        for game in self.games:
+            if str(game[3]) == appid:
+                self.search_index.update_game(game)
+        self.gamesListWidget.set_protondb_tier(appid, tier)
+
     @Slot(list)
     def on_games_loaded(self, games: list[tuple]):
+        # Полный список источников заменяет игры, ещё ожидающие добавления
+        self.stream_flush_timer.stop()
+        self._streamed_games = {}
+        self.games = games
+        self._sort_games()
+
+        # Индекс поиска обновляется только по изменившимся играм; активный запрос применяется заново
+        self.search_index.update(self.games)
+        self.filterGamesDelayed()
+        self.progress_bar.setVisible(False)
+
+    @Slot(int, object)
+    def on_game_streamed(self, generation: int, game: tuple):
+        """
+        Принимает игру, как только источник узнал её локальные данные, или её обновление
+        после сетевых запросов (обложка, рейтинги). Игры одной загрузки копятся и
+        добавляются в сетку пачкой по таймеру.
+        """
+        if generation != self._load_generation:
+            return
+        if self._stream_favorites is not None and game[0] not in self._stream_favorites:
+            return
+        self._streamed_games[game[4]] = game
+        if not self.stream_flush_timer.isActive():
+            self.stream_flush_timer.start()
+
+    def _flush_streamed_games(self):
+        """Добавляет новые игры и заменяет обновлённые (по строке запуска) в списке библиотеки."""
+        if not self._streamed_games:
+            return
+        streamed, self._streamed_games = self._streamed_games, {}
+        games = []
+        for game in self.games:
+            update = streamed.pop(game[4], None)
+            if update is None:
+                games.append(game)
+                continue
+            # Заглушка без сетевых данных не стирает описание, обложку и рейтинги, уже показанные из снимка;
+            # окончательные значения приходят полным списком после загрузки источников
+            games.append(tuple(old if i in self._STREAMED_NETWORK_FIELDS and not new else new
+                               for i, (old, new) in enumerate(zip(game, update, strict=True))))
+        names = {game[0] for game in games}
+        for game in streamed.values():
+            # Как и в _combine_games, из одноимённых игр остаётся первая
+            if game[0] not in names:
+                names.add(game[0])
+                games.append(game)
+        self.games = games
+        self._sort_games()
+        self.search_index.update(self.games)
+        self.filterGamesDelayed()
+
+    def refresh_relative_times(self):
+        """
+        Пересчитывает время последнего запуска в списке игр. Строки запоминаются
+        по округлённой разнице, поэтому меняются только у недавно запущенных игр;
+        сетка перепривязывает лишь видимые карточки с изменившимися данными.
+        """
+        if time_formatter.detail_level != "detailed":
+            return
+        games = [refresh_time_fields(game, with_playtime=False) for game in self.games]
+        if games == self.games:
+            return
         self.games = games
+        self.search_index.update(self.games)
+        self.filterGamesDelayed()
+
+    def _sort_games(self):
         favorites = read_favorites()
         sort_method = read_sort_method()
 
@@ -226,92 +334,149 @@ class MainWindow(QMainWindow):
         else:
             self.games.sort(key=lambda g: (0 if g[0] in favorites else 1, -g[10], -g[11]))
 
-        self.updateGameGrid()
-        self.progress_bar.setVisible(False)
-
     def loadGames(self):
         display_filter = read_display_filter()
         favorites = read_favorites()
-        self.pending_games = []
+        self._source_progress = {}
         self.games = []
+        self._load_generation += 1
+        generation = self._load_generation
+        self._streamed_games = {}
+        self._stream_favorites = favorites if display_filter == "favorites" else None
+        sources = (display_filter,) if display_filter in SNAPSHOT_SOURCES else SNAPSHOT_SOURCES
+
+        # Обложки, файлы которых изменились с прошлой загрузки, вытесняются из кэша в памяти
+        revalidate_image_cache()
+        # Сразу показываем библиотеку из снимка прошлого запуска, затем перепроверяем источники
+        self.library_snapshot = load_library_snapshot()
+        self._revalidated_snapshot = empty_snapshot()
+        cached_games = snapshot_games(self.library_snapshot, sources)
+        if cached_games:
+            self.games_loaded.emit(self._combine_games(display_filter, favorites, cached_games))
+
+        # Источники загружаются одновременно; игры попадают в сетку по мере готовности,
+        # а полный список (в порядке portproton, steam, epic) собирается, когда закончат все
+        results: dict[str, list[tuple]] = {}
+        results_lock = threading.Lock()
+
+        def on_game(game: tuple):
+            self.game_streamed.emit(generation, game)
+
+        def on_source_loaded(source: str, games: list[tuple]):
+            with results_lock:
+                results[source] = games
+                done = len(results) == len(sources)
+            # Статусы античитов известны только после загрузки всего источника
+            for game in games:
+                on_game(game)
+            if done:
+                combined = [game for s in sources for game in results[s]]
+                self._finish_loading(generation, sources, self._combine_games(display_filter, favorites, combined))
+
+        loaders = {
+            "portproton": self._load_portproton_games_async,
+            "steam": self._load_steam_games_async,
+            "epic": self._load_egs_games_async,
+        }
+        self.progress_bar.setMaximum(0)
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
-        if display_filter == "steam":
-            self._load_steam_games_async(lambda games: self.games_loaded.emit(games))
-        elif display_filter == "portproton":
-            self._load_portproton_games_async(lambda games: self.games_loaded.emit(games))
-        elif display_filter == "epic":
-            load_egs_games_async(
-                self.legendary_path,
-                lambda games: self.games_loaded.emit(games),
-                self.downloader,
-                self.update_progress.emit,
-                self.update_status_message.emit
-            )
-        elif display_filter == "favorites":
-            def on_all_games(portproton_games, steam_games, epic_games):
-                games = [game for game in portproton_games + steam_games + epic_games if game[0] in favorites]
-                self.games_loaded.emit(games)
-            self._load_portproton_games_async(
-                lambda pg: self._load_steam_games_async(
-                    lambda sg: load_egs_games_async(
-                        self.legendary_path,
-                        lambda eg: on_all_games(pg, sg, eg),
-                        self.downloader,
-                        self.update_progress.emit,
-                        self.update_status_message.emit
-                    )
-                )
+        for source in sources:
+            loaders[source](
+                lambda games, s=source: on_source_loaded(s, games),
+                on_game,
+                lambda processed, total, s=source: self.update_progress.emit(generation, s, processed, total)
             )
-        else:
-            def on_all_games(portproton_games, steam_games, epic_games):
-                seen = set()
-                games = []
-                for game in portproton_games + steam_games + epic_games:
-                    name = game[0]
-                    if name not in seen:
-                        seen.add(name)
-                        games.append(game)
-                self.games_loaded.emit(games)
-            self._load_portproton_games_async(
-                lambda pg: self._load_steam_games_async(
-                    lambda sg: load_egs_games_async(
-                        self.legendary_path,
-                        lambda eg: on_all_games(pg, sg, eg),
-                        self.downloader,
-                        self.update_progress.emit,
-                        self.update_status_message.emit
-                    )
-                )
-            )
-        return []
+        return self.games
+
+    def _combine_games(self, display_filter: str, favorites: list[str], games: list[tuple]) -> list[tuple]:
+        """Отбирает избранное или убирает дубликаты по названию при отображении всех источников."""
+        if display_filter in SNAPSHOT_SOURCES:
+            return games
+        if display_filter == "favorites":
+            return [game for game in games if game[0] in favorites]
+        seen = set()
+        combined = []
+        for game in games:
+            name = game[0]
+            if name not in seen:
+                seen.add(name)
+                combined.append(game)
+        return combined
+
+    def _finish_loading(self, generation: int, sources: tuple[str, ...], games: list[tuple]):
+        """Сохраняет перепроверенные записи источников в снимок библиотеки и передаёт игры в сетку."""
+        if generation != self._load_generation:
+            logger.debug("Skipping results of a superseded library load")
+            return
+        for source in sources:
+            self.library_snapshot[source] = self._revalidated_snapshot[source]
+        save_library_snapshot(self.library_snapshot)
+        self.games_loaded.emit(games)
+
+    def _load_egs_games_async(self, callback: Callable[[list[tuple]], None],
+                              on_game: Callable[[tuple], None] | None = None,
+                              update_progress: Callable[[int, int], None] | None = None):
+        snapshot = self.library_snapshot["epic"]
+        revalidated = self._revalidated_snapshot["epic"]
+        metadata_dir = os.path.join(self.legendary_config_path, "metadata")
+        signatures = {}
+        known_games = {}
+        for app_name, entry in snapshot.items():
+            signature = file_signature(os.path.join(metadata_dir, f"{app_name}.json"))
+            if is_entry_current(entry, signature):
+                signatures[app_name] = signature
+                known_games[app_name] = tuple(entry["game"])
+
+        def on_games(games: list[tuple]):
+            now = time.time()
+            for game in games:
+                app_name = game[3]
+                if app_name in signatures:
+                    checked_at, signature = snapshot[app_name]["checked_at"], signatures[app_name]
+                else:
+                    checked_at, signature = now, file_signature(os.path.join(metadata_dir, f"{app_name}.json"))
+                revalidated[app_name] = {"sig": signature, "checked_at": checked_at, "game": game}
+            callback(games)
+
+        load_egs_games_async(
+            self.legendary_path,
+            on_games,
+            self.downloader,
+            update_progress or (lambda _processed, _total: None),
+            self.update_status_message.emit,
+            known_games,
+            on_game
+        )
 
-    def _load_steam_games_async(self, callback: Callable[[list[tuple]], None]):
-        steam_games = []
-        installed_games = get_steam_installed_games()
+    def _load_steam_games_async(self, callback: Callable[[list[tuple]], None],
+                                on_game: Callable[[tuple], None] | None = None,
+                                update_progress: Callable[[int, int], None] | None = None):
+        # Манифесты сканируются вне GUI потока, остальная загрузка продолжается по готовности списка
+        get_steam_installed_games_async(
+            lambda installed_games: self._on_steam_games_scanned(installed_games, callback, on_game, update_progress)
+        )
+
+    def _on_steam_games_scanned(self, installed_games: list[tuple[str, int, int, int]],
+                                callback: Callable[[list[tuple]], None],
+                                on_game: Callable[[tuple], None] | None = None,
+                                update_progress: Callable[[int, int], None] | None = None):
+        steam_games = []  # (игра, название для поиска античит-статуса, данные Steam, время проверки)
+        snapshot = self.library_snapshot["steam"]
+        revalidated = self._revalidated_snapshot["steam"]
         logger.info("Found %d installed Steam games: %s", len(installed_games), [g[0] for g in installed_games])
         if not installed_games:
-            callback(steam_games)
+            callback([])
             return
-        self.total_games = len(installed_games)
-        self.update_progress.emit(0)  # Initialize progress bar
+        update_progress = update_progress or (lambda _processed, _total: None)
+        update_progress(0, len(installed_games))
         self.update_status_message.emit(_("Loading Steam games..."), 3000)
         processed_count = 0
+        processed_lock = threading.Lock()
 
-        def on_game_info(info: dict, name, appid, last_played, playtime_seconds):
-            nonlocal processed_count
-            if not info:
-                logger.warning("No info retrieved for game %s (appid %s)", name, appid)
-                info = {
-                    'description': '',
-                    'cover': '',
-                    'controller_support': '',
-                    'protondb_tier': '',
-                    'name': name,
-                    'steam_game': 'true'
-                }
+        def build_game(info: dict, name, appid, last_played, playtime_seconds) -> tuple:
             last_launch = format_last_launch(datetime.fromtimestamp(last_played)) if last_played else _("Never")
-            steam_games.append((
+            return (
                 name,
                 info.get('description', ''),
                 info.get('cover', ''),
@@ -325,19 +490,62 @@ class MainWindow(QMainWindow):
                 last_played,
                 playtime_seconds,
                 "true"
-            ))
-            processed_count += 1
-            self.pending_games.append(None)
-            self.update_progress.emit(len(self.pending_games))  # Update progress bar
+            )
+
+        def on_anticheat_statuses(statuses: dict[str, str]):
+            games = []
+            for game, anticheat_name, info, checked_at in steam_games:
+                game = game[:9] + (statuses.get(anticheat_name, ""),) + game[10:]
+                if info:
+                    revalidated[str(game[3])] = {"sig": game[0], "checked_at": checked_at, "info": info, "game": game}
+                games.append(game)
+            callback(games)
+
+        def on_game_info(info: dict, name, appid, last_played, playtime_seconds, checked_at=None):
+            nonlocal processed_count
+            fetched_info = info
+            if not info:
+                logger.warning("No info retrieved for game %s (appid %s)", name, appid)
+                info = {
+                    'description': '',
+                    'cover': '',
+                    'controller_support': '',
+                    'protondb_tier': '',
+                    'name': name,
+                    'steam_game': 'true'
+                }
+            game = build_game(info, name, appid, last_played, playtime_seconds)
+            if on_game:
+                on_game(game)
+            with processed_lock:
+                steam_games.append((game, info.get('name') or name, fetched_info, checked_at or time.time()))
+                processed_count += 1
+                done = processed_count == len(installed_games)
+                update_progress(processed_count, len(installed_games))
             logger.info("Game %s processed, processed_count: %d/%d", name, processed_count, len(installed_games))
-            if processed_count == len(installed_games):
-                callback(steam_games)
+            if done:
+                get_weanticheatyet_statuses_async([n for _game, n, _info, _checked in steam_games], on_anticheat_statuses)
 
         for name, appid, last_played, playtime_seconds in installed_games:
+            entry = snapshot.get(str(appid)) or {}
+            if is_entry_current(entry, name) and entry.get("info"):
+                # Описание и обложка берутся из снимка, рейтинг ProtonDB — из хранилища метаданных
+                info = dict(entry["info"], protondb_tier=get_protondb_tier(appid))
+                on_game_info(info, name, appid, last_played, playtime_seconds, entry["checked_at"])
+                continue
+            if on_game:
+                # Пока данные из Steam Store не получены, карточка показывается без описания и обложки
+                on_game(build_game({'protondb_tier': get_protondb_tier(appid)}, name, appid, last_played, playtime_seconds))
             logger.debug("Requesting info for game %s (appid %s)", name, appid)
-            get_full_steam_game_info_async(appid, lambda info, n=name, a=appid, lp=last_played, pt=playtime_seconds: on_game_info(info, n, a, lp, pt))
+            get_full_steam_game_info_async(
+                appid,
+                lambda info, n=name, a=appid, lp=last_played, pt=playtime_seconds: on_game_info(info, n, a, lp, pt),
+                with_anticheat=False
+            )
 
-    def _load_portproton_games_async(self, callback: Callable[[list[tuple]], None]):
+    def _load_portproton_games_async(self, callback: Callable[[list[tuple]], None],
+                                     on_game: Callable[[tuple], None] | None = None,
+                                     update_progress: Callable[[int, int], None] | None = None):
         games = []
         if not self.portproton_location:
             callback(games)
@@ -347,28 +555,74 @@ class MainWindow(QMainWindow):
         if not desktop_files:
             callback(games)
             return
-        self.total_games = len(desktop_files)
-        self.update_progress.emit(0)  # Initialize progress bar
+        update_progress = update_progress or (lambda _processed, _total: None)
+        update_progress(0, len(desktop_files))
         self.update_status_message.emit(_("Loading PortProton games..."), 3000)
-        def on_desktop_processed(result: tuple | None, games=games):
-            if result:
-                games.append(result)
-            self.pending_games.append(None)
-            self.update_progress.emit(len(self.pending_games))  # Update progress bar
-            if len(self.pending_games) == len(desktop_files):
-                callback(games)
-        with ThreadPoolExecutor() as executor:
-            for file_path in desktop_files:
-                executor.submit(self._process_desktop_file_async, file_path, on_desktop_processed)
-
-    def _process_desktop_file_async(self, file_path: str, callback: Callable[[tuple | None], None]):
+        snapshot = self.library_snapshot["portproton"]
+        revalidated = self._revalidated_snapshot["portproton"]
+        processed = []  # (ярлык, игра, данные Steam)
+        processed_lock = threading.Lock()
+        processed_count = 0
+        checked = {}  # ярлык -> (сигнатура, время проверки данных Steam)
+        looked_up = set()  # ярлыки, для которых данные Steam запрошены заново
+
+        def on_anticheat_statuses(statuses: dict[str, str]):
+            games = []
+            for file_path, game, steam_info in processed:
+                game = game[:9] + (statuses.get(steam_info.get("name", ""), ""),) + game[10:]
+                # Поиск, не завершённый из-за сети, не сохраняется, чтобы повторить его при следующей загрузке
+                if file_path not in looked_up or steam_info.get("lookup_complete"):
+                    signature, checked_at = checked[file_path]
+                    revalidated[file_path] = {"sig": signature, "checked_at": checked_at, "steam_info": steam_info, "game": game}
+                games.append(game)
+            callback(games)
+
+        def on_desktop_processed(file_path: str, result: tuple | None, steam_info: dict):
+            nonlocal processed_count
+            if result and on_game:
+                on_game(result)
+            with processed_lock:
+                if result:
+                    processed.append((file_path, result, steam_info))
+                processed_count += 1
+                done = processed_count == len(desktop_files)
+                update_progress(processed_count, len(desktop_files))
+            if done:
+                get_weanticheatyet_statuses_async([info.get("name", "") for _path, _game, info in processed], on_anticheat_statuses)
+
+        # Не ждём завершения задач, чтобы остальные источники загружались одновременно
+        executor = ThreadPoolExecutor()
+        for file_path in desktop_files:
+            # Для неизменившихся ярлыков не повторяем поиск в Steam (exiftool и сетевые запросы)
+            signature = file_signature(file_path)
+            entry = snapshot.get(file_path) or {}
+            cached_steam_info = entry.get("steam_info") if is_entry_current(entry, signature) else None
+            checked[file_path] = (signature, entry["checked_at"] if cached_steam_info is not None else time.time())
+            if cached_steam_info is None:
+                looked_up.add(file_path)
+            executor.submit(
+                self._process_desktop_file_async, file_path,
+                lambda result, steam_info, path=file_path: on_desktop_processed(path, result, steam_info),
+                cached_steam_info, on_game
+            )
+        executor.shutdown(wait=False)
+
+    def _process_desktop_file_async(self, file_path: str, callback: Callable[[tuple | None, dict], None],
+                                    cached_steam_info: dict | None = None,
+                                    on_local_game: Callable[[tuple], None] | None = None):
+        """
+        Собирает кортеж игры для .desktop файла и передаёт его в callback вместе с данными Steam.
+        Если переданы cached_steam_info (ярлык не менялся с прошлой проверки), поиск в Steam
+        не выполняется, обновляется только рейтинг ProtonDB. Иначе до поиска в Steam
+        в on_local_game передаётся кортеж только с локальными данными ярлыка.
+        """
         entry = parse_desktop_entry(file_path)
         if not entry:
-            callback(None)
+            callback(None, {})
             return
         desktop_name = entry.get("Name", _("Unknown Game"))
         if desktop_name.lower() in ["portproton", "readme"]:
-            callback(None)
+            callback(None, {})
             return
         exec_line = entry.get("Exec", "")
         game_exe = ""
@@ -436,19 +690,12 @@ class MainWindow(QMainWindow):
 
             if self.portproton_location:
                 statistics_file = os.path.join(self.portproton_location, "data", "tmp", "statistics")
-                try:
-                    playtime_data = parse_playtime_file(statistics_file)
-                    matching_key = next(
-                        (key for key in playtime_data if os.path.basename(key).split('.')[0] == exe_name),
-                        None
-                    )
-                    if matching_key:
-                        playtime_seconds = playtime_data[matching_key]
-                        formatted_playtime = format_playtime(playtime_seconds)
-                except Exception as e:
-                    print(f"Failed to parse playtime data: {e}")
+                playtimes = get_exe_playtimes(statistics_file)
+                if exe_name in playtimes:
+                    playtime_seconds = playtimes[exe_name]
+                    formatted_playtime = format_playtime(playtime_seconds)
 
-        def on_steam_info(steam_info: dict):
+        def build_game(steam_info: dict) -> tuple:
             final_name = user_name or builtin_name or desktop_name
             final_desc = (user_desc if user_desc is not None else
                         builtin_desc if builtin_desc is not None else
@@ -457,7 +704,7 @@ class MainWindow(QMainWindow):
                         builtin_cover if builtin_cover else
                         steam_info.get("cover", "") or entry.get("Icon", ""))
             steam_game = "false"
-            callback((
+            return (
                 final_name,
                 final_desc,
                 final_cover,
@@ -471,16 +718,37 @@ class MainWindow(QMainWindow):
                 get_last_launch_timestamp(exe_name) if exe_name else 0,
                 playtime_seconds,
                 steam_game
-            ))
+            )
+
+        def on_steam_info(steam_info: dict):
+            callback(build_game(steam_info), steam_info)
 
-        get_steam_game_info_async(desktop_name, exec_line, on_steam_info)
+        if cached_steam_info is not None:
+            if cached_steam_info.get("appid"):
+                cached_steam_info = dict(cached_steam_info, protondb_tier=get_protondb_tier(cached_steam_info["appid"]))
+            on_steam_info(cached_steam_info)
+            return
+        if on_local_game:
+            on_local_game(build_game({}))
+        get_steam_game_info_async(desktop_name, exec_line, on_steam_info, with_anticheat=False)
+
+    @Slot(int, str, int, int)
+    def on_progress_updated(self, generation: int, source: str, processed: int, total: int):
+        """Учитывает прогресс источника; шкала показывает сумму по всем источникам текущей загрузки."""
+        if generation != self._load_generation:
+            return
+        self._source_progress[source] = (processed, total)
+        self.progress_bar.setMaximum(sum(total for _processed, total in self._source_progress.values()))
+        self.progress_bar.setValue(sum(processed for processed, _total in self._source_progress.values()))
 
     def finalize_game_loading(self):
-        logger.info("Finalizing game loading, pending_games: %d", len(self.pending_games))
-        if self.pending_games and all(x is None for x in self.pending_games):
-            logger.info("All games processed, clearing pending_games")
-            self.pending_games = []
-            self.update_progress.emit(0)  # Hide progress bar
+        processed = sum(processed for processed, _total in self._source_progress.values())
+        total = sum(total for _processed, total in self._source_progress.values())
+        logger.info("Finalizing game loading, processed: %d/%d", processed, total)
+        if self._source_progress and processed == total:
+            logger.info("All games processed, clearing progress")
+            self._source_progress = {}
+            self.progress_bar.setValue(0)  # Hide progress bar
             self.progress_bar.setVisible(False)
             self.update_status_message.emit("", 0)  # Clear status message
 
@@ -531,12 +799,12 @@ class MainWindow(QMainWindow):
 
     def filterGamesDelayed(self):
         """Filters games based on search text and updates the grid."""
-        text = self.searchEdit.text().strip().lower()
+        text = self.searchEdit.text().strip()
         if text == "":
             self.updateGameGrid()  # Use self.games directly
         else:
-            filtered = [game for game in self.games if text in game[0].lower()]
-            self.updateGameGrid(filtered)
+            # Ranked results from the library index; the grid reuses the cards it already has
+            self.updateGameGrid(self.search_index.search(text))
 
     def createInstalledTab(self):
         self.gamesLibraryWidget = QWidget()
@@ -551,10 +819,14 @@ class MainWindow(QMainWindow):
         scrollArea.setWidgetResizable(True)
         scrollArea.setStyleSheet(self.theme.SCROLL_AREA_STYLE)
 
-        self.gamesListWidget = QWidget()
+        # Карточки создаются только для видимых рядов сетки
+        self.gamesListWidget = GameGrid(
+            select_callback=self.openGameDetailPage,
+            context_menu_manager=self.context_menu_manager,
+            theme=self.theme,
+            card_width=self.card_width
+        )
         self.gamesListWidget.setStyleSheet(self.theme.LIST_WIDGET_STYLE)
-        self.gamesListLayout = FlowLayout(self.gamesListWidget)
-        self.gamesListWidget.setLayout(self.gamesListLayout)
 
         scrollArea.setWidget(self.gamesListWidget)
         layout.addWidget(scrollArea)
@@ -587,7 +859,7 @@ class MainWindow(QMainWindow):
 
         def calculate_card_width():
             available_width = scrollArea.width() - 20
-            spacing = self.gamesListLayout._spacing
+            spacing = self.gamesListWidget._spacing
             target_cards_per_row = 8
             calculated_width = (available_width - spacing * (target_cards_per_row - 1)) // target_cards_per_row
             calculated_width = max(200, min(calculated_width, 250))
@@ -599,9 +871,6 @@ class MainWindow(QMainWindow):
 
         QTimer.singleShot(0, calculate_card_width)
 
-        # Добавляем обработчик прокрутки для ленивой загрузки
-        scrollArea.verticalScrollBar().valueChanged.connect(self.loadVisibleImages)
-
         self.stackedWidget.addWidget(self.gamesLibraryWidget)
         self.updateGameGrid()
 
@@ -613,100 +882,12 @@ class MainWindow(QMainWindow):
             self._last_width = self.width()
             self.sliderDebounceTimer.start()
 
-    def loadVisibleImages(self):
-        visible_region = self.gamesListWidget.visibleRegion()
-        max_concurrent_loads = 5
-        loaded_count = 0
-        for card_key, card in self.game_card_cache.items():
-            if card_key in self.pending_images and visible_region.contains(card.pos()) and loaded_count < max_concurrent_loads:
-                cover_path, width, height, callback = self.pending_images.pop(card_key)
-                load_pixmap_async(cover_path, width, height, callback)
-                loaded_count += 1
-
     def updateGameGrid(self, games_list=None):
         """Updates the game grid with the provided games list or self.games."""
         if games_list is None:
             games_list = self.games
-        if not games_list:
-            self.clearLayout(self.gamesListLayout)
-            self.game_card_cache.clear()
-            self.pending_images.clear()
-            return
-
-        # Create a set of game names for quick lookup
-        current_games = {game_data[0]: game_data for game_data in games_list}
-
-        # Check if the grid is already up-to-date
-        if set(current_games.keys()) == set(self.game_card_cache.keys()) and self.card_width == getattr(self, '_last_card_width', None):
-            return  # No changes needed, skip update
-
-        # Track if layout has changed to decide if geometry update is needed
-        layout_changed = False
-
-        # Remove cards for games no longer in the list
-        for card_key in list(self.game_card_cache.keys()):
-            if card_key not in current_games:
-                card = self.game_card_cache.pop(card_key)
-                self.gamesListLayout.removeWidget(card)
-                card.deleteLater()
-                if card_key in self.pending_images:
-                    del self.pending_images[card_key]
-                layout_changed = True
-
-        # Add or update cards for current games
-        for game_data in games_list:
-            game_name = game_data[0]
-            if game_name not in self.game_card_cache:
-                # Create new card
-                card = GameCard(
-                    *game_data,
-                    select_callback=self.openGameDetailPage,
-                    theme=self.theme,
-                    card_width=self.card_width,
-                    context_menu_manager=self.context_menu_manager
-                )
-                # Connect context menu signals
-                card.editShortcutRequested.connect(self.context_menu_manager.edit_game_shortcut)
-                card.deleteGameRequested.connect(self.context_menu_manager.delete_game)
-                card.addToMenuRequested.connect(self.context_menu_manager.add_to_menu)
-                card.removeFromMenuRequested.connect(self.context_menu_manager.remove_from_menu)
-                card.addToDesktopRequested.connect(self.context_menu_manager.add_to_desktop)
-                card.removeFromDesktopRequested.connect(self.context_menu_manager.remove_from_desktop)
-                card.addToSteamRequested.connect(self.context_menu_manager.add_to_steam)
-                card.removeFromSteamRequested.connect(self.context_menu_manager.remove_from_steam)
-                card.openGameFolderRequested.connect(self.context_menu_manager.open_game_folder)
-                self.game_card_cache[game_name] = card
-                self.gamesListLayout.addWidget(card)
-                layout_changed = True
-            elif self.card_width != getattr(self, '_last_card_width', None):
-                # Update size only if card_width has changed
-                card = self.game_card_cache[game_name]
-                card.setFixedWidth(self.card_width + 20)  # Account for extra_margin in GameCard
-
-        # Store the current card_width
-        self._last_card_width = self.card_width
-
-        # Trigger lazy image loading for visible cards
-        self.loadVisibleImages()
-
-        # Update layout geometry only if the layout has changed
-        if layout_changed:
-            self.gamesListWidget.updateGeometry()
-
-    def clearLayout(self, layout):
-        """Удаляет все виджеты из layout."""
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                widget = child.widget()
-                # Remove from game_card_cache if it's a GameCard
-                for key, card in list(self.game_card_cache.items()):
-                    if card == widget:
-                        del self.game_card_cache[key]
-                        # Also remove from pending_images if present
-                        if key in self.pending_images:
-                            del self.pending_images[key]
-                widget.deleteLater()
+        self.gamesListWidget.set_card_width(self.card_width)
+        self.gamesListWidget.set_games(games_list)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -1098,6 +1279,7 @@ class MainWindow(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             clear_cache()
+            image_cache.clear()
 
             # Показываем сообщение
             self.statusBar().showMessage(_("Cache cleared"), 3000)
@@ -1123,12 +1305,13 @@ class MainWindow(QMainWindow):
         proxy_user = self.proxyUserEdit.text().strip()
         proxy_password = self.proxyPasswordEdit.text().strip()
         save_proxy_config(proxy_url, proxy_user, proxy_password)
+        get_download_engine().reset_sessions()
 
         fullscreen = self.fullscreenCheckBox.isChecked()
         save_fullscreen_config(fullscreen)
 
         # Перезагружаем настройки
-        read_time_config()
+        time_formatter.reload_settings()
         self.games = self.loadGames()
         self.updateGameGrid()
         self.settings_saved.emit()
@@ -1248,6 +1431,7 @@ class MainWindow(QMainWindow):
         """Перезапускает приложение."""
         if not self.isFullScreen():
             save_window_geometry(self.width(), self.height())
+        flush_config()
         python = sys.executable
         os.execl(python, python, *sys.argv)
 
@@ -1297,7 +1481,7 @@ class MainWindow(QMainWindow):
             if callback:
                 callback(palette)
 
-        load_pixmap_async(cover_path, 180, 250, on_pixmap)
+        load_pixmap_async(cover_path, 180, 250, on_pixmap, priority=PRIORITY_HIGH)
 
     def darkenColor(self, color, factor=200):
         return color.darker(factor)
@@ -1310,8 +1494,7 @@ class MainWindow(QMainWindow):
 
         if cover_path:
             def on_pixmap_ready(pixmap):
-                rounded = round_corners(pixmap, 10)
-                imageLabel.setPixmap(rounded)
+                imageLabel.setPixmap(pixmap)
 
                 def on_palette_ready(palette):
                     dark_palette = [self.darkenColor(color, factor=200) for color in palette]
@@ -1322,7 +1505,7 @@ class MainWindow(QMainWindow):
 
                 self.getColorPalette_async(cover_path, num_colors=5, callback=on_palette_ready)
 
-            load_pixmap_async(cover_path, 300, 400, on_pixmap_ready)
+            load_pixmap_async(cover_path, 300, 400, on_pixmap_ready, radius=10, priority=PRIORITY_HIGH)
         else:
             detailPage.setStyleSheet(self.theme.DETAIL_PAGE_NO_COVER_STYLE)
 
@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+import time
+import orjson
+from collections.abc import Iterable
+from portprotonqt.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    appid INTEGER NOT NULL,
+    lang TEXT NOT NULL DEFAULT '',
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, appid, lang)
+) WITHOUT ROWID
+"""
+
+
+class MetadataStore:
+    """
+    Consolidated cache of per-game metadata in a single SQLite database.
+
+    Entries are grouped by kind (e.g. "appdetails") and keyed by appid and
+    language; every entry keeps the time it was stored so that callers can
+    apply their own TTL. One connection is shared between threads and
+    serialized with a lock, which is enough for the small, point-wise queries
+    the loaders issue.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def get(self, kind: str, appid: int, lang: str = "", ttl: float | None = None) -> dict | None:
+        """Returns the stored entry, or None if it is missing or older than ttl seconds."""
+        entry = self.get_with_age(kind, appid, lang)
+        if entry is None:
+            return None
+        data, age = entry
+        if ttl is not None and age >= ttl:
+            return None
+        return data
+
+    def get_with_age(self, kind: str, appid: int, lang: str = "") -> tuple[dict, float] | None:
+        """Returns (entry, age in seconds) regardless of TTL, or None if it is missing."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at FROM entries WHERE kind = ? AND appid = ? AND lang = ?",
+                (kind, int(appid), lang),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return orjson.loads(row[0]), time.time() - row[1]
+        except orjson.JSONDecodeError as e:
+            logger.warning("Broken %s entry for appid %s in metadata store: %s", kind, appid, e)
+            return None
+
+    def get_many(self, kind: str, appids: Iterable[int], lang: str = "", ttl: float | None = None) -> dict[int, dict]:
+        """Returns {appid: entry} for the stored entries that are younger than ttl."""
+        appids = [int(appid) for appid in appids]
+        min_updated_at = time.time() - ttl if ttl is not None else float("-inf")
+        result = {}
+        with self._lock:
+            # Ограничение SQLite на число параметров запроса
+            for start in range(0, len(appids), 500):
+                chunk = appids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT appid, data FROM entries WHERE kind = ? AND lang = ? AND updated_at > ? "
+                    f"AND appid IN ({','.join('?' * len(chunk))})",
+                    (kind, lang, min_updated_at, *chunk),
+                ).fetchall()
+                for appid, data in rows:
+                    try:
+                        result[appid] = orjson.loads(data)
+                    except orjson.JSONDecodeError:
+                        continue
+        return result
+
+    def put(self, kind: str, appid: int, data: dict, lang: str = ""):
+        """Stores or replaces an entry and stamps it with the current time."""
+        self.put_many(kind, {appid: data}, lang)
+
+    def put_many(self, kind: str, entries: dict[int, dict], lang: str = ""):
+        """Stores several entries of one kind in a single transaction."""
+        now = time.time()
+        rows = [(kind, int(appid), lang, orjson.dumps(data), now) for appid, data in entries.items()]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (kind, appid, lang, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.error("Failed to write %d %s entries to metadata store: %s", len(rows), kind, e)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,217 @@
+import os
+import mmap
+import struct
+import numpy as np
+from collections.abc import Iterable
+
+# Формат файла:
+#   header   — magic, версия формата, число записей, размер блока имён, хэш источника
+#   offsets  — uint32[count + 1], смещения имён в блоке имён
+#   values   — uint32[count], значение записи (например, appid)
+#   order    — uint32[count], номера записей, отсортированные по имени (для бинарного поиска)
+#   lengths  — uint32[count], длина имени в символах
+#   tri_keys — uint32[keys], отсортированные триграммы (три байта UTF-8 имени)
+#   tri_offs — uint32[keys + 1], границы списков вхождений каждой триграммы
+#   postings — uint32[postings], номера записей по возрастанию для каждой триграммы
+#   names    — имена в кодировке UTF-8, каждое завершается символом '\n'
+INDEX_MAGIC = b"PPQNIDX\0"
+INDEX_FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8sIIIII64s")
+_HEADER_SIZE = 96  # выровнено, чтобы массивы начинались с границы в 4 байта
+_SEPARATOR = b"\n"
+
+
+class NameIndex:
+    """
+    Compact, read-only index of normalized names with a uint32 value per entry.
+
+    The same byte layout is used in memory and on disk, so an index built once
+    can be saved and later mmapped without parsing or materialising the entries.
+    Entries keep the insertion order of their first occurrence and the value of
+    the last one, i.e. the same semantics as building a dict from the list.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap):
+        magic, version, count, names_size, keys, postings, source_hash = _HEADER.unpack_from(buffer, 0)
+        if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION:
+            raise ValueError("Unsupported name index format")
+        self._buffer = buffer
+        self._count = count
+        self.source_hash = source_hash.rstrip(b"\0").decode("ascii")
+
+        pos = _HEADER_SIZE
+        self._offsets = np.frombuffer(buffer, dtype="<u4", count=count + 1, offset=pos)
+        pos += 4 * (count + 1)
+        self._values = np.frombuffer(buffer, dtype="<u4", count=count, offset=pos)
+        pos += 4 * count
+        self._order = np.frombuffer(buffer, dtype="<u4", count=count, offset=pos)
+        pos += 4 * count
+        self._lengths = np.frombuffer(buffer, dtype="<u4", count=count, offset=pos)
+        pos += 4 * count
+        self._tri_keys = np.frombuffer(buffer, dtype="<u4", count=keys, offset=pos)
+        pos += 4 * keys
+        self._tri_offsets = np.frombuffer(buffer, dtype="<u4", count=keys + 1, offset=pos)
+        pos += 4 * (keys + 1)
+        self._postings = np.frombuffer(buffer, dtype="<u4", count=postings, offset=pos)
+        pos += 4 * postings
+        self._names_start = pos
+        self._names_end = pos + names_size
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple[str, int]], source_hash: str = "") -> "NameIndex":
+        """Builds an in-memory index from (name, value) pairs."""
+        positions: dict[str, int] = {}
+        names: list[bytes] = []
+        values: list[int] = []
+        char_lengths: list[int] = []
+        for name, value in entries:
+            pos = positions.get(name)
+            if pos is not None:
+                values[pos] = value
+                continue
+            positions[name] = len(names)
+            names.append(name.replace("\n", " ").encode("utf-8"))
+            values.append(value)
+            char_lengths.append(len(name))
+
+        count = len(names)
+        byte_lengths = np.fromiter((len(n) + 1 for n in names), dtype=np.uint32, count=count)
+        offsets = np.zeros(count + 1, dtype="<u4")
+        np.cumsum(byte_lengths, out=offsets[1:])
+        order = np.array(sorted(range(count), key=names.__getitem__), dtype="<u4")
+        blob = _SEPARATOR.join(names) + _SEPARATOR if names else b""
+        tri_keys, tri_offsets, postings = cls._build_trigrams(blob, offsets)
+
+        header = _HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, count, len(blob),
+                              len(tri_keys), len(postings), source_hash.encode("ascii"))
+        buffer = b"".join((
+            header.ljust(_HEADER_SIZE, b"\0"),
+            offsets.tobytes(),
+            np.asarray(values, dtype="<u4").tobytes(),
+            order.tobytes(),
+            np.asarray(char_lengths, dtype="<u4").tobytes(),
+            tri_keys.tobytes(),
+            tri_offsets.tobytes(),
+            postings.tobytes(),
+            blob,
+        ))
+        return cls(buffer)
+
+    @staticmethod
+    def _build_trigrams(blob: bytes, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Builds the trigram inverted index: for every distinct three-byte sequence
+        found inside a name, the ascending list of entries that contain it.
+        """
+        data = np.frombuffer(blob, dtype=np.uint8)
+        if len(data) < 3:
+            return np.zeros(0, dtype="<u4"), np.zeros(1, dtype="<u4"), np.zeros(0, dtype="<u4")
+        a, b, c = data[:-2], data[1:-1], data[2:]
+        sep = ord(_SEPARATOR)
+        positions = np.flatnonzero((a != sep) & (b != sep) & (c != sep))
+        keys = (a[positions].astype(np.uint64) << 16) | (b[positions].astype(np.uint64) << 8) | c[positions]
+        entries = np.searchsorted(offsets, positions, side="right") - 1
+        pairs = np.unique((keys << 32) | entries.astype(np.uint64))
+        pair_keys = (pairs >> 32).astype("<u4")
+        tri_keys, starts = np.unique(pair_keys, return_index=True)
+        tri_offsets = np.append(starts, len(pairs)).astype("<u4")
+        postings = (pairs & 0xFFFFFFFF).astype("<u4")
+        return tri_keys.astype("<u4"), tri_offsets, postings
+
+    @classmethod
+    def open(cls, path: str) -> "NameIndex":
+        """Opens an index saved with save() using a read-only memory map."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm)
+
+    def save(self, path: str):
+        """Atomically writes the index to path."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._buffer)
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _name_bytes(self, i: int) -> bytes:
+        start = self._names_start + int(self._offsets[i])
+        end = self._names_start + int(self._offsets[i + 1]) - 1
+        return self._buffer[start:end]
+
+    def name(self, i: int) -> str:
+        return self._name_bytes(i).decode("utf-8")
+
+    def value(self, i: int) -> int:
+        return int(self._values[i])
+
+    def lookup(self, name: str) -> int | None:
+        """Returns the entry number for an exact name match or None."""
+        key = name.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_bytes(int(self._order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            i = int(self._order[lo])
+            if self._name_bytes(i) == key:
+                return i
+        return None
+
+    def _candidates(self, needle: bytes) -> np.ndarray:
+        """
+        Returns the ascending entries that contain every trigram of needle.
+        Needles shorter than a trigram match every entry.
+        """
+        if len(needle) < 3:
+            return np.arange(self._count, dtype=np.uint32)
+        data = np.frombuffer(needle, dtype=np.uint8)
+        keys = np.unique(
+            (data[:-2].astype(np.uint32) << 16) | (data[1:-1].astype(np.uint32) << 8) | data[2:]
+        )
+        slots = np.searchsorted(self._tri_keys, keys)
+        if slots[-1] >= len(self._tri_keys) or not np.array_equal(self._tri_keys[slots], keys):
+            return np.zeros(0, dtype=np.uint32)
+        lists = sorted(
+            (self._postings[self._tri_offsets[s]:self._tri_offsets[s + 1]] for s in slots),
+            key=len,
+        )
+        result = lists[0]
+        for postings in lists[1:]:
+            result = np.intersect1d(result, postings, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+    def find_substring(self, fragment: str, min_ratio: float) -> int | None:
+        """
+        Returns the first entry (in index order) that contains fragment and for
+        which len(fragment) / len(name) > min_ratio, or None.
+
+        Candidates come from the trigram index and are narrowed by name length
+        before the actual substring check, so no full scan of the names is done.
+        """
+        if not fragment:
+            return None
+        needle = fragment.encode("utf-8")
+        candidates = self._candidates(needle)
+        if not len(candidates):
+            return None
+        size = len(fragment)
+        lengths = self._lengths[candidates]
+        fits = lengths >= size
+        candidates, lengths = candidates[fits], lengths[fits]
+        candidates = candidates[size / lengths > min_ratio]
+        for i in candidates:
+            i = int(i)
+            if needle in self._name_bytes(i):
+                return i
+        return None
+
+    def find_substrings(self, fragments: Iterable[str], min_ratio: float) -> dict[str, int | None]:
+        """Batch variant of find_substring: resolves every distinct fragment once."""
+        return {fragment: self.find_substring(fragment, min_ratio) for fragment in dict.fromkeys(fragments)}
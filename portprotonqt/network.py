@@ -0,0 +1,116 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+import orjson
+import requests
+from PySide6.QtCore import QObject, Signal, Slot
+from portprotonqt.downloader import get_download_engine
+from portprotonqt.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_LOCK = threading.Lock()
+
+# Блокирующие вызовы (requests, subprocess, чтение файлов) выполняются в ограниченном пуле:
+# сколько бы корутин их ни ожидало, число потоков остаётся фиксированным.
+_BLOCKING_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="network-io")
+
+
+class NetworkBridge(QObject):
+    """Delivers results of network coroutines to callbacks in the GUI thread."""
+    result_ready = Signal(object, object)  # callback, result
+
+    def __init__(self):
+        super().__init__()
+        self.result_ready.connect(self._dispatch)
+
+    @Slot(object, object)
+    def _dispatch(self, callback, result):
+        callback(result)
+
+network_bridge = NetworkBridge()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Returns the network event loop, starting its thread on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="network-loop", daemon=True).start()
+            _LOOP = loop
+        return _LOOP
+
+
+def submit(coro: Coroutine[Any, Any, T], callback: Callable[[T], Any] | None = None,
+           in_gui_thread: bool = False, default: Any = None) -> Future:
+    """
+    Schedules a coroutine on the network loop from any thread.
+    The callback is called with the result in the loop thread, or in the GUI
+    thread through network_bridge when in_gui_thread is set. If the coroutine
+    raises, the callback gets default instead, so callers waiting for a fixed
+    number of callbacks always finish.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    if callback is not None:
+        future.add_done_callback(functools.partial(_deliver, callback=callback, in_gui_thread=in_gui_thread,
+                                                   default=default))
+    return future
+
+
+def _deliver(future: Future, callback: Callable[[Any], Any], in_gui_thread: bool, default: Any):
+    try:
+        result = future.result()
+    except Exception as e:
+        logger.error("Network task failed: %s", e)
+        result = default
+    if in_gui_thread:
+        network_bridge.result_ready.emit(callback, result)
+    else:
+        callback(result)
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Runs a blocking function in the shared bounded executor and awaits its result."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _BLOCKING_EXECUTOR, functools.partial(func, *args, **kwargs)
+    )
+
+
+def from_callback(func: Callable[..., Any], *args, **kwargs) -> asyncio.Future:
+    """
+    Adapts a callback-style API (func(..., callback=...)) to an awaitable.
+    The callback may be called from any thread, including synchronously.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def set_result(result):
+        if not future.done():
+            future.set_result(result)
+
+    func(*args, callback=lambda result: loop.call_soon_threadsafe(set_result, result), **kwargs)
+    return future
+
+
+async def http_get(url: str, timeout: int = 5) -> requests.Response:
+    """Performs a GET request with the pooled session of the download engine."""
+    session = get_download_engine().session_for(url)
+    return await run_blocking(session.get, url, timeout=timeout)
+
+
+async def get_json(url: str, timeout: int = 5) -> Any | None:
+    """Fetches and decodes a JSON document, returning None on any network or parse error."""
+    try:
+        response = await http_get(url, timeout)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logger.warning("Failed to fetch %s: %s", url, e)
+        return None
@@ -0,0 +1,159 @@
+import mmap
+import struct
+
+# Ресурсы версии (VS_VERSIONINFO) в PE файле:
+#   IMAGE_RESOURCE_DIRECTORY (тип RT_VERSION) -> имя -> язык -> IMAGE_RESOURCE_DATA_ENTRY
+#   VS_VERSIONINFO -> StringFileInfo -> StringTable (язык/кодировка) -> String (ключ = значение)
+# Читаются только заголовки, таблица секций и каталог ресурсов, без разбора остального файла.
+
+RT_VERSION = 16
+IMAGE_DIRECTORY_ENTRY_RESOURCE = 2
+_RESOURCE_SUBDIRECTORY = 0x80000000
+# Ограничение числа элементов каталога на случай повреждённых файлов
+_MAX_ENTRIES = 4096
+
+
+class PEFormatError(ValueError):
+    """Файл не является корректным PE файлом."""
+
+
+def _rva_to_offset(sections: list[tuple[int, int, int, int]], rva: int) -> int:
+    for virtual_address, virtual_size, raw_size, raw_offset in sections:
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return rva - virtual_address + raw_offset
+    raise PEFormatError(f"RVA {rva:#x} outside of sections")
+
+
+def _directory_entries(data, offset: int) -> list[tuple[int, int]]:
+    """Возвращает (идентификатор или смещение имени, смещение данных) элементов каталога ресурсов."""
+    named, ids = struct.unpack_from("<HH", data, offset + 12)
+    count = named + ids
+    if count > _MAX_ENTRIES:
+        raise PEFormatError("Too many resource entries")
+    return [struct.unpack_from("<II", data, offset + 16 + i * 8) for i in range(count)]
+
+
+def _find_version_resource(data) -> tuple[int, int] | None:
+    """Возвращает (смещение в файле, размер) первого ресурса RT_VERSION или None."""
+    if len(data) < 64 or data[:2] != b"MZ":
+        raise PEFormatError("No MZ header")
+    pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+    if data[pe_offset:pe_offset + 4] != b"PE\0\0":
+        raise PEFormatError("No PE signature")
+    number_of_sections, optional_header_size = struct.unpack_from("<H12xH", data, pe_offset + 6)
+    optional_header = pe_offset + 24
+    magic = struct.unpack_from("<H", data, optional_header)[0]
+    if magic == 0x10B:
+        directories_count_offset = optional_header + 92
+    elif magic == 0x20B:
+        directories_count_offset = optional_header + 108
+    else:
+        raise PEFormatError(f"Unknown optional header magic {magic:#x}")
+    directories_count = struct.unpack_from("<I", data, directories_count_offset)[0]
+    if directories_count <= IMAGE_DIRECTORY_ENTRY_RESOURCE:
+        return None
+    resource_rva, resource_size = struct.unpack_from(
+        "<II", data, directories_count_offset + 4 + IMAGE_DIRECTORY_ENTRY_RESOURCE * 8
+    )
+    if not resource_rva or not resource_size:
+        return None
+
+    section_table = optional_header + optional_header_size
+    sections = []
+    for i in range(number_of_sections):
+        virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from(
+            "<IIII", data, section_table + i * 40 + 8
+        )
+        sections.append((virtual_address, virtual_size, raw_size, raw_offset))
+    resource_base = _rva_to_offset(sections, resource_rva)
+
+    # Тип -> имя -> язык: на первом уровне ищем RT_VERSION, дальше берём первый элемент
+    entry_offset = None
+    for name, offset in _directory_entries(data, resource_base):
+        if not name & _RESOURCE_SUBDIRECTORY and name == RT_VERSION:
+            entry_offset = offset
+            break
+    if entry_offset is None:
+        return None
+    for _level in range(2):
+        if not entry_offset & _RESOURCE_SUBDIRECTORY:
+            break
+        entries = _directory_entries(data, resource_base + (entry_offset & ~_RESOURCE_SUBDIRECTORY))
+        if not entries:
+            return None
+        entry_offset = entries[0][1]
+    if entry_offset & _RESOURCE_SUBDIRECTORY:
+        raise PEFormatError("Unexpected resource directory depth")
+    data_rva, data_size = struct.unpack_from("<II", data, resource_base + entry_offset)
+    return _rva_to_offset(sections, data_rva), data_size
+
+
+def _align4(offset: int) -> int:
+    return (offset + 3) & ~3
+
+
+def _read_key(data, offset: int, end: int) -> tuple[str, int]:
+    """Читает ключ узла (UTF-16LE до нулевого символа), возвращает его и смещение после выравнивания."""
+    position = offset
+    while position + 1 < end and data[position:position + 2] != b"\0\0":
+        position += 2
+    return bytes(data[offset:position]).decode("utf-16-le", "replace"), _align4(position + 2)
+
+
+def _nodes(data, offset: int, end: int):
+    """Перебирает узлы версии (wLength, wValueLength, wType, szKey, Value, Children) в [offset, end)."""
+    while offset + 6 <= end:
+        length, value_length, value_type = struct.unpack_from("<HHH", data, offset)
+        if length == 0:
+            break
+        node_end = min(offset + length, end)
+        key, value_offset = _read_key(data, offset + 6, node_end)
+        yield key, value_length, value_type, value_offset, node_end
+        offset = _align4(offset + length)
+
+
+def _parse_version_info(data, offset: int, size: int, fields: tuple[str, ...]) -> dict[str, str]:
+    end = min(offset + size, len(data))
+    result: dict[str, str] = {}
+    for key, value_length, _type, value_offset, node_end in _nodes(data, offset, end):
+        if key != "VS_VERSION_INFO":
+            break
+        # Пропускаем VS_FIXEDFILEINFO
+        children = _align4(value_offset + value_length)
+        for child_key, _vl, _t, child_offset, child_end in _nodes(data, children, node_end):
+            if child_key != "StringFileInfo":
+                continue
+            for _table, _tl, _tt, table_offset, table_end in _nodes(data, child_offset, child_end):
+                for name, length, _st, string_offset, string_end in _nodes(data, table_offset, table_end):
+                    if name not in fields or name in result or not length:
+                        continue
+                    # Для текстовых значений wValueLength задаётся в символах
+                    raw = bytes(data[string_offset:min(string_offset + length * 2, string_end)])
+                    value = raw.decode("utf-16-le", "replace").split("\0", 1)[0].strip()
+                    if value:
+                        result[name] = value
+        break
+    return result
+
+
+def read_version_strings(path: str, fields: tuple[str, ...]) -> dict[str, str]:
+    """
+    Возвращает строковые поля ресурса версии PE файла (например, ProductName и
+    FileDescription). Файл отображается в память, читаются только заголовки
+    и каталог ресурсов. Если ресурса версии нет, возвращает пустой словарь.
+    Вызывает PEFormatError для файлов, которые не удалось разобрать, и OSError
+    при ошибках чтения.
+    """
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # пустой файл
+            raise PEFormatError(str(e)) from e
+    with data:
+        try:
+            resource = _find_version_resource(data)
+            if resource is None:
+                return {}
+            return _parse_version_info(data, *resource, fields)
+        except (struct.error, IndexError) as e:
+            raise PEFormatError(f"Truncated PE file: {e}") from e
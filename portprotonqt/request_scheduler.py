@@ -0,0 +1,80 @@
+import asyncio
+import time
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+from portprotonqt import network
+from portprotonqt.logger import get_logger
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """
+    Token bucket: allows bursts of up to `burst` requests and `rate` requests
+    per second on average. Must be used from the network loop.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RequestScheduler(Generic[K, R]):
+    """
+    Runs fetch(key) for many keys on the network loop.
+
+    Requests for a key that is already queued or in flight are coalesced: the
+    key is fetched once and every waiter gets the same result. At most
+    max_workers fetches run at a time and all of them share one rate limiter,
+    so a large library costs waiting coroutines rather than threads and cannot
+    flood a remote API. fetch itself is blocking and runs in the network
+    executor.
+    """
+
+    def __init__(self, fetch: Callable[[K], R | None], name: str, max_workers: int = 4,
+                 rate: float = 4.0, burst: int = 8):
+        self._fetch = fetch
+        self._name = name
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._limiter = RateLimiter(rate, burst)
+        self._pending: dict[K, asyncio.Future] = {}
+
+    async def request(self, key: K) -> R | None:
+        """Awaits the result of fetch(key), joining a pending request for the same key."""
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(key))
+            self._pending[key] = future
+            future.add_done_callback(lambda _f: self._pending.pop(key, None))
+        return await asyncio.shield(future)
+
+    def submit(self, key: K, callback: Callable[[R | None], None] | None = None):
+        """Schedules request(key) from any thread and calls callback with its result."""
+        network.submit(self.request(key), callback)
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def _run(self, key: K) -> R | None:
+        async with self._semaphore:
+            await self._limiter.acquire()
+            try:
+                return await network.run_blocking(self._fetch, key)
+            except Exception as e:
+                logger.error("%s: request for %s failed: %s", self._name, key, e)
+                return None
@@ -1,20 +1,27 @@
-import functools
+import hashlib
 import os
 import shlex
-import subprocess
 import time
 import html
 import orjson
+import requests
 import vdf
 import tarfile
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from PySide6.QtCore import QObject, Signal
 from portprotonqt.logger import get_logger
 from portprotonqt.localization import get_steam_language
-from portprotonqt.downloader import Downloader
+from portprotonqt.downloader import Downloader, get_download_engine, PRIORITY_LOW
 from portprotonqt.dialogs import generate_thumbnail
 from portprotonqt.config_utils import get_portproton_location
-from collections.abc import Callable
+from portprotonqt.name_index import NameIndex
+from portprotonqt.metadata_store import MetadataStore
+from portprotonqt.request_scheduler import RequestScheduler
+from portprotonqt import network, vdf_reader
+from portprotonqt.exe_metadata import get_exe_metadata
+from collections.abc import Callable, Iterable
 import re
 import shutil
 import zlib
@@ -24,19 +31,12 @@ logger = get_logger(__name__)
 CACHE_DURATION = 30 * 24 * 60 * 60
 
 def safe_vdf_load(path: str | Path) -> dict:
-    path = str(path)  # Convert Path to str
+    """Читает VDF файл (бинарный или текстовый, по первым байтам); при ошибке возвращает {}."""
     try:
-        with open(path, 'rb') as f:
-            data = vdf.binary_load(f)
-        return data
+        return vdf_reader.load(path)
     except Exception as e:
-        try:
-            with open(path, encoding='utf-8', errors='ignore') as f:
-                data = vdf.load(f)
-            return data
-        except Exception:
-            logger.error(f"Failed to load VDF file {path}: {e}")
-            return {}
+        logger.error(f"Failed to load VDF file {path}: {e}")
+        return {}
 
 def decode_text(text: str) -> str:
     """
@@ -107,6 +107,8 @@ def get_steam_libs(steam_dir: Path) -> set[Path]:
     libs.add(steam_dir)
     return libs
 
+LOCALCONFIG_APPS_SECTION = ("UserLocalConfigStore", "Software", "Valve", "Steam", "apps")
+
 def get_playtime_data(steam_home: Path | None = None) -> dict[int, tuple[int, int]]:
     """Возвращает данные о времени игры для последнего пользователя."""
     play_data: dict[int, tuple[int, int]] = {}
@@ -139,10 +141,36 @@ def get_playtime_data(steam_home: Path | None = None) -> dict[int, tuple[int, in
         return play_data
 
     localconfig = user_dir / "config/localconfig.vdf"
-    data = safe_vdf_load(localconfig)
-    cfg = data.get('UserLocalConfigStore', {})
-    apps = cfg.get('Software', {}).get('Valve', {}).get('Steam', {}).get('apps', {})
+    return _read_localconfig_playtime(str(localconfig))
+
+# localconfig.vdf -> ((mtime_ns, size), данные о времени игры)
+_localconfig_playtime_cache: dict[str, tuple[tuple[int, int], dict[int, tuple[int, int]]]] = {}
+
+def _read_localconfig_playtime(localconfig: str) -> dict[int, tuple[int, int]]:
+    """
+    Возвращает {appid: (LastPlayed, Playtime в минутах)} из localconfig.vdf.
+    Разбирается только блок Software/Valve/Steam/apps, результат кэшируется
+    до изменения mtime или размера файла.
+    """
+    try:
+        st = os.stat(localconfig)
+    except OSError as e:
+        logger.error(f"Failed to load VDF file {localconfig}: {e}")
+        return {}
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _localconfig_playtime_cache.get(localconfig)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    play_data: dict[int, tuple[int, int]] = {}
+    try:
+        apps = vdf_reader.read_section(localconfig, LOCALCONFIG_APPS_SECTION)
+    except Exception as e:
+        logger.error(f"Failed to load VDF file {localconfig}: {e}")
+        return play_data
     for appid_str, info in apps.items():
+        if not isinstance(info, dict):
+            continue
         try:
             appid = int(appid_str)
             last_played = int(info.get('LastPlayed', 0))
@@ -150,8 +178,60 @@ def get_playtime_data(steam_home: Path | None = None) -> dict[int, tuple[int, in
             play_data[appid] = (last_played, playtime)
         except ValueError:
             logger.warning(f"Некорректные данные playtime для app {appid_str}")
+    _localconfig_playtime_cache[localconfig] = (signature, play_data)
     return play_data
 
+# Разобранные appmanifest: путь -> ((mtime_ns, size), (appid, name) или None при ошибке разбора)
+_manifest_cache: dict[str, tuple[tuple[int, int], tuple[int, str] | None]] = {}
+_MANIFEST_CACHE_LOCK = threading.Lock()
+_MANIFEST_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="steam-manifests")
+
+def _read_manifest(path: str) -> tuple[int, str] | None:
+    """Читает из appmanifest только appid и name; при ошибке возвращает None."""
+    # Остаток файла не разбирается
+    try:
+        app = vdf_reader.read_values(path, ("AppState",), ("appid", "name"))
+    except Exception as e:
+        logger.error(f"Failed to load VDF file {path}: {e}")
+        return None
+    try:
+        appid = int(app.get('appid', 0))
+    except ValueError:
+        return None
+    return appid, app.get('name', f"Unknown ({appid})")
+
+def _scan_manifests(libs: Iterable[Path]) -> list[tuple[int, str]]:
+    """
+    Возвращает (appid, name) всех appmanifest_*.acf в библиотеках libs.
+    Файлы перечитываются только при изменении mtime или размера; изменённые
+    разбираются параллельно, записи об удалённых файлах убираются из кэша.
+    """
+    signatures: dict[str, tuple[int, int]] = {}
+    for lib in libs:
+        try:
+            with os.scandir(lib / "steamapps") as entries:
+                for entry in entries:
+                    if not (entry.name.startswith("appmanifest_") and entry.name.endswith(".acf")):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    signatures[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            continue
+
+    with _MANIFEST_CACHE_LOCK:
+        changed = [path for path, signature in signatures.items()
+                   if (cached := _manifest_cache.get(path)) is None or cached[0] != signature]
+        if changed:
+            logger.debug("Parsing %d changed Steam manifests", len(changed))
+            for path, app in zip(changed, _MANIFEST_EXECUTOR.map(_read_manifest, changed), strict=True):
+                _manifest_cache[path] = (signatures[path], app)
+        for path in _manifest_cache.keys() - signatures.keys():
+            del _manifest_cache[path]
+        return [app for path in signatures if (app := _manifest_cache[path][1]) is not None]
+
 def get_steam_installed_games() -> list[tuple[str, int, int, int]]:
     """Возвращает список установленных Steam игр в формате (name, appid, last_played, playtime_sec)."""
     games: list[tuple[str, int, int, int]] = []
@@ -161,25 +241,22 @@ def get_steam_installed_games() -> list[tuple[str, int, int, int]]:
         return games
 
     play_data = get_playtime_data(steam_home)
-    for lib in get_steam_libs(steam_home):
-        steamapps_dir = lib / "steamapps"
-        if not steamapps_dir.exists():
+    for appid, name in _scan_manifests(get_steam_libs(steam_home)):
+        lname = name.lower()
+        if any(token in lname for token in ["proton", "steamworks", "steam linux runtime"]):
             continue
-        for manifest in steamapps_dir.glob("appmanifest_*.acf"):
-            data = safe_vdf_load(manifest)
-            app = data.get('AppState', {})
-            try:
-                appid = int(app.get('appid', 0))
-            except ValueError:
-                continue
-            name = app.get('name', f"Unknown ({appid})")
-            lname = name.lower()
-            if any(token in lname for token in ["proton", "steamworks", "steam linux runtime"]):
-                continue
-            last_played, playtime_min = play_data.get(appid, (0, 0))
-            games.append((name, appid, last_played, playtime_min * 60))
+        last_played, playtime_min = play_data.get(appid, (0, 0))
+        games.append((name, appid, last_played, playtime_min * 60))
     return games
 
+def get_steam_installed_games_async(callback: Callable[[list[tuple[str, int, int, int]]], None]):
+    """
+    Сканирует библиотеки Steam вне GUI потока и вызывает callback
+    со списком установленных игр в GUI потоке. При ошибке сканирования
+    callback получает пустой список, чтобы загрузка библиотеки завершилась.
+    """
+    network.submit(network.run_blocking(get_steam_installed_games), callback, in_gui_thread=True, default=[])
+
 def normalize_name(s):
     """
     Приведение строки к нормальному виду:
@@ -242,170 +319,246 @@ def remove_duplicates(candidates):
     """
     return list(dict.fromkeys(candidates))
 
-@functools.lru_cache(maxsize=256)
-def get_exiftool_data(game_exe):
-    """Получает метаданные через exiftool"""
-    try:
-        proc = subprocess.run(
-            ["exiftool", "-j", game_exe],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        if proc.returncode != 0:
-            logger.error(f"exiftool error for {game_exe}: {proc.stderr.strip()}")
-            return {}
-        meta_data_list = orjson.loads(proc.stdout.encode("utf-8"))
-        return meta_data_list[0] if meta_data_list else {}
-    except Exception as e:
-        logger.error(f"An unexpected error occurred in get_exiftool_data for {game_exe}: {e}")
-        return {}
+def _file_sha256(path: str) -> str:
+    """Возвращает SHA-256 файла в виде hex-строки."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-def load_steam_apps_async(callback: Callable[[list], None]):
+def _build_steam_app_index(archive_path: str, index_path: str) -> NameIndex:
+    """
+    Compiles the Steam apps archive into an on-disk name index.
+    The index is rebuilt only when the archive hash differs from the one stored in it.
     """
-    Asynchronously loads the list of Steam applications, using cache if available.
-    Calls the callback with the list of apps.
+    archive_hash = _file_sha256(archive_path)
+    if os.path.exists(index_path):
+        try:
+            index = NameIndex.open(index_path)
+            if index.source_hash == archive_hash:
+                os.utime(index_path)
+                logger.info("Steam apps index is up to date (%s)", archive_hash[:12])
+                return index
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring broken Steam apps index %s: %s", index_path, e)
+
+    with tarfile.open(archive_path, mode='r:xz') as tar:
+        member = next((m for m in tar.getmembers() if m.name.endswith('.json')), None)
+        if member is None:
+            raise RuntimeError("JSON file not found in archive")
+        fobj = tar.extractfile(member)
+        if fobj is None:
+            raise RuntimeError(f"Failed to extract file {member.name} from archive")
+        raw = fobj.read()
+        fobj.close()
+    data = orjson.loads(raw)
+    steam_apps = data.get("applist", {}).get("apps", []) if isinstance(data, dict) else data or []
+    index = NameIndex.build(
+        ((app["normalized_name"], int(app["appid"])) for app in steam_apps),
+        source_hash=archive_hash
+    )
+    index.save(index_path)
+    logger.info("Built Steam apps index with %d entries from %d apps", len(index), len(steam_apps))
+    return NameIndex.open(index_path)
+
+_STEAM_APP_INDEX: NameIndex | None = None
+_STEAM_APP_INDEX_LOADED_AT = 0.0
+_STEAM_APP_INDEX_CALLBACKS: list[Callable[[NameIndex | None], None]] | None = None
+_STEAM_APP_INDEX_LOCK = threading.Lock()
+
+def load_steam_app_index_async(callback: Callable[[NameIndex | None], None]):
+    """
+    Asynchronously loads the process-wide Steam apps index.
+    The index is compiled once from games_appid.tar.xz and then memory-mapped,
+    concurrent requests made while it is loading share a single load.
+    Calls the callback with the index or None if it is unavailable.
     """
+    global _STEAM_APP_INDEX_CALLBACKS
+    with _STEAM_APP_INDEX_LOCK:
+        if _STEAM_APP_INDEX is not None and time.time() - _STEAM_APP_INDEX_LOADED_AT < CACHE_DURATION:
+            index = _STEAM_APP_INDEX
+        elif _STEAM_APP_INDEX_CALLBACKS is not None:
+            _STEAM_APP_INDEX_CALLBACKS.append(callback)
+            return
+        else:
+            index = None
+            _STEAM_APP_INDEX_CALLBACKS = [callback]
+    if index is not None:
+        callback(index)
+        return
+
     cache_dir = get_cache_dir()
     cache_tar = os.path.join(cache_dir, "games_appid.tar.xz")
-    cache_json = os.path.join(cache_dir, "steam_apps.json")
+    index_path = os.path.join(cache_dir, "steam_apps.idx")
+
+    def finish(result: NameIndex | None):
+        global _STEAM_APP_INDEX, _STEAM_APP_INDEX_LOADED_AT, _STEAM_APP_INDEX_CALLBACKS
+        if result is None and os.path.exists(index_path):
+            logger.warning("Falling back to stale Steam apps index: %s", index_path)
+            try:
+                result = NameIndex.open(index_path)
+            except (OSError, ValueError) as e:
+                logger.error("Error reading Steam apps index: %s", e)
+        with _STEAM_APP_INDEX_LOCK:
+            if result is not None:
+                _STEAM_APP_INDEX = result
+                _STEAM_APP_INDEX_LOADED_AT = time.time()
+            callbacks = _STEAM_APP_INDEX_CALLBACKS or []
+            _STEAM_APP_INDEX_CALLBACKS = None
+        for cb in callbacks:
+            cb(result)
 
     def process_tar(result: str | None):
         if not result or not os.path.exists(result):
             logger.error("Failed to download Steam apps archive")
-            callback([])
+            finish(None)
             return
         try:
-            with tarfile.open(result, mode='r:xz') as tar:
-                member = next((m for m in tar.getmembers() if m.name.endswith('.json')), None)
-                if member is None:
-                    raise RuntimeError("JSON file not found in archive")
-                fobj = tar.extractfile(member)
-                if fobj is None:
-                    raise RuntimeError(f"Failed to extract file {member.name} from archive")
-                raw = fobj.read()
-                fobj.close()
-                data = orjson.loads(raw)
-            with open(cache_json, "wb") as f:
-                f.write(orjson.dumps(data))
+            index = _build_steam_app_index(result, index_path)
+        except Exception as e:
+            logger.error("Error building Steam apps index: %s", e)
+            finish(None)
+            return
+        finally:
             if os.path.exists(cache_tar):
                 os.remove(cache_tar)
                 logger.info("Archive %s deleted after extraction", cache_tar)
-            steam_apps = data.get("applist", {}).get("apps", []) if isinstance(data, dict) else data or []
-            logger.info("Loaded %d apps from archive", len(steam_apps))
-            callback(steam_apps)
-        except Exception as e:
-            logger.error("Error extracting Steam apps archive: %s", e)
-            callback([])
+        finish(index)
 
-    if os.path.exists(cache_json) and (time.time() - os.path.getmtime(cache_json) < CACHE_DURATION):
-        logger.info("Using cached Steam apps JSON: %s", cache_json)
+    if os.path.exists(index_path) and (time.time() - os.path.getmtime(index_path) < CACHE_DURATION):
+        logger.info("Using cached Steam apps index: %s", index_path)
         try:
-            with open(cache_json, "rb") as f:
-                data = orjson.loads(f.read())
-            steam_apps = data.get("applist", {}).get("apps", []) if isinstance(data, dict) else data or []
-            logger.info("Loaded %d apps from cache", len(steam_apps))
-            callback(steam_apps)
-        except Exception as e:
-            logger.error("Error reading cached JSON: %s", e)
-            callback([])
-    else:
-        app_list_url = (
-            "https://raw.githubusercontent.com/Boria138/PortProtonQt/"
-            "refs/heads/main/data/games_appid.tar.xz"
-        )
-        downloader.download_async(app_list_url, cache_tar, timeout=5, callback=process_tar)
-
-def build_index(steam_apps):
-    """
-    Строит индекс приложений по полю normalized_name.
-    """
-    steam_apps_index = {}
-    if not steam_apps:
-        return steam_apps_index
-    logger.info("Построение индекса Steam приложений:")
-    for app in steam_apps:
-        normalized = app["normalized_name"]
-        steam_apps_index[normalized] = app
-    return steam_apps_index
-
-def search_app(candidate, steam_apps_index):
-    """
-    Ищет приложение по кандидату: сначала пытается точное совпадение, затем ищет подстроку.
-    """
-    candidate_norm = normalize_name(candidate)
-    logger.info("Поиск приложения для кандидата: '%s' -> '%s'", candidate, candidate_norm)
-    if candidate_norm in steam_apps_index:
-        logger.info("    Найдено точное совпадение: '%s'", candidate_norm)
-        return steam_apps_index[candidate_norm]
-    for name_norm, app in steam_apps_index.items():
-        if candidate_norm in name_norm:
-            ratio = len(candidate_norm) / len(name_norm)
-            if ratio > 0.8:
-                logger.info("    Найдено частичное совпадение: кандидат '%s' в '%s' (ratio: %.2f)",
-                            candidate_norm, name_norm, ratio)
-                return app
-    logger.info("    Приложение для кандидата '%s' не найдено", candidate_norm)
-    return None
+            cached_index = NameIndex.open(index_path)
+        except (OSError, ValueError) as e:
+            logger.error("Error reading Steam apps index: %s", e)
+        else:
+            finish(cached_index)
+            return
 
-def load_app_details(app_id):
-    """Загружает кэшированные данные для игры по appid, если они не устарели."""
-    cache_dir = get_cache_dir()
-    cache_file = os.path.join(cache_dir, f"steam_app_{app_id}.json")
-    if os.path.exists(cache_file):
-        if time.time() - os.path.getmtime(cache_file) < CACHE_DURATION:
-            with open(cache_file, "rb") as f:
-                return orjson.loads(f.read())
+    app_list_url = (
+        "https://raw.githubusercontent.com/Boria138/PortProtonQt/"
+        "refs/heads/main/data/games_appid.tar.xz"
+    )
+    downloader.download_async(app_list_url, cache_tar, timeout=5, callback=process_tar, priority=PRIORITY_LOW)
+
+def find_steam_app(candidates: list[str], steam_apps_index: NameIndex) -> dict | None:
+    """
+    Ищет приложение по кандидатам в порядке приоритета: для каждого сначала точное
+    совпадение, затем подстрока. Возвращает первое найденное приложение или None.
+    """
+    for candidate in candidates:
+        if not candidate:
+            continue
+        candidate_norm = normalize_name(candidate)
+        i = steam_apps_index.lookup(candidate_norm)
+        if i is not None:
+            logger.info("Найдено точное совпадение: '%s'", candidate_norm)
+            return {"appid": steam_apps_index.value(i), "normalized_name": candidate_norm}
+        i = steam_apps_index.find_substring(candidate_norm, 0.8)
+        if i is not None:
+            name_norm = steam_apps_index.name(i)
+            logger.info("Найдено частичное совпадение: кандидат '%s' в '%s' (ratio: %.2f)",
+                        candidate_norm, name_norm, len(candidate_norm) / len(name_norm))
+            return {"appid": steam_apps_index.value(i), "normalized_name": name_norm}
+    logger.info("Приложение для кандидатов %s не найдено", candidates)
     return None
 
-def save_app_details(app_id, data):
-    """Сохраняет данные по appid в файл кэша."""
-    cache_dir = get_cache_dir()
-    cache_file = os.path.join(cache_dir, f"steam_app_{app_id}.json")
-    with open(cache_file, "wb") as f:
-        f.write(orjson.dumps(data))
+_METADATA_STORE: MetadataStore | None = None
+_METADATA_STORE_LOCK = threading.Lock()
 
-def fetch_app_info_async(app_id: int, callback: Callable[[dict | None], None]):
+def get_metadata_store() -> MetadataStore:
+    """Возвращает общее хранилище метаданных игр (metadata.sqlite3 в каталоге кэша)."""
+    global _METADATA_STORE
+    with _METADATA_STORE_LOCK:
+        if _METADATA_STORE is None:
+            _METADATA_STORE = MetadataStore(os.path.join(get_cache_dir(), "metadata.sqlite3"))
+        return _METADATA_STORE
+
+def load_app_details(app_id, lang: str | None = None):
     """
-    Asynchronously fetches detailed app info from Steam API.
-    Calls the callback with the app data or None if failed.
+    Загружает кэшированные данные для игры по appid, если они не устарели.
+    Данные из старых файлов steam_app_{appid}.json переносятся в общее хранилище.
     """
-    cached = load_app_details(app_id)
-    if cached is not None:
-        callback(cached)
-        return
-
-    lang = get_steam_language()
+    lang = lang or get_steam_language()
+    store = get_metadata_store()
+    data = store.get("appdetails", app_id, lang, ttl=CACHE_DURATION)
+    if data is not None:
+        return data
+    legacy_file = os.path.join(get_cache_dir(), f"steam_app_{app_id}.json")
+    if os.path.exists(legacy_file):
+        try:
+            if time.time() - os.path.getmtime(legacy_file) < CACHE_DURATION:
+                with open(legacy_file, "rb") as f:
+                    data = orjson.loads(f.read())
+                store.put("appdetails", app_id, data, lang)
+            os.remove(legacy_file)
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Не удалось перенести кэш %s: %s", legacy_file, e)
+    return data
+
+def save_app_details(app_id, data, lang: str | None = None):
+    """Сохраняет данные по appid в общее хранилище метаданных."""
+    get_metadata_store().put("appdetails", app_id, data, lang or get_steam_language())
+
+def _fetch_app_details(key: tuple[int, str]) -> dict | None:
+    """Загружает appdetails для одной пары (appid, язык) и сохраняет результат в хранилище."""
+    app_id, lang = key
+    if not downloader.has_internet():
+        return None
     url = f"https://store.steampowered.com/api/appdetails?appids={app_id}&l={lang}"
-    cache_dir = get_cache_dir()
-    cache_file = os.path.join(cache_dir, f"steam_app_{app_id}.json")
+    try:
+        response = get_download_engine().session_for(url).get(url, timeout=5)
+        if response.status_code == 429:
+            logger.warning("Steam Store rate limit reached while fetching appid %s", app_id)
+            return None
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logger.error("Failed to download Steam app info for appid %s: %s", app_id, e)
+        return None
+    details = data.get(str(app_id), {})
+    if not details.get("success"):
+        return None
+    app_data_full = details.get("data", {})
+    app_data = {
+        "steam_appid": app_data_full.get("steam_appid", app_id),
+        "name": app_data_full.get("name", ""),
+        "short_description": app_data_full.get("short_description", ""),
+        "controller_support": app_data_full.get("controller_support", "")
+    }
+    save_app_details(app_id, app_data, lang)
+    return app_data
+
+# Steam Store ограничивает частоту запросов к appdetails (порядка 200 запросов за 5 минут),
+# поэтому запросы выполняются фиксированным числом потоков с общим ограничением частоты.
+_APPDETAILS_SCHEDULER: RequestScheduler[tuple[int, str], dict] = RequestScheduler(
+    _fetch_app_details, "appdetails", max_workers=4, rate=1.0, burst=40
+)
 
-    def process_response(result: str | None):
-        if not result or not os.path.exists(result):
-            logger.error("Failed to download Steam app info for appid %s", app_id)
-            callback(None)
-            return
-        try:
-            with open(result, "rb") as f:
-                data = orjson.loads(f.read())
-            details = data.get(str(app_id), {})
-            if not details.get("success"):
-                callback(None)
-                return
-            app_data_full = details.get("data", {})
-            app_data = {
-                "steam_appid": app_data_full.get("steam_appid", app_id),
-                "name": app_data_full.get("name", ""),
-                "short_description": app_data_full.get("short_description", ""),
-                "controller_support": app_data_full.get("controller_support", "")
-            }
-            save_app_details(app_id, app_data)
-            callback(app_data)
-        except Exception as e:
-            logger.error("Error processing Steam app info for appid %s: %s", app_id, e)
-            callback(None)
+async def fetch_app_info(app_id: int) -> dict | None:
+    """
+    Fetches detailed app info from Steam API.
+    Cached entries are served from the metadata store; concurrent requests for
+    the same appid are coalesced into a single rate-limited HTTP request.
+    Returns the app data or None if failed.
+    """
+    lang = get_steam_language()
+    try:
+        cached = await network.run_blocking(load_app_details, app_id, lang)
+    except Exception as e:
+        logger.error("Error reading Steam app info cache for appid %s: %s", app_id, e)
+        cached = None
+    if cached is not None:
+        return cached
+    return await _APPDETAILS_SCHEDULER.request((int(app_id), lang))
 
-    downloader.download_async(url, cache_file, timeout=5, callback=process_response)
+def fetch_app_info_async(app_id: int, callback: Callable[[dict | None], None]):
+    """
+    Asynchronously fetches detailed app info from Steam API.
+    Calls the callback with the app data or None if failed.
+    """
+    network.submit(fetch_app_info(app_id), callback)
 
 def load_weanticheatyet_data_async(callback: Callable[[list], None]):
     """
@@ -460,141 +613,229 @@ def load_weanticheatyet_data_async(callback: Callable[[list], None]):
             "https://raw.githubusercontent.com/Boria138/PortProtonQt/"
             "refs/heads/main/data/anticheat_games.tar.xz"
         )
-        downloader.download_async(app_list_url, cache_tar, timeout=5, callback=process_tar)
+        downloader.download_async(app_list_url, cache_tar, timeout=5, callback=process_tar, priority=PRIORITY_LOW)
 
-def build_weanticheatyet_index(anti_cheat_data):
+def build_weanticheatyet_index(anti_cheat_data) -> tuple[NameIndex, list[str]]:
     """
     Строит индекс античит-данных по полю normalized_name.
+    Значение записи индекса — номер статуса в возвращаемой таблице статусов.
+    """
+    status_codes: dict[str, int] = {}
+    index = NameIndex.build(
+        (entry["normalized_name"], status_codes.setdefault(entry["status"], len(status_codes)))
+        for entry in anti_cheat_data or []
+    )
+    logger.info("Построен индекс WeAntiCheatYet: %d записей, %d статусов", len(index), len(status_codes))
+    return index, list(status_codes)
+
+_ANTICHEAT_INDEX: NameIndex | None = None
+_ANTICHEAT_STATUSES: list[str] = []
+_ANTICHEAT_LOADED_AT = 0.0
+_ANTICHEAT_CALLBACKS: list[Callable[[bool], None]] | None = None
+_ANTICHEAT_LOCK = threading.Lock()
+
+def load_weanticheatyet_index_async(callback: Callable[[bool], None]):
     """
-    anti_cheat_index = {}
-    if not anti_cheat_data:
-        return anti_cheat_index
-    logger.info("Построение индекса WeAntiCheatYet данных:")
-    for entry in anti_cheat_data:
-        normalized = entry["normalized_name"]
-        anti_cheat_index[normalized] = entry
-    return anti_cheat_index
-
-def search_anticheat_status(candidate, anti_cheat_index):
-    candidate_norm = normalize_name(candidate)
-    logger.info("Поиск античит-статуса для кандидата: '%s' -> '%s'", candidate, candidate_norm)
-    if candidate_norm in anti_cheat_index:
-        status = anti_cheat_index[candidate_norm]["status"]
-        logger.info("    Найдено точное совпадение: '%s', статус: '%s'", candidate_norm, status)
-        return status
-    for name_norm, entry in anti_cheat_index.items():
-        if candidate_norm in name_norm:
-            ratio = len(candidate_norm) / len(name_norm)
-            if ratio > 0.8:
-                status = entry["status"]
-                logger.info("    Найдено частичное совпадение: кандидат '%s' в '%s' (ratio: %.2f), статус: '%s'",
-                            candidate_norm, name_norm, ratio, status)
-                return status
-    logger.info("    Античит-статус для кандидата '%s' не найден", candidate_norm)
-    return ""
+    Asynchronously loads the process-wide WeAntiCheatYet index.
+    The data is parsed once per session and reloaded after CACHE_DURATION;
+    concurrent requests made while it is loading share a single load and
+    a failed reload keeps serving the previous index.
+    Calls the callback with True if an index is available.
+    """
+    global _ANTICHEAT_CALLBACKS
+    with _ANTICHEAT_LOCK:
+        if _ANTICHEAT_INDEX is not None and time.time() - _ANTICHEAT_LOADED_AT < CACHE_DURATION:
+            ready = True
+        elif _ANTICHEAT_CALLBACKS is not None:
+            _ANTICHEAT_CALLBACKS.append(callback)
+            return
+        else:
+            ready = False
+            _ANTICHEAT_CALLBACKS = [callback]
+    if ready:
+        callback(True)
+        return
+
+    def on_anticheat_data(anti_cheat_data: list):
+        global _ANTICHEAT_INDEX, _ANTICHEAT_STATUSES, _ANTICHEAT_LOADED_AT, _ANTICHEAT_CALLBACKS
+        index, statuses = None, []
+        if anti_cheat_data:
+            try:
+                index, statuses = build_weanticheatyet_index(anti_cheat_data)
+            except Exception as e:
+                logger.error("Error building WeAntiCheatYet index: %s", e)
+        with _ANTICHEAT_LOCK:
+            if index is not None:
+                _ANTICHEAT_INDEX, _ANTICHEAT_STATUSES = index, statuses
+                _ANTICHEAT_LOADED_AT = time.time()
+            elif _ANTICHEAT_INDEX is not None:
+                logger.warning("Failed to refresh WeAntiCheatYet data, keeping the previous index")
+            available = _ANTICHEAT_INDEX is not None
+            callbacks = _ANTICHEAT_CALLBACKS or []
+            _ANTICHEAT_CALLBACKS = None
+        for cb in callbacks:
+            cb(available)
+
+    load_weanticheatyet_data_async(on_anticheat_data)
+
+def get_weanticheatyet_statuses(names: Iterable[str]) -> dict[str, str]:
+    """
+    Возвращает античит-статусы для списка названий игр по загруженному индексу:
+    сначала точное совпадение нормализованного имени, затем частичное (ratio > 0.8).
+    Для ненайденных игр (или если индекс ещё не загружен) статус — пустая строка.
+    """
+    with _ANTICHEAT_LOCK:
+        index, statuses = _ANTICHEAT_INDEX, _ANTICHEAT_STATUSES
+    normalized = {name: normalize_name(name) for name in dict.fromkeys(names)}
+    if index is None:
+        return dict.fromkeys(normalized, "")
+
+    exact = {norm: index.lookup(norm) for norm in set(normalized.values())}
+    partial = index.find_substrings((norm for norm, i in exact.items() if i is None), 0.8)
+    result = {}
+    for name, norm in normalized.items():
+        i = exact[norm]
+        if i is None:
+            i = partial[norm]
+        result[name] = statuses[index.value(i)] if i is not None else ""
+    logger.info("Античит-статусы: %d игр, найдено %d", len(result), sum(1 for status in result.values() if status))
+    return result
+
+async def resolve_weanticheatyet_statuses(names: list[str]) -> dict[str, str]:
+    """Waits for the WeAntiCheatYet index and resolves statuses for all names at once."""
+    await network.from_callback(load_weanticheatyet_index_async)
+    return await network.run_blocking(get_weanticheatyet_statuses, names)
+
+def get_weanticheatyet_statuses_async(names: list[str], callback: Callable[[dict[str, str]], None]):
+    """
+    Asynchronously resolves WeAntiCheatYet statuses for many games at once.
+    Calls the callback with a {name: status} dictionary, empty status if not found.
+    """
+    network.submit(resolve_weanticheatyet_statuses(names), callback, default=dict.fromkeys(names, ""))
 
 def get_weanticheatyet_status_async(game_name: str, callback: Callable[[str], None]):
     """
     Asynchronously retrieves WeAntiCheatYet status for a game by name.
     Calls the callback with the status string or empty string if not found.
     """
-    def on_anticheat_data(anti_cheat_data: list):
-        anti_cheat_index = build_weanticheatyet_index(anti_cheat_data)
-        status = search_anticheat_status(game_name, anti_cheat_index)
-        callback(status)
+    get_weanticheatyet_statuses_async([game_name], lambda statuses: callback(statuses.get(game_name, "")))
 
-    load_weanticheatyet_data_async(on_anticheat_data)
+class ProtonDBNotifier(QObject):
+    """Сообщает об обновлении рейтинга ProtonDB после фонового запроса."""
+    tier_updated = Signal(str, str)  # appid, tier
+
+protondb_notifier = ProtonDBNotifier()
 
 def load_protondb_status(appid):
-    """Загружает закешированные данные ProtonDB для игры по appid, если они не устарели."""
-    cache_dir = get_cache_dir()
-    cache_file = os.path.join(cache_dir, f"protondb_{appid}.json")
-    if os.path.exists(cache_file):
-        if time.time() - os.path.getmtime(cache_file) < CACHE_DURATION:
-            try:
-                with open(cache_file, "rb") as f:
-                    return orjson.loads(f.read())
-            except Exception as e:
-                logger.error("Ошибка загрузки кеша ProtonDB для appid %s: %s", appid, e)
+    """
+    Загружает последний известный рейтинг ProtonDB для игры по appid вместе с его возрастом в секундах.
+    Данные из старых файлов protondb_{appid}.json переносятся в общее хранилище.
+    """
+    store = get_metadata_store()
+    entry = store.get_with_age("protondb", appid)
+    if entry is not None:
+        return entry
+    legacy_file = os.path.join(get_cache_dir(), f"protondb_{appid}.json")
+    if os.path.exists(legacy_file):
+        try:
+            age = time.time() - os.path.getmtime(legacy_file)
+            with open(legacy_file, "rb") as f:
+                data = orjson.loads(f.read())
+            store.put("protondb", appid, data)
+            os.remove(legacy_file)
+            return data, age
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.error("Ошибка загрузки кеша ProtonDB для appid %s: %s", appid, e)
     return None
 
 def save_protondb_status(appid, data):
-    """Сохраняет данные ProtonDB для игры по appid в файл кэша."""
-    cache_dir = get_cache_dir()
-    cache_file = os.path.join(cache_dir, f"protondb_{appid}.json")
-    try:
-        with open(cache_file, "wb") as f:
-            f.write(orjson.dumps(data))
-    except Exception as e:
-        logger.error("Ошибка сохранения кеша ProtonDB для appid %s: %s", appid, e)
+    """Сохраняет данные ProtonDB для игры по appid в общее хранилище метаданных."""
+    get_metadata_store().put("protondb", appid, data)
 
-def get_protondb_tier_async(appid: int, callback: Callable[[str], None]):
+def _fetch_protondb_tier(appid: int) -> str | None:
     """
-    Asynchronously fetches ProtonDB tier for an app.
-    Calls the callback with the tier string or empty string if failed.
+    Запрашивает рейтинг ProtonDB, сохраняет его и оповещает об изменении через protondb_notifier.
+    Для игр без отчётов (404) сохраняется пустой рейтинг, чтобы не запрашивать их при каждом запуске.
     """
-    cached = load_protondb_status(appid)
-    if cached is not None:
-        callback(cached.get("tier", ""))
-        return
-
+    if not downloader.has_internet():
+        return None
     url = f"https://www.protondb.com/api/v1/reports/summaries/{appid}.json"
-    cache_dir = get_cache_dir()
-    cache_file = os.path.join(cache_dir, f"protondb_{appid}.json")
-
-    def process_response(result: str | None):
-        if not result or not os.path.exists(result):
-            logger.info("Failed to download ProtonDB data for appid %s", appid)
-            callback("")
-            return
-        try:
-            with open(result, "rb") as f:
-                data = orjson.loads(f.read())
-            filtered_data = {"tier": data.get("tier", "")}
-            save_protondb_status(appid, filtered_data)
-            callback(filtered_data["tier"])
-        except Exception as e:
-            logger.info("Failed to process ProtonDB data for appid %s: %s", appid, e)
-            callback("")
-
-    downloader.download_async(url, cache_file, timeout=5, callback=process_response)
+    try:
+        response = get_download_engine().session_for(url).get(url, timeout=5)
+        if response.status_code == 404:
+            tier = ""
+        else:
+            response.raise_for_status()
+            tier = orjson.loads(response.content).get("tier", "")
+    except (requests.RequestException, orjson.JSONDecodeError, AttributeError) as e:
+        logger.info("Failed to fetch ProtonDB data for appid %s: %s", appid, e)
+        return None
+    previous = load_protondb_status(appid)
+    save_protondb_status(appid, {"tier": tier})
+    if previous is None or previous[0].get("tier", "") != tier:
+        logger.info("ProtonDB tier for appid %s updated: '%s'", appid, tier)
+        protondb_notifier.tier_updated.emit(str(appid), tier)
+    return tier
+
+_PROTONDB_SCHEDULER: RequestScheduler[int, str] = RequestScheduler(
+    _fetch_protondb_tier, "protondb", max_workers=2, rate=4.0, burst=8
+)
 
-def get_full_steam_game_info_async(appid: int, callback: Callable[[dict], None]):
+def get_protondb_tier(appid: int) -> str:
     """
-    Asynchronously retrieves full Steam game info, including WeAntiCheatYet status.
-    Calls the callback with the game info dictionary.
+    Returns the last known ProtonDB tier for an app without waiting for the network.
+    Missing or stale (older than CACHE_DURATION) entries are refreshed by a bounded
+    background scheduler; changed tiers are announced via protondb_notifier.tier_updated.
+    Returns an empty string if the tier is not known yet.
     """
-    def on_app_info(app_info: dict | None):
-        if not app_info:
-            callback({})
-            return
-        title = decode_text(app_info.get("name", ""))
-        description = decode_text(app_info.get("short_description", ""))
-        cover = f"https://steamcdn-a.akamaihd.net/steam/apps/{appid}/library_600x900_2x.jpg"
-
-        def on_protondb_tier(tier: str):
-            def on_anticheat_status(anticheat_status: str):
-                callback({
-                    'description': description,
-                    'controller_support': app_info.get('controller_support', ''),
-                    'cover': cover,
-                    'protondb_tier': tier,
-                    'steam_game': "true",
-                    'name': title,
-                    'anticheat_status': anticheat_status
-                })
-
-            get_weanticheatyet_status_async(title, on_anticheat_status)
-
-        get_protondb_tier_async(appid, on_protondb_tier)
+    try:
+        entry = load_protondb_status(appid)
+    except Exception as e:
+        logger.error("Ошибка загрузки кеша ProtonDB для appid %s: %s", appid, e)
+        entry = None
+    if entry is None or entry[1] >= CACHE_DURATION:
+        _PROTONDB_SCHEDULER.submit(int(appid))
+    return entry[0].get("tier", "") if entry is not None else ""
 
-    fetch_app_info_async(appid, on_app_info)
+def get_protondb_tier_async(appid: int, callback: Callable[[str], None]):
+    """
+    Calls the callback with the last known ProtonDB tier, see get_protondb_tier.
+    """
+    callback(get_protondb_tier(appid))
 
-def get_steam_game_info_async(desktop_name: str, exec_line: str, callback: Callable[[dict], tuple[bool, str] | None]) -> None:
+async def get_full_steam_game_info(appid: int, with_anticheat: bool = True) -> dict:
     """
-    Asynchronously retrieves game info based on desktop name and exec line, including WeAntiCheatYet status for all games.
+    Retrieves full Steam game info, including WeAntiCheatYet status.
+    With with_anticheat=False the status is left empty so that the caller can
+    resolve it for many games at once with get_weanticheatyet_statuses_async.
+    Returns an empty dictionary if the app info is unavailable.
+    """
+    app_info = await fetch_app_info(appid)
+    if not app_info:
+        return {}
+    title = decode_text(app_info.get("name", ""))
+    info = {
+        'description': decode_text(app_info.get("short_description", "")),
+        'controller_support': app_info.get('controller_support', ''),
+        'cover': f"https://steamcdn-a.akamaihd.net/steam/apps/{appid}/library_600x900_2x.jpg",
+        'protondb_tier': await network.run_blocking(get_protondb_tier, appid),
+        'steam_game': "true",
+        'name': title,
+        'anticheat_status': ""
+    }
+    if with_anticheat:
+        info['anticheat_status'] = (await resolve_weanticheatyet_statuses([title]))[title]
+    return info
+
+def get_full_steam_game_info_async(appid: int, callback: Callable[[dict], None], with_anticheat: bool = True):
+    """
+    Asynchronously retrieves full Steam game info, see get_full_steam_game_info.
     Calls the callback with the game info dictionary.
     """
+    network.submit(get_full_steam_game_info(appid, with_anticheat), callback, default={})
+
+def _resolve_game_exe(exec_line: str) -> str:
+    """Возвращает путь к exe игры из строки запуска, в том числе для запуска через .bat файл."""
     parts = shlex.split(exec_line)
     game_exe = parts[-1] if parts else exec_line
 
@@ -620,10 +861,13 @@ def get_steam_game_info_async(desktop_name: str, exec_line: str, callback: Calla
 
     if not game_exe.lower().endswith('.exe'):
         logger.error("Invalid executable path: %s. Expected .exe", game_exe)
-        meta_data = {}
-    else:
-        meta_data = get_exiftool_data(game_exe)
+    return game_exe
 
+def _collect_steam_candidates(desktop_name: str, game_exe: str, meta_data: dict) -> tuple[list[str], str]:
+    """
+    Собирает кандидатов для поиска игры в Steam по имени ярлыка, полям версии exe,
+    имени exe и папки игры. Возвращает кандидатов по убыванию числа слов и имя exe.
+    """
     exe_name = os.path.splitext(os.path.basename(game_exe))[0]
     folder_path = os.path.dirname(game_exe)
     folder_name = os.path.basename(folder_path)
@@ -650,102 +894,76 @@ def get_steam_game_info_async(desktop_name: str, exec_line: str, callback: Calla
     candidates_ordered = sorted(candidates, key=lambda s: len(s.split()), reverse=True)
     logger.info("Sorted candidates: %s", candidates_ordered)
 
-    def on_steam_apps(steam_apps: list):
-        steam_apps_index = build_index(steam_apps)
-        matching_app = None
-        for candidate in candidates_ordered:
-            if not candidate:
-                continue
-            matching_app = search_app(candidate, steam_apps_index)
-            if matching_app:
-                logger.info("Match found for candidate '%s': %s", candidate, matching_app.get("normalized_name"))
-                break
-
-        game_name = desktop_name or exe_name.capitalize()
-
-        if not matching_app:
-            def on_anticheat_status(anticheat_status: str):
-                callback({
-                    "appid": "",
-                    "name": decode_text(game_name),
-                    "description": "",
-                    "cover": "",
-                    "controller_support": "",
-                    "protondb_tier": "",
-                    "steam_game": "false",
-                    "anticheat_status": anticheat_status
-                })
-
-            get_weanticheatyet_status_async(game_name, on_anticheat_status)
-            return
+    return candidates_ordered, exe_name
 
+async def get_steam_game_info(desktop_name: str, exec_line: str, with_anticheat: bool = True) -> dict:
+    """
+    Retrieves game info based on desktop name and exec line, including WeAntiCheatYet status for all games.
+    With with_anticheat=False the status is left empty and should be resolved
+    by the caller for the returned "name" with get_weanticheatyet_statuses_async.
+    "lookup_complete" is False when the Steam apps index or the app details could not
+    be loaded (e.g. offline), so the result should not be cached as a final answer.
+    """
+    game_exe = await network.run_blocking(_resolve_game_exe, exec_line)
+    meta_data = await get_exe_metadata(game_exe) if game_exe.lower().endswith('.exe') else {}
+    candidates_ordered, exe_name = _collect_steam_candidates(desktop_name, game_exe, meta_data)
+    steam_apps_index: NameIndex | None = await network.from_callback(load_steam_app_index_async)
+    matching_app = None
+    if steam_apps_index is not None:
+        matching_app = await network.run_blocking(find_steam_app, candidates_ordered, steam_apps_index)
+        if matching_app:
+            logger.info("Match found for candidates %s: %s", candidates_ordered, matching_app.get("normalized_name"))
+
+    game_name = desktop_name or exe_name.capitalize()
+    info = {
+        "appid": "",
+        "name": decode_text(game_name),
+        "description": "",
+        "cover": "",
+        "controller_support": "",
+        "protondb_tier": "",
+        "steam_game": "false",
+        "anticheat_status": "",
+        "lookup_complete": steam_apps_index is not None
+    }
+    anticheat_name = game_name
+
+    app_info = await fetch_app_info(matching_app["appid"]) if matching_app else None
+    if matching_app and app_info:
         appid = matching_app["appid"]
-        def on_app_info(app_info: dict | None):
-            if not app_info:
-                def on_anticheat_status(anticheat_status: str):
-                    callback({
-                        "appid": "",
-                        "name": decode_text(game_name),
-                        "description": "",
-                        "cover": "",
-                        "controller_support": "",
-                        "protondb_tier": "",
-                        "steam_game": "false",
-                        "anticheat_status": anticheat_status
-                    })
-
-                get_weanticheatyet_status_async(game_name, on_anticheat_status)
-                return
-
-            title = decode_text(app_info.get("name", game_name))
-            description = decode_text(app_info.get("short_description", ""))
-            cover = f"https://steamcdn-a.akamaihd.net/steam/apps/{appid}/library_600x900_2x.jpg"
-            controller_support = app_info.get("controller_support", "")
-
-            def on_protondb_tier(tier: str):
-                def on_anticheat_status(anticheat_status: str):
-                    callback({
-                        "appid": appid,
-                        "name": title,
-                        "description": description,
-                        "cover": cover,
-                        "controller_support": controller_support,
-                        "protondb_tier": tier,
-                        "steam_game": "true",
-                        "anticheat_status": anticheat_status
-                    })
-
-                get_weanticheatyet_status_async(title, on_anticheat_status)
-
-            get_protondb_tier_async(appid, on_protondb_tier)
-
-        fetch_app_info_async(appid, on_app_info)
-
-    load_steam_apps_async(on_steam_apps)
-
-_STEAM_APPS = None
-_STEAM_APPS_INDEX = None
-_STEAM_APPS_LOCK = threading.Lock()
-
-def get_steam_apps_and_index_async(callback: Callable[[tuple[list, dict]], None]):
-    """
-    Asynchronously loads and caches Steam apps and their index.
-    Calls the callback with (steam_apps, steam_apps_index).
-    """
-    global _STEAM_APPS, _STEAM_APPS_INDEX
-    with _STEAM_APPS_LOCK:
-        if _STEAM_APPS is not None and _STEAM_APPS_INDEX is not None:
-            callback((_STEAM_APPS, _STEAM_APPS_INDEX))
-            return
-
-    def on_steam_apps(steam_apps: list):
-        global _STEAM_APPS, _STEAM_APPS_INDEX
-        with _STEAM_APPS_LOCK:
-            _STEAM_APPS = steam_apps
-            _STEAM_APPS_INDEX = build_index(steam_apps)
-            callback((_STEAM_APPS, _STEAM_APPS_INDEX))
+        title = decode_text(app_info.get("name", game_name))
+        info.update({
+            "appid": appid,
+            "name": title,
+            "description": decode_text(app_info.get("short_description", "")),
+            "cover": f"https://steamcdn-a.akamaihd.net/steam/apps/{appid}/library_600x900_2x.jpg",
+            "controller_support": app_info.get("controller_support", ""),
+            "protondb_tier": await network.run_blocking(get_protondb_tier, appid),
+            "steam_game": "true"
+        })
+        anticheat_name = title
+    elif matching_app:
+        info["lookup_complete"] = False
+
+    if with_anticheat:
+        info["anticheat_status"] = (await resolve_weanticheatyet_statuses([anticheat_name]))[anticheat_name]
+    return info
+
+def get_steam_game_info_async(desktop_name: str, exec_line: str, callback: Callable[[dict], tuple[bool, str] | None],
+                              with_anticheat: bool = True) -> None:
+    """
+    Asynchronously retrieves game info based on desktop name and exec line, see get_steam_game_info.
+    Calls the callback with the game info dictionary.
+    """
+    network.submit(get_steam_game_info(desktop_name, exec_line, with_anticheat), callback, default={})
 
-    load_steam_apps_async(on_steam_apps)
+def get_steam_apps_and_index_async(callback: Callable[[NameIndex | None], None]):
+    """
+    Asynchronously returns the shared Steam apps index.
+    The memory-mapped index serves both as the apps list and the name lookup,
+    so it is the same object used by get_steam_game_info_async.
+    """
+    load_steam_app_index_async(callback)
 
 def add_to_steam(game_name: str, exec_line: str, cover_path: str) -> tuple[bool, str]:
     """
@@ -7,6 +7,9 @@ current_theme_name = read_theme_from_config()
 # КОНСТАНТЫ
 favoriteLabelSize = 48, 48
 pixmapsScaledSize = 60, 60
+# Тень карточки игры: цвет (R, G, B, A) и радиус размытия
+gameCardShadowColor = 0, 0, 0, 60
+gameCardShadowBlurRadius = 20
 
 # СТИЛЬ ШАПКИ ГЛАВНОГО ОКНА
 MAIN_WINDOW_HEADER_STYLE = """
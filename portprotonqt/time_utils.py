@@ -1,5 +1,9 @@
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, timedelta
+import numpy as np
+from babel import Locale
+from babel.core import UnknownLocaleError
 from babel.dates import format_timedelta, format_date
 from portprotonqt.config_utils import read_time_config
 from portprotonqt.localization import _, get_system_locale
@@ -7,29 +11,78 @@ from portprotonqt.logger import get_logger
 
 logger = get_logger(__name__)
 
+_LOCK = threading.Lock()
+# Время последнего запуска по имени exe и сигнатура файла, из которого оно прочитано
+_last_launches: dict[str, datetime] = {}
+_last_launch_lines = 0
+_last_launch_signature = None
+# Время в игре по имени exe (без расширения) для каждого файла статистики: путь -> (сигнатура, данные)
+_playtimes: dict[str, tuple[tuple[int, int] | None, dict[str, int]]] = {}
+
+def _file_signature(path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 def get_cache_file_path():
     """Возвращает путь к файлу кеша portproton_last_launch."""
     cache_home = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
     return os.path.join(cache_home, "PortProtonQT", "last_launch")
 
-def save_last_launch(exe_name, launch_time):
+def _load_last_launches() -> dict[str, datetime]:
     """
-    Сохраняет время запуска для exe.
-    Формат файла: <exe_name> <isoformatted_time>
+    Возвращает время последних запусков по имени exe. Файл перечитывается,
+    только если изменились его mtime или размер. Вызывается под _LOCK.
     """
+    global _last_launches, _last_launch_lines, _last_launch_signature
     file_path = get_cache_file_path()
+    signature = _file_signature(file_path)
+    if signature == _last_launch_signature:
+        return _last_launches
     data = {}
-    if os.path.exists(file_path):
+    lines = 0
+    if signature is not None:
         with open(file_path, encoding="utf-8") as f:
             for line in f:
                 parts = line.strip().split(maxsplit=1)
-                if len(parts) == 2:
-                    data[parts[0]] = parts[1]
-    data[exe_name] = launch_time.isoformat()
+                if len(parts) != 2:
+                    continue
+                lines += 1
+                try:
+                    # Файл дописывается в конец, поэтому более поздняя запись новее
+                    data[parts[0]] = datetime.fromisoformat(parts[1])
+                except ValueError:
+                    logger.warning("Некорректное время запуска для %s: %s", parts[0], parts[1])
+    _last_launches, _last_launch_lines, _last_launch_signature = data, lines, signature
+    return _last_launches
+
+def save_last_launch(exe_name, launch_time):
+    """
+    Сохраняет время запуска для exe.
+    Формат файла: <exe_name> <isoformatted_time>
+    Запись дописывается в конец файла; когда устаревших строк становится больше,
+    чем актуальных, файл атомарно переписывается без них.
+    """
+    global _last_launch_lines, _last_launch_signature
+    file_path = get_cache_file_path()
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        for key, iso_time in data.items():
-            f.write(f"{key} {iso_time}\n")
+    with _LOCK:
+        data = _load_last_launches()
+        data[exe_name] = launch_time
+        if _last_launch_lines + 1 > 2 * len(data):
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, launched in data.items():
+                    f.write(f"{key} {launched.isoformat()}\n")
+            os.replace(tmp_path, file_path)
+            _last_launch_lines = len(data)
+        else:
+            with open(file_path, "a", encoding="utf-8") as f:
+                f.write(f"{exe_name} {launch_time.isoformat()}\n")
+            _last_launch_lines += 1
+        _last_launch_signature = _file_signature(file_path)
 
 def format_last_launch(launch_time):
     """
@@ -40,33 +93,18 @@ def format_last_launch(launch_time):
     Для "brief" – дату в формате "день месяц год" (например, "1 апреля 2023")
     на основе системной локали.
     """
-    detail_level = read_time_config() or "detailed"
-    system_locale = get_system_locale()
-    if detail_level == "detailed":
-        # Вычисляем delta как launch_time - datetime.now() чтобы получить отрицательное значение для прошедшего времени.
-        delta = launch_time - datetime.now()
-        if abs(delta.total_seconds()) < 60:
-            return _("just now")
-        return format_timedelta(delta, locale=system_locale, granularity='second', format='short', add_direction=True)
-    else:
-        return format_date(launch_time, format="d MMMM yyyy", locale=system_locale)
+    return time_formatter.format_last_launch(launch_time)
 
 def get_last_launch(exe_name):
     """
     Читает время последнего запуска для заданного exe из файла кеша.
     Возвращает время запуска в нужном формате или перевод строки "Never".
     """
-    file_path = get_cache_file_path()
-    if not os.path.exists(file_path):
+    with _LOCK:
+        launch_time = _load_last_launches().get(exe_name)
+    if launch_time is None:
         return _("Never")
-    with open(file_path, encoding="utf-8") as f:
-        for line in f:
-            parts = line.strip().split(maxsplit=1)
-            if len(parts) == 2 and parts[0] == exe_name:
-                iso_time = parts[1]
-                launch_time = datetime.fromisoformat(iso_time)
-                return format_last_launch(launch_time)
-    return _("Never")
+    return format_last_launch(launch_time)
 
 def parse_playtime_file(file_path):
     """
@@ -98,6 +136,26 @@ def parse_playtime_file(file_path):
             playtime_data[exe_path] = seconds
     return playtime_data
 
+def get_exe_playtimes(file_path) -> dict[str, int]:
+    """
+    Возвращает время в игре из файла статистики PortProton по имени exe
+    (имя файла до первой точки, при совпадении имён берётся первая запись).
+    Файл разбирается один раз и перечитывается только после изменения.
+    """
+    signature = _file_signature(file_path)
+    with _LOCK:
+        cached = _playtimes.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        playtimes: dict[str, int] = {}
+        try:
+            for exe_path, seconds in parse_playtime_file(file_path).items():
+                playtimes.setdefault(os.path.basename(exe_path).split('.')[0], seconds)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to parse playtime data: %s", e)
+        _playtimes[file_path] = (signature, playtimes)
+        return playtimes
+
 def format_playtime(seconds):
     """
     Конвертирует время в секундах в форматированную строку с использованием Babel.
@@ -109,51 +167,139 @@ def format_playtime(seconds):
       - если время менее часа, выводится точное время с секундами (например, "9 мин 28 сек"),
       - если больше часа – только часы (например, "3 ч").
     """
-    detail_level = read_time_config() or "detailed"
-    system_locale = get_system_locale()
-    seconds = int(seconds)
-
-    if detail_level == "detailed":
-        days, rem = divmod(seconds, 86400)
-        hours, rem = divmod(rem, 3600)
-        minutes, secs = divmod(rem, 60)
-        parts = []
-        if days > 0:
-            parts.append(f"{days} " + _("d."))
-        if hours > 0:
-            parts.append(f"{hours} " + _("h."))
-        if minutes > 0:
-            parts.append(f"{minutes} " + _("min."))
-        if secs > 0 or not parts:
-            parts.append(f"{secs} " + _("sec."))
-        return " ".join(parts)
-    else:
-        # Режим brief
-        if seconds < 3600:
-            minutes, secs = divmod(seconds, 60)
+    return time_formatter.format_playtime(seconds)
+
+def get_last_launch_timestamp(exe_name):
+    """
+    Возвращает метку времени последнего запуска (timestamp) для заданного exe.
+    Если записи нет, возвращает 0.
+    """
+    with _LOCK:
+        launch_time = _load_last_launches().get(exe_name)
+    return launch_time.timestamp() if launch_time is not None else 0
+
+# Единицы, по которым Babel выбирает вид относительного времени (как babel.dates.TIMEDELTA_UNITS)
+_RELATIVE_UNITS = (
+    ("year", 3600 * 24 * 365),
+    ("month", 3600 * 24 * 30),
+    ("week", 3600 * 24 * 7),
+    ("day", 3600 * 24),
+    ("hour", 3600),
+    ("minute", 60),
+    ("second", 1),
+)
+_RELATIVE_THRESHOLD = 0.85  # порог format_timedelta по умолчанию
+
+class TimeFormatter:
+    """
+    Форматирование времени в игре и последнего запуска. Уровень детализации и локаль
+    определяются один раз (до reload_settings), результаты запоминаются: время в игре —
+    по числу секунд (в кратком режиме — по часам), относительное время — по единице
+    и округлённому значению, которые Babel выводит для разницы, дата — по дню.
+    """
+
+    def __init__(self):
+        self._settings: tuple[str, Locale] | None = None
+        self._playtimes: dict[int, str] = {}
+        self._relative: dict[tuple[str, int, bool], str] = {}
+        self._dates: dict[date, str] = {}
+
+    def reload_settings(self):
+        """Перечитывает уровень детализации и локаль и сбрасывает запомненные строки."""
+        self._settings = None
+        self._playtimes.clear()
+        self._relative.clear()
+        self._dates.clear()
+
+    def _resolve(self) -> tuple[str, Locale]:
+        settings = self._settings
+        if settings is None:
+            detail_level = read_time_config() or "detailed"
+            try:
+                system_locale = Locale.parse(get_system_locale())
+            except (ValueError, UnknownLocaleError) as e:
+                logger.warning("Не удалось определить локаль для форматирования времени: %s", e)
+                system_locale = Locale.parse("en")
+            settings = self._settings = (detail_level, system_locale)
+        return settings
+
+    @property
+    def detail_level(self) -> str:
+        return self._resolve()[0]
+
+    def format_last_launch(self, launch_time: datetime) -> str:
+        detail_level, system_locale = self._resolve()
+        if detail_level != "detailed":
+            day = launch_time.date()
+            text = self._dates.get(day)
+            if text is None:
+                text = self._dates[day] = format_date(launch_time, format="d MMMM yyyy", locale=system_locale)
+            return text
+        # Вычисляем delta как launch_time - datetime.now() чтобы получить отрицательное значение для прошедшего времени.
+        delta = launch_time - datetime.now()
+        seconds = delta.total_seconds()
+        if abs(seconds) < 60:
+            return _("just now")
+        key = None
+        for unit, unit_seconds in _RELATIVE_UNITS:
+            value = abs(seconds) / unit_seconds
+            if value >= _RELATIVE_THRESHOLD:
+                key = (unit, max(1, round(value)), seconds < 0)
+                break
+        text = self._relative.get(key) if key is not None else None
+        if text is None:
+            text = format_timedelta(delta, locale=system_locale, granularity='second', format='short', add_direction=True)
+            if key is not None:
+                self._relative[key] = text
+        return text
+
+    def format_playtime(self, seconds) -> str:
+        detail_level, system_locale = self._resolve()
+        seconds = int(seconds)
+        # В кратком режиме время от часа выводится только в часах
+        key = seconds if detail_level == "detailed" or seconds < 3600 else -(seconds // 3600)
+        text = self._playtimes.get(key)
+        if text is None:
+            text = self._playtimes[key] = self._format_playtime(seconds, detail_level, system_locale)
+        return text
+
+    def format_many(self, seconds_list) -> list[str]:
+        """Форматирует время в игре для списка значений, вычисляя каждую строку один раз."""
+        values = np.asarray(seconds_list, dtype=np.int64)
+        if values.size == 0:
+            return []
+        unique, inverse = np.unique(values, return_inverse=True)
+        texts = np.array([self.format_playtime(int(v)) for v in unique], dtype=object)
+        return texts[inverse.reshape(-1)].tolist()
+
+    @staticmethod
+    def _format_playtime(seconds: int, detail_level: str, system_locale: Locale) -> str:
+        if detail_level == "detailed":
+            days, rem = divmod(seconds, 86400)
+            hours, rem = divmod(rem, 3600)
+            minutes, secs = divmod(rem, 60)
             parts = []
+            if days > 0:
+                parts.append(f"{days} " + _("d."))
+            if hours > 0:
+                parts.append(f"{hours} " + _("h."))
             if minutes > 0:
                 parts.append(f"{minutes} " + _("min."))
             if secs > 0 or not parts:
                 parts.append(f"{secs} " + _("sec."))
             return " ".join(parts)
         else:
-            hours = seconds // 3600
-            return format_timedelta(timedelta(hours=hours), locale=system_locale, granularity='hour', format='short')
+            # Режим brief
+            if seconds < 3600:
+                minutes, secs = divmod(seconds, 60)
+                parts = []
+                if minutes > 0:
+                    parts.append(f"{minutes} " + _("min."))
+                if secs > 0 or not parts:
+                    parts.append(f"{secs} " + _("sec."))
+                return " ".join(parts)
+            else:
+                hours = seconds // 3600
+                return format_timedelta(timedelta(hours=hours), locale=system_locale, granularity='hour', format='short')
 
-def get_last_launch_timestamp(exe_name):
-    """
-    Возвращает метку времени последнего запуска (timestamp) для заданного exe.
-    Если записи нет, возвращает 0.
-    """
-    file_path = get_cache_file_path()
-    if not os.path.exists(file_path):
-        return 0
-    with open(file_path, encoding="utf-8") as f:
-        for line in f:
-            parts = line.strip().split(maxsplit=1)
-            if len(parts) == 2 and parts[0] == exe_name:
-                iso_time = parts[1]
-                dt = datetime.fromisoformat(iso_time)
-                return dt.timestamp()
-    return 0
+time_formatter = TimeFormatter()
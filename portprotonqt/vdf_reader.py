@@ -0,0 +1,229 @@
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import vdf
+
+# Чтение VDF (KeyValues) файлов Steam.
+# Формат определяется по первым байтам: бинарный VDF (shortcuts.vdf, appinfo.vdf) начинается
+# с байта типа узла (0x00 — вложенный блок), текстовый (appmanifest_*.acf, localconfig.vdf,
+# libraryfolders.vdf, loginusers.vdf) — с пробелов, BOM, комментария или ключа.
+# Текстовый формат разбирается потоком лексем, поэтому нужные ключи можно прочитать,
+# не разбирая остаток файла.
+
+# Байты типов узлов бинарного VDF, которые не могут начинать текстовый файл
+# (0x0A — тип int64 — совпадает с переводом строки и не используется первым узлом)
+_BINARY_TYPE_BYTES = frozenset(range(0x00, 0x09)) | {0x0B}
+_UTF8_BOM = "\ufeff"
+
+# Лексемы текстового VDF: строка в кавычках, скобка блока, комментарий, условие вида [$WIN32]
+# или строка без кавычек. Пробелы между лексемами пропускаются re.finditer.
+_TOKEN_RE = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|([{}])|//[^\n]*|\[[^\]\n]*\]|([^\s{}"]+)')
+_ESCAPES = {"n": "\n", "t": "\t", "v": "\v", "b": "\b", "r": "\r", "f": "\f", "a": "\a",
+            "\\": "\\", "?": "?", '"': '"', "'": "'"}
+_ESCAPE_RE = re.compile(r"\\(.)")
+# Всё до следующей скобки блока вне строк и комментариев: пропускаемый блок
+# проходится одним вызовом регулярного выражения на каждую скобку, без разбора лексем
+_SKIP_RE = re.compile(r'[^{}"/]*(?:(?:"[^"\\]*(?:\\.[^"\\]*)*"|//[^\n]*|/)[^{}"/]*)*')
+
+# Виды лексем
+STRING = 0
+OPEN = 1
+CLOSE = 2
+
+
+class VDFSyntaxError(ValueError):
+    """Нарушена структура текстового VDF (лишняя или незакрытая скобка, блок без ключа)."""
+
+
+def is_binary(head: bytes) -> bool:
+    """Определяет по первым байтам файла, что он записан в бинарном формате VDF."""
+    return bool(head) and head[0] in _BINARY_TYPE_BYTES
+
+
+def _unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), text)
+
+
+def iter_tokens(text: str, pos: int = 0) -> Iterator[tuple[int, str]]:
+    """
+    Возвращает лексемы текстового VDF начиная с позиции pos: (STRING, строка) для ключей
+    и значений, (OPEN, "{") и (CLOSE, "}") для скобок блоков. Комментарии и условия пропускаются.
+    """
+    for match in _TOKEN_RE.finditer(text, pos):
+        quoted, bracket, bare = match.groups()
+        if bracket is not None:
+            yield (OPEN if bracket == "{" else CLOSE), bracket
+        elif quoted is not None:
+            yield STRING, _unescape(quoted)
+        elif bare is not None:
+            yield STRING, bare
+
+
+def _decode(data: bytes) -> str:
+    text = data.decode("utf-8", errors="ignore")
+    return text[1:] if text.startswith(_UTF8_BOM) else text
+
+
+def loads_text(text: str) -> dict:
+    """
+    Разбирает текстовый VDF в словари. Как и vdf.loads, блоки с повторяющимся
+    ключом объединяются, а повторяющиеся значения перезаписываются.
+    """
+    return _parse(text, 0, in_block=False)
+
+
+def _parse(text: str, pos: int, in_block: bool) -> dict:
+    """
+    Разбирает лексемы с позиции pos. С in_block=True pos указывает внутрь блока,
+    и разбор заканчивается на закрывающей его скобке.
+    """
+    root: dict = {}
+    stack = [root]
+    key = None
+    for kind, token in iter_tokens(text, pos):
+        if kind == OPEN:
+            if key is None:
+                raise VDFSyntaxError("Block without a key")
+            block = stack[-1].get(key)
+            if not isinstance(block, dict):
+                block = stack[-1][key] = {}
+            stack.append(block)
+            key = None
+        elif kind == CLOSE:
+            if len(stack) == 1:
+                if in_block:
+                    return root
+                raise VDFSyntaxError("Unexpected closing bracket")
+            stack.pop()
+            key = None
+        elif key is None:
+            key = token
+        else:
+            stack[-1][key] = token
+            key = None
+    if len(stack) != 1 or in_block:
+        raise VDFSyntaxError("Unclosed block")
+    return root
+
+
+def loads(data: bytes) -> dict:
+    """Разбирает содержимое VDF файла, выбирая бинарный или текстовый формат по первым байтам."""
+    if is_binary(data[:1]):
+        return vdf.binary_loads(data)
+    return loads_text(_decode(data))
+
+
+def load(path: str | Path) -> dict:
+    """Читает VDF файл целиком (формат определяется по содержимому)."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def read_values(path: str | Path, section: Iterable[str], keys: Iterable[str]) -> dict[str, str]:
+    """
+    Возвращает строковые значения keys из блока section (путь ключей от корня) текстового VDF.
+    Разбор останавливается, как только найдены все ключи или блок закрыт; вложенные блоки
+    внутри пути пропускаются без создания словарей. Для бинарных файлов блок берётся
+    из полного разбора.
+    """
+    section = tuple(section)
+    wanted = set(keys)
+    with open(path, "rb") as f:
+        data = f.read()
+    if is_binary(data[:1]):
+        node = vdf.binary_loads(data)
+        for name in section:
+            node = node.get(name) if isinstance(node, dict) else None
+        if not isinstance(node, dict):
+            return {}
+        return {k: v for k, v in node.items() if k in wanted and isinstance(v, str)}
+
+    found: dict[str, str] = {}
+    depth = 0  # глубина вложенности блоков
+    matched = 0  # сколько первых блоков пути совпало с section
+    key = None
+    for kind, token in iter_tokens(_decode(data)):
+        if kind == OPEN:
+            if matched == depth and matched < len(section) and key == section[matched]:
+                matched += 1
+            depth += 1
+            key = None
+        elif kind == CLOSE:
+            if matched == depth and matched == len(section):
+                break  # блок section закончился
+            depth -= 1
+            matched = min(matched, depth)
+            key = None
+        elif key is None:
+            key = token
+        else:
+            if matched == depth == len(section) and key in wanted:
+                found[key] = token
+                if len(found) == len(wanted):
+                    break
+            key = None
+    return found
+
+
+def _skip_block(text: str, pos: int) -> int:
+    """Возвращает позицию после скобки, закрывающей блок, который начинается с позиции pos."""
+    depth = 1
+    while True:
+        pos = _SKIP_RE.match(text, pos).end()
+        if pos >= len(text) or text[pos] not in "{}":
+            raise VDFSyntaxError("Unclosed block")
+        depth += 1 if text[pos] == "{" else -1
+        pos += 1
+        if depth == 0:
+            return pos
+
+
+def read_section(path: str | Path, section: Iterable[str]) -> dict:
+    """
+    Возвращает блок section (путь ключей от корня) VDF файла в виде словарей.
+    В текстовом файле разбирается только этот блок: блоки вне пути пропускаются
+    без разбора лексем и создания словарей. Если блока нет, возвращает {}.
+    """
+    section = tuple(section)
+    with open(path, "rb") as f:
+        data = f.read()
+    if is_binary(data[:1]):
+        node = vdf.binary_loads(data)
+        for name in section:
+            node = node.get(name) if isinstance(node, dict) else None
+        return node if isinstance(node, dict) else {}
+
+    text = _decode(data)
+    if not section:
+        return loads_text(text)
+    pos = 0
+    matched = 0  # сколько первых блоков пути пройдено
+    key = None
+    while True:
+        match = _TOKEN_RE.search(text, pos)
+        if match is None:
+            return {}
+        pos = match.end()
+        quoted, bracket, bare = match.groups()
+        if bracket == "{":
+            if key is not None and key == section[matched]:
+                matched += 1
+                if matched == len(section):
+                    return _parse(text, pos, in_block=True)
+            else:
+                pos = _skip_block(text, pos)
+            key = None
+        elif bracket == "}":
+            if matched == 0:
+                raise VDFSyntaxError("Unexpected closing bracket")
+            matched -= 1
+            key = None
+        elif quoted is None and bare is None:
+            continue  # комментарий или условие
+        elif key is None:
+            key = _unescape(quoted) if quoted is not None else bare
+        else:
+            key = None  # значения на уровнях пути не нужны